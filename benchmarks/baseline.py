@@ -0,0 +1,83 @@
+"""Stored benchmark results, and comparison of new runs against them."""
+
+import json
+import platform
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass(frozen=True, slots=True)
+class Measurement:
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool
+
+
+@dataclass(frozen=True, slots=True)
+class Regression:
+    name: str
+    baseline: float
+    current: float
+    unit: str
+
+    @property
+    def change(self) -> float:
+        """How far the current value moved from the baseline, as a fraction of it."""
+        return (self.current - self.baseline) / self.baseline
+
+
+def save_baseline(path: Path, measurements: list[Measurement]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": {
+            measurement.name: {
+                "value": measurement.value,
+                "unit": measurement.unit,
+                "higher_is_better": measurement.higher_is_better,
+            }
+            for measurement in measurements
+        },
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n")
+
+
+def load_baseline(path: Path) -> dict[str, Measurement]:
+    results = json.loads(path.read_text())["results"]
+    return {
+        name: Measurement(
+            name, result["value"], result["unit"], result["higher_is_better"]
+        )
+        for name, result in results.items()
+    }
+
+
+def compare(
+    measurements: list[Measurement],
+    baseline: dict[str, Measurement],
+    tolerance: float = 0.2,
+) -> list[Regression]:
+    """
+    The measurements that are worse than their baseline by more than `tolerance`, a
+    fraction of the baseline value. Measurements missing from the baseline are skipped.
+    """
+    regressions = []
+    for measurement in measurements:
+        stored = baseline.get(measurement.name)
+        if stored is None or stored.value == 0:
+            continue
+        if measurement.higher_is_better:
+            worse = measurement.value < stored.value * (1 - tolerance)
+        else:
+            worse = measurement.value > stored.value * (1 + tolerance)
+        if worse:
+            regressions.append(
+                Regression(
+                    measurement.name, stored.value, measurement.value, measurement.unit
+                )
+            )
+    return regressions
@@ -0,0 +1,228 @@
+"""End-to-end benchmarks of a hub connected to the LNET emulator, with stored baselines.
+
+Run with `python -m benchmarks.e2e`. Results are compared against
+`benchmarks/baselines/e2e.json` when it exists, and the exit status is 1 when any of
+them regressed by more than the tolerance. Pass `--save` to store the results as the
+new baseline. Baselines depend on the machine, so compare runs from the same one.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from hwiclient.commands.dimmer import FadeDimmer
+from hwiclient.emulator import LnetEmulator
+from hwiclient.events import DeviceEventKind
+from hwiclient.homeworks import HomeworksHub
+from hwiclient.monitoring import MonitoringKind
+
+from .baseline import Measurement, compare, load_baseline, save_baseline
+from .memory import repository_bytes_per_entity, synthetic_config
+
+BASELINE = Path(__file__).parent / "baselines" / "e2e.json"
+ZONES = 1000
+KEYPADS = 100
+INGEST_LINES = 20000
+INGEST_CHUNK = 500
+COMMANDS = 2000
+REPEATS = 3
+MEMORY_ZONES = (100, 1000, 10000)
+_TIMEOUT = 60
+
+
+class _CountingListener:
+    def __init__(self, expected: int):
+        self.count = 0
+        self.expected = expected
+        self.done = asyncio.get_running_loop().create_future()
+
+    def on_event(self, kind: str, data: dict):
+        self.count += 1
+        if self.count == self.expected and not self.done.done():
+            self.done.set_result(None)
+
+
+async def _wait_until(predicate):
+    async with asyncio.timeout(_TIMEOUT):
+        while not predicate():
+            await asyncio.sleep(0.001)
+
+
+async def _connected(config: dict) -> tuple[HomeworksHub, LnetEmulator]:
+    hub = HomeworksHub(config)
+    emulator = LnetEmulator(
+        [address.unencoded for address in hub.devices.dimmer_addresses()],
+        [address.unencoded for address in hub.devices.keypad_addresses()],
+    )
+    await emulator.start()
+    return hub, emulator
+
+
+async def connect_and_resync(config: dict) -> list[Measurement]:
+    hub, emulator = await _connected(config)
+    try:
+        started = time.perf_counter()
+        connection = await emulator.connect(hub)
+        connected = time.perf_counter() - started
+        started = time.perf_counter()
+        report = await hub.resync()
+        resynced = time.perf_counter() - started
+        connection.close()
+    finally:
+        await emulator.close()
+    if report.coverage < 1.0:
+        raise RuntimeError(f"resync missed {len(report.missing)} devices")
+    return [
+        Measurement("connect_login_seconds", connected, "s", False),
+        Measurement("resync_seconds", resynced, "s", False),
+    ]
+
+
+async def ingest(config: dict) -> list[Measurement]:
+    """DL lines per second from the socket to the dimmer listeners."""
+    hub, emulator = await _connected(config)
+    dimmers = hub.devices.all_dimmer_devices()
+    listener = _CountingListener(INGEST_LINES)
+    for dimmer in dimmers:
+        dimmer.event_source.register_listener(
+            listener, None, DeviceEventKind.DIMMER_LEVEL_CHANGED
+        )
+    # Every line moves its zone between 0 and 100, so each one posts an event.
+    lines = [
+        "DL, %s, %d"
+        % (
+            dimmers[index % len(dimmers)].address.unencoded_with_brackets,
+            100 if (index // len(dimmers)) % 2 == 0 else 0,
+        )
+        for index in range(INGEST_LINES)
+    ]
+    try:
+        connection = await emulator.connect(hub)
+        # Monitoring is switched on by requests queued behind the login.
+        await _wait_until(
+            lambda: emulator.monitoring_sessions(MonitoringKind.DIMMER_LEVEL) > 0
+        )
+        started = time.perf_counter()
+        for start in range(0, INGEST_LINES, INGEST_CHUNK):
+            await emulator.broadcast(
+                MonitoringKind.DIMMER_LEVEL, lines[start : start + INGEST_CHUNK]
+            )
+        await asyncio.wait_for(listener.done, _TIMEOUT)
+        elapsed = time.perf_counter() - started
+        connection.close()
+    finally:
+        await emulator.close()
+    return [Measurement("ingest_lines_per_second", INGEST_LINES / elapsed, "/s", True)]
+
+
+async def commands(config: dict) -> list[Measurement]:
+    """
+    FADEDIM round trips per second, for one zone and for a 10-zone group scene, best of
+    `REPEATS` runs.
+    """
+    hub, emulator = await _connected(config)
+    addresses = hub.devices.dimmer_addresses()
+    try:
+        connection = await emulator.connect(hub)
+        await hub.define_scene(
+            "group", FadeDimmer(75, timedelta(), timedelta(), *addresses[:10])
+        )
+        single = group = 0.0
+        for _ in range(REPEATS):
+            sent = emulator.commands_received + COMMANDS
+            started = time.perf_counter()
+            for index in range(COMMANDS):
+                await FadeDimmer(
+                    index % 101, timedelta(), timedelta(), addresses[0]
+                ).execute(hub)
+            await _wait_until(lambda: emulator.commands_received >= sent)
+            single = max(single, COMMANDS / (time.perf_counter() - started))
+
+            sent = emulator.commands_received + COMMANDS
+            started = time.perf_counter()
+            for _ in range(COMMANDS):
+                await hub.run_scene("group")
+            await _wait_until(lambda: emulator.commands_received >= sent)
+            group = max(group, COMMANDS / (time.perf_counter() - started))
+        connection.close()
+    finally:
+        await emulator.close()
+    return [
+        Measurement("single_zone_commands_per_second", single, "/s", True),
+        Measurement("group_scene_commands_per_second", group, "/s", True),
+    ]
+
+
+def memory() -> list[Measurement]:
+    return [
+        Measurement(
+            f"bytes_per_entity_{zones}_zones",
+            repository_bytes_per_entity(zones, zones // 10, lazy=False),
+            "B",
+            False,
+        )
+        for zones in MEMORY_ZONES
+    ]
+
+
+async def run() -> list[Measurement]:
+    config = synthetic_config(ZONES, KEYPADS)
+    measurements = []
+    for scenario in (connect_and_resync, ingest, commands):
+        measurements.extend(await scenario(config))
+    measurements.extend(memory())
+    return measurements
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.e2e")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument(
+        "--save", action="store_true", help="store the results as the baseline"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="fraction a result may be worse than its baseline (default 0.2)",
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    measurements = asyncio.run(run())
+    baseline = (
+        load_baseline(args.baseline) if args.baseline.exists() and not args.save else {}
+    )
+    print(f"{'benchmark':<36} {'result':>14} {'baseline':>14} {'change':>8}")
+    for measurement in measurements:
+        stored = baseline.get(measurement.name)
+        line = (
+            f"{measurement.name:<36} {measurement.value:>11.5g} {measurement.unit:<2}"
+        )
+        if stored is not None and stored.value:
+            change = (measurement.value - stored.value) / stored.value
+            line += f" {stored.value:>11.5g} {stored.unit:<2} {change:>+7.1%}"
+        print(line)
+
+    if args.save:
+        save_baseline(args.baseline, measurements)
+        print(f"saved baseline to {args.baseline}")
+        return
+
+    regressions = compare(measurements, baseline, args.tolerance)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.name}: {regression.baseline:.5g}"
+            f" -> {regression.current:.5g} {regression.unit}"
+            f" ({regression.change:+.1%})"
+        )
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
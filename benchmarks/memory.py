@@ -0,0 +1,80 @@
+"""Memory-per-entity benchmark for the device, command and message model.
+
+Run with `python -m benchmarks.memory`.
+"""
+
+import io
+import tracemalloc
+from datetime import timedelta
+
+from hwiclient.commands.dimmer import FadeDimmer
+from hwiclient.connection.message import RequestMessage, RequestMessageKind
+from hwiclient.device import DeviceAddress
+from hwiclient.homeworks import HomeworksHub
+from hwiclient.keypad import KeypadLedStates
+from hwiclient.parser import HwiXmlParser
+
+from .synthetic import synthetic_export, zone_address
+
+ZONES = 5000
+KEYPADS = 500
+OBJECTS = 10000
+
+
+def _allocated(build) -> tuple[int, object]:
+    tracemalloc.start()
+    try:
+        result = build()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current, result
+
+
+def synthetic_config(zones: int, keypads: int) -> dict:
+    export = synthetic_export(zones, keypads)
+    return HwiXmlParser({}).parse_file(io.BytesIO(export), streaming=True)
+
+
+def repository_bytes_per_entity(zones: int, keypads: int, lazy: bool) -> float:
+    config = synthetic_config(zones, keypads)
+    allocated, hub = _allocated(lambda: HomeworksHub(config, lazy_devices=lazy))
+    return allocated / (zones + keypads)
+
+
+def object_bytes(build) -> float:
+    allocated, _ = _allocated(lambda: [build(index) for index in range(OBJECTS)])
+    return allocated / OBJECTS
+
+
+def main():
+    print(f"repository with {ZONES} zones and {KEYPADS} keypads")
+    for lazy in (False, True):
+        per_entity = repository_bytes_per_entity(ZONES, KEYPADS, lazy)
+        mode = "lazy" if lazy else "eager"
+        print(f"  {mode:<6} {per_entity:>8.0f} B/entity")
+
+    addresses = [DeviceAddress(zone_address(index)) for index in range(OBJECTS)]
+    print(f"per object ({OBJECTS} instances)")
+    for name, build in (
+        ("DeviceAddress", lambda index: DeviceAddress(zone_address(index))),
+        (
+            "FadeDimmer",
+            lambda index: FadeDimmer(
+                50, timedelta(seconds=2), timedelta(), addresses[index]
+            ),
+        ),
+        (
+            "RequestMessage",
+            lambda index: RequestMessage(RequestMessageKind.SEND_COMMAND, "RDL"),
+        ),
+        (
+            "KeypadLedStates",
+            lambda index: KeypadLedStates("%024d" % (index % 2)),
+        ),
+    ):
+        print(f"  {name:<16} {object_bytes(build):>8.0f} B")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Parse-time and peak-memory benchmark for HwiXmlParser on synthetic exports.
+
+Run with `python -m benchmarks.parse`.
+"""
+
+import os
+import tempfile
+import time
+import tracemalloc
+
+from hwiclient.parser import HwiXmlParser
+
+from .synthetic import synthetic_export
+
+SIZES = ((500, 50), (2000, 200), (5000, 500))
+
+
+def time_parse(path: str, streaming: bool, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        HwiXmlParser({}).parse_file(path, streaming=streaming)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def peak_memory(path: str, streaming: bool) -> int:
+    tracemalloc.start()
+    try:
+        HwiXmlParser({}).parse_file(path, streaming=streaming)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def main():
+    print(
+        f"{'outputs':>8} {'keypads':>8} {'size':>10} {'mode':>10}"
+        f" {'parse':>10} {'peak':>10}"
+    )
+    for outputs, keypads in SIZES:
+        export = synthetic_export(outputs, keypads)
+        with tempfile.NamedTemporaryFile(suffix=".xml", delete=False) as file:
+            file.write(export)
+        try:
+            for streaming in (False, True):
+                elapsed = time_parse(file.name, streaming)
+                peak = peak_memory(file.name, streaming)
+                mode = "streaming" if streaming else "tree"
+                print(
+                    f"{outputs:>8} {keypads:>8} {len(export):>10} {mode:>10}"
+                    f" {elapsed * 1000:>8.1f}ms {peak / 1024:>8.0f}KB"
+                )
+        finally:
+            os.unlink(file.name)
+
+
+if __name__ == "__main__":
+    main()
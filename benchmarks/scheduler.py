@@ -0,0 +1,78 @@
+"""Schedule, cancel and fire throughput of the command scheduler.
+
+Run with `python -m benchmarks.scheduler`.
+"""
+
+import asyncio
+import random
+import time
+from datetime import timedelta
+
+from hwiclient.commands.hub import HubCommand
+from hwiclient.scheduler import CommandScheduler
+
+TIMERS = (10000, 50000, 100000)
+
+
+class _NoopCommand(HubCommand):
+    __slots__ = ()
+
+    async def _perform_command(self, sender):
+        pass
+
+
+class _CountingQueue:
+    def __init__(self):
+        self.count = 0
+
+    async def enqueue_command(self, command: HubCommand) -> None:
+        self.count += 1
+
+
+async def schedule_and_cancel(timers: int) -> tuple[float, float]:
+    """Microseconds per call_later and per cancel, for far-future one-shot timers."""
+    scheduler = CommandScheduler(_CountingQueue())
+    command = _NoopCommand()
+    delays = [timedelta(seconds=random.uniform(60, 3600)) for _ in range(timers)]
+
+    start = time.perf_counter()
+    entries = [scheduler.call_later(delay, command) for delay in delays]
+    scheduled = time.perf_counter() - start
+
+    random.shuffle(entries)
+    start = time.perf_counter()
+    for entry in entries:
+        scheduler.cancel(entry)
+    cancelled = time.perf_counter() - start
+
+    scheduler.close()
+    return scheduled / timers * 1e6, cancelled / timers * 1e6
+
+
+async def fire(timers: int) -> float:
+    """Microseconds per fired timer, for timers due within a few milliseconds."""
+    queue = _CountingQueue()
+    scheduler = CommandScheduler(queue)
+    command = _NoopCommand()
+    start = time.perf_counter()
+    for index in range(timers):
+        scheduler.call_later(timedelta(microseconds=index % 5000), command)
+    while queue.count < timers:
+        await asyncio.sleep(0.001)
+    return (time.perf_counter() - start) / timers * 1e6
+
+
+async def run():
+    print(f"{'timers':>8} {'schedule':>12} {'cancel':>12} {'fire':>12}")
+    for timers in TIMERS:
+        scheduled, cancelled = await schedule_and_cancel(timers)
+        fired = await fire(timers)
+        print(f"{timers:>8} {scheduled:>10.2f}us {cancelled:>10.2f}us {fired:>10.2f}us")
+
+
+def main():
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
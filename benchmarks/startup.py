@@ -0,0 +1,85 @@
+"""Startup benchmark: compiled config cache (cold vs. warm) and lazy devices.
+
+Run with `python -m benchmarks.startup`.
+"""
+
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import yaml
+
+from hwiclient.cache import ConfigCache
+from hwiclient.homeworks import HomeworksHub
+from hwiclient.parser import HwiXmlParser
+
+from .synthetic import synthetic_export
+
+SIZES = ((500, 50), (2000, 200), (5000, 500))
+
+
+def _timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def _resident(fn) -> int:
+    tracemalloc.start()
+    try:
+        result = fn()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return current
+
+
+def main():
+    print(
+        f"{'outputs':>8} {'source':>7} {'uncached':>10} {'cold':>10} {'warm':>10}"
+        f" {'warm lazy':>10} {'eager mem':>10} {'lazy mem':>10}"
+    )
+    for outputs, keypads in SIZES:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_dir = Path(tmp)
+            xml_path = tmp_dir / "project.xml"
+            xml_path.write_bytes(synthetic_export(outputs, keypads))
+            yaml_path = tmp_dir / "homeworks.yaml"
+            yaml_path.write_text(yaml.safe_dump(HwiXmlParser({}).parse_file(xml_path)))
+
+            for source, path, uncached_load, cached_load in (
+                (
+                    "yaml",
+                    yaml_path,
+                    lambda p: yaml.safe_load(p.read_bytes()),
+                    ConfigCache.load_yaml,
+                ),
+                (
+                    "xml",
+                    xml_path,
+                    lambda p: HwiXmlParser({}).parse_file(p),
+                    ConfigCache.load_xml,
+                ),
+            ):
+                cache = ConfigCache(tmp_dir / "cache")
+                uncached = _timed(lambda: HomeworksHub(uncached_load(path)))
+                cold = _timed(lambda: HomeworksHub(cached_load(cache, path)))
+                warm = _timed(lambda: HomeworksHub(cached_load(cache, path)))
+                warm_lazy = _timed(
+                    lambda: HomeworksHub(cached_load(cache, path), lazy_devices=True)
+                )
+                config = cached_load(cache, path)
+                eager_mem = _resident(lambda: HomeworksHub(config))
+                lazy_mem = _resident(lambda: HomeworksHub(config, lazy_devices=True))
+                print(
+                    f"{outputs:>8} {source:>7} {uncached * 1000:>8.1f}ms"
+                    f" {cold * 1000:>8.1f}ms {warm * 1000:>8.1f}ms"
+                    f" {warm_lazy * 1000:>8.1f}ms"
+                    f" {eager_mem / 1024:>8.0f}KB {lazy_mem / 1024:>8.0f}KB"
+                )
+
+
+if __name__ == "__main__":
+    main()
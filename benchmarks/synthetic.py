@@ -0,0 +1,74 @@
+"""Synthetic installs for benchmarks, shaped like HomeWorks Illumination exports."""
+
+import random
+import xml.etree.ElementTree as ET
+
+_OUTPUT_TYPES = ("DIMMER", "DIMMER", "DIMMER", "SWITCH", "FAN", "QED SHADE")
+
+
+def zone_address(index: int) -> str:
+    module, output = divmod(index, 8)
+    link, module = divmod(module, 64)
+    return "[01:%02d:00:%02d:%02d]" % (link + 1, module + 1, output + 1)
+
+
+def keypad_address(index: int) -> str:
+    link, keypad = divmod(index, 32)
+    return "[01:%02d:%02d]" % (link + 1, keypad + 1)
+
+
+def _add_text(parent: ET.Element, tag: str, text: str) -> ET.Element:
+    element = ET.SubElement(parent, tag)
+    element.text = text
+    return element
+
+
+def synthetic_export(
+    outputs: int,
+    keypads: int,
+    rooms: int = 100,
+    buttons_per_keypad: int = 6,
+    zones_per_button: int = 4,
+    seed: int = 0,
+) -> bytes:
+    """Builds an export with `outputs` zones and `keypads` keypads spread over `rooms` rooms."""
+    rng = random.Random(seed)
+    project = ET.Element("Project")
+    area = ET.SubElement(project, "Area")
+    _add_text(area, "Name", "Estate")
+    room_elements = []
+    for room_index in range(rooms):
+        room = ET.SubElement(area, "Room")
+        _add_text(room, "Name", f"Room {room_index}")
+        room_elements.append(
+            (ET.SubElement(room, "Outputs"), ET.SubElement(room, "Inputs"))
+        )
+
+    for index in range(outputs):
+        output = ET.SubElement(room_elements[index % rooms][0], "Output")
+        _add_text(output, "Name", f"Zone {index}")
+        _add_text(output, "Type", _OUTPUT_TYPES[index % len(_OUTPUT_TYPES)])
+        _add_text(output, "Address", zone_address(index))
+        _add_text(output, "ZoneNum", str(index + 1))
+
+    for index in range(keypads):
+        station = ET.SubElement(room_elements[index % rooms][1], "ControlStation")
+        _add_text(station, "Name", f"Keypad {index}")
+        device = ET.SubElement(ET.SubElement(station, "Devices"), "Device")
+        _add_text(device, "Type", "KEYPAD")
+        _add_text(device, "Address", keypad_address(index))
+        buttons = ET.SubElement(device, "Buttons")
+        for number in range(1, buttons_per_keypad + 1):
+            button = ET.SubElement(buttons, "Button")
+            _add_text(button, "Name", f"Button {number}")
+            _add_text(button, "Number", str(number))
+            _add_text(button, "Type", "Single Action")
+            preset = ET.SubElement(
+                ET.SubElement(ET.SubElement(button, "Actions"), "Presets"), "Preset"
+            )
+            for zone in rng.sample(range(outputs), min(zones_per_button, outputs)):
+                preset_output = ET.SubElement(preset, "Output")
+                _add_text(preset_output, "ZoneNum", str(zone + 1))
+                _add_text(preset_output, "Level", "100")
+
+    return ET.tostring(project)
@@ -0,0 +1,131 @@
+import hashlib
+import io
+import json
+import logging
+import marshal
+import os
+import sys
+import tempfile
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import yaml
+
+from .parser import HwiXmlParser
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _library_version() -> str:
+    try:
+        return metadata.version("hwiclient")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+class ConfigCache:
+    """
+    Caches compiled device dictionaries on disk so later startups skip parsing.
+
+    Entries are stored in `marshal` format and keyed by the content hash of the source
+    file, the library version and the Python version, so any change to either makes
+    the entry stale. Only the newest entry per source file is kept; entries are named
+    after a hash of the source's resolved path, so same-named files in different
+    directories get their own.
+    """
+
+    _FORMAT_VERSION = "2"
+
+    def __init__(self, cache_dir):
+        self._cache_dir = Path(cache_dir)
+
+    def _key(self, source: bytes, salt: str) -> str:
+        digest = hashlib.sha256()
+        for part in (self._FORMAT_VERSION, _library_version(), sys.version, salt):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        digest.update(source)
+        return digest.hexdigest()
+
+    def _source_prefix(self, source_path: Path) -> str:
+        return hashlib.sha256(str(source_path.resolve()).encode()).hexdigest()[:16]
+
+    def _entry_path(self, source_path: Path, key: str) -> Path:
+        return self._cache_dir / f"{self._source_prefix(source_path)}.{key[:32]}.bin"
+
+    def _read_entry(self, entry_path: Path) -> Optional[dict[str, Any]]:
+        try:
+            with open(entry_path, "rb") as file:
+                return marshal.load(file)
+        except FileNotFoundError:
+            return None
+        except OSError as error:
+            _LOGGER.warning("Cannot read config cache entry %s: %s", entry_path, error)
+            return None
+        except (EOFError, ValueError, TypeError):
+            _LOGGER.warning("Ignoring unreadable config cache entry %s", entry_path)
+            return None
+
+    def _write_entry(self, source_path: Path, entry_path: Path, config: dict):
+        try:
+            data = marshal.dumps(config)
+        except ValueError:
+            _LOGGER.warning("Config %s cannot be cached", source_path)
+            return
+
+        tmp_path = None
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            for stale in self._cache_dir.glob(
+                f"{self._source_prefix(source_path)}.*.bin"
+            ):
+                stale.unlink(missing_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, entry_path)
+        except OSError as error:
+            _LOGGER.warning("Cannot write config cache entry %s: %s", entry_path, error)
+            if tmp_path is not None:
+                Path(tmp_path).unlink(missing_ok=True)
+
+    def load(
+        self,
+        source_path,
+        compile: Callable[[bytes], dict[str, Any]],
+        salt: str = "",
+    ) -> dict[str, Any]:
+        """
+        Returns the compiled config for `source_path`, compiling it on a cache miss.
+
+        Args:
+            source_path: The config file to load.
+            compile: Turns the raw file contents into a device dictionary.
+            salt: Extra input to the cache key, for compile options.
+        """
+        source_path = Path(source_path)
+        source = source_path.read_bytes()
+        entry_path = self._entry_path(source_path, self._key(source, salt))
+        config = self._read_entry(entry_path)
+        if config is None:
+            config = compile(source)
+            self._write_entry(source_path, entry_path, config)
+        return config
+
+    def load_yaml(self, yaml_filepath) -> dict[str, Any]:
+        return self.load(yaml_filepath, yaml.safe_load, salt="yaml")
+
+    def load_xml(self, xml_filepath, remap: Optional[dict] = None) -> dict[str, Any]:
+        remap = remap if remap is not None else {}
+        return self.load(
+            xml_filepath,
+            lambda source: HwiXmlParser(remap).parse_file(
+                io.BytesIO(source), streaming=True
+            ),
+            salt="xml" + json.dumps(remap, sort_keys=True),
+        )
+
+    def clear(self):
+        for entry in self._cache_dir.glob("*.bin"):
+            entry.unlink(missing_ok=True)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from ..connection.message import RequestPriority
+from .hub import HubCommand
+from .sender import CommandSender
+
+if TYPE_CHECKING:
+    from ..device import DeviceAddress
+
+Expectation = tuple[tuple["DeviceAddress", ...], float, timedelta, timedelta]
+
+
+def format_raw_command(name: str, *args: str) -> str:
+    """The LNET line for a command, without the line terminator."""
+    if len(args) > 0:
+        return name + "," + ",".join(args)
+    return name
+
+
+class CompiledCommand(HubCommand):
+    """
+    A command whose LNET lines were formatted and encoded ahead of time.
+
+    Executing it hands the stored bytes to the sender as they are, so running the same
+    command repeatedly skips formatting, argument building and encoding. The levels
+    the command expected its zones to reach are passed to the sender first, as the
+    original command would.
+    """
+
+    __slots__ = ("_lines", "_expectations")
+
+    def __init__(
+        self,
+        lines: tuple[tuple[bytes, int], ...],
+        expectations: tuple[Expectation, ...] = (),
+    ):
+        super().__init__()
+        self._lines = lines
+        self._expectations = expectations
+
+    @property
+    def lines(self) -> tuple[tuple[bytes, int], ...]:
+        """The encoded lines, with their line terminators, and their priorities."""
+        return self._lines
+
+    @property
+    def expectations(self) -> tuple[Expectation, ...]:
+        """The addresses, level, settle time and delay of each `expect_level` call."""
+        return self._expectations
+
+    def _can_perform_command(self, sender: CommandSender) -> bool:
+        return super()._can_perform_command(sender) and sender.ready_for_command
+
+    async def _perform_command(self, sender: CommandSender):
+        for addresses, level, settle_time, delay in self._expectations:
+            await sender.expect_level(addresses, level, settle_time, delay=delay)
+        for data, priority in self._lines:
+            await sender.send_encoded_command(data, priority=priority)
+
+
+class CommandCompiler(CommandSender):
+    """Records the lines a command sends and the levels it expects, without sending."""
+
+    def __init__(self, encoding: str):
+        self._encoding = encoding
+        self._lines: list[tuple[bytes, int]] = []
+        self._expectations: list[Expectation] = []
+
+    @property
+    def ready_for_command(self) -> bool:
+        return True
+
+    async def send_raw_command(
+        self, name: str, *args: str, priority: int = RequestPriority.COMMAND
+    ):
+        data = (format_raw_command(name, *args) + "\r\n").encode(self._encoding)
+        self._lines.append((data, priority))
+
+    async def send_encoded_command(
+        self, data: bytes, priority: int = RequestPriority.COMMAND
+    ):
+        self._lines.append((data, priority))
+
+    async def expect_level(
+        self,
+        addresses: tuple[DeviceAddress, ...],
+        level: float,
+        settle_time: timedelta,
+        delay: timedelta = timedelta(),
+    ):
+        self._expectations.append((addresses, level, settle_time, delay))
+
+    async def compile(self, command: HubCommand) -> CompiledCommand:
+        self._lines = []
+        self._expectations = []
+        await command.execute(self)
+        return CompiledCommand(tuple(self._lines), tuple(self._expectations))
@@ -6,6 +6,8 @@ from typing import TYPE_CHECKING
 from ..models import Time
 from .hub import SessionActionCommand, SessionRequestCommand
 
+MAX_DIMMER_ADDRESSES = 10
+
 
 class FadeDimmer(SessionActionCommand):
     """Fades one or more system dimmers to a target intensity using a specified fade time and after a specified delay time."""
@@ -14,6 +16,8 @@ class FadeDimmer(SessionActionCommand):
         from ..device import DeviceAddress
         from .sender import CommandSender
 
+    __slots__ = ("_intensity", "_fade_time", "_delay_time", "_dimmer_adresses")
+
     def __init__(
         self,
         intensity: float,
@@ -30,13 +34,23 @@ class FadeDimmer(SessionActionCommand):
         if len(self._dimmer_adresses) <= 0:
             raise ValueError("At least one dimmer address is required")
 
-        if len(self._dimmer_adresses) > 10:
+        if len(self._dimmer_adresses) > MAX_DIMMER_ADDRESSES:
             raise ValueError("Exceeded max limit of 10 dimmer addresses")
 
         if not (self._intensity >= 0 and self._intensity <= 100):
             raise ValueError("intensity must be between 0 and 100")
 
+    @property
+    def addresses(self) -> tuple[DeviceAddress, ...]:
+        return self._dimmer_adresses
+
     async def _perform_command(self, sender: CommandSender):
+        await sender.expect_level(
+            self._dimmer_adresses,
+            self._intensity,
+            self._fade_time,
+            delay=self._delay_time,
+        )
         args = [
             str(self._intensity),
             Time(self._fade_time).formatted_hour_min_sec,
@@ -55,10 +69,16 @@ class RequestDimmerLevel(SessionRequestCommand):
         from ..device import DeviceAddress
         from .sender import CommandSender
 
+    __slots__ = ("_address",)
+
     def __init__(self, address: DeviceAddress):
         """RDL, <address>"""
         self._address = address
 
+    @property
+    def addresses(self) -> tuple[DeviceAddress, ...]:
+        return (self._address,)
+
     async def _perform_command(self, sender: CommandSender):
         await sender.send_raw_command("RDL", self._address.unencoded_with_brackets)
 
@@ -70,6 +90,8 @@ class StopDimmer(SessionActionCommand):
         from ..device import DeviceAddress
         from .sender import CommandSender
 
+    __slots__ = ("_dimmer_adresses",)
+
     def __init__(self, *dimmer_addresses: DeviceAddress):
         """STOPDIM, <address 1>, ..., <address n>"""
         super().__init__()
@@ -77,9 +99,13 @@ class StopDimmer(SessionActionCommand):
         if len(self._dimmer_adresses) <= 0:
             raise ValueError("At least one dimmer address is required")
 
-        if len(self._dimmer_adresses) > 10:
+        if len(self._dimmer_adresses) > MAX_DIMMER_ADDRESSES:
             raise ValueError("Exceeded max limit of 10 dimmer addresses")
 
+    @property
+    def addresses(self) -> tuple[DeviceAddress, ...]:
+        return self._dimmer_adresses
+
     async def _perform_command(self, sender: CommandSender):
         args = []
         for addr in self._dimmer_adresses:
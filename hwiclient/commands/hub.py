@@ -1,21 +1,36 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
+    from ..device import DeviceAddress
     from .queue import CommandQueue
 
 from .sender import CommandSender
 
 
 class HubCommand(ABC):
+    __slots__ = ()
+
     def __init__(self):
         pass
 
     def _can_perform_command(self, sender: CommandSender) -> bool:
         return True
 
+    @property
+    def addresses(self) -> Optional[tuple[DeviceAddress, ...]]:
+        """
+        The devices this command acts on, or None when they are not known.
+
+        Parallel Sequences keep commands that share an address in order, and treat a
+        command with unknown addresses as depending on every command around it.
+        """
+        return None
+
     @abstractmethod
     async def _perform_command(self, sender: CommandSender):
         pass
@@ -29,19 +44,23 @@ class HubCommand(ABC):
 
 
 class HubActionCommand(HubCommand, ABC):
-    pass
+    __slots__ = ()
 
 
 class HubRequestCommand(HubCommand, ABC):
-    pass
+    __slots__ = ()
 
 
 class SessionActionCommand(HubActionCommand, ABC):
+    __slots__ = ()
+
     def _can_perform_command(self, sender: CommandSender) -> bool:
         return super()._can_perform_command(sender) and sender.ready_for_command
 
 
 class SessionRequestCommand(HubRequestCommand, ABC):
+    __slots__ = ()
+
     def _can_perform_command(self, sender: CommandSender) -> bool:
         return super()._can_perform_command(sender) and sender.ready_for_command
 
@@ -50,17 +69,101 @@ class Sequence(HubCommand):
     """
     A command that executes a sequence of other HubCommands.
 
+    Nested Sequences of the same mode are flattened into this one when it is built.
+
     Attributes:
         commands (list[HubCommand]): A list of HubCommand instances to be executed in sequence.
+        parallel (bool): Execute the commands concurrently. Commands that share an
+            address, or whose addresses are not known, still run in list order. This
+            only pays off with a sender whose sends wait on the wire; HomeworksHub
+            only queues them, so a serial Sequence is already as fast and cheaper.
+        max_concurrency (Optional[int]): The most commands a parallel Sequence runs at
+            once, or None for no limit.
 
     Methods:
         _perform_command(sender: CommandSender): Asynchronously executes each command in the sequence with the given sender.
     """
 
-    def __init__(self, commands: list[HubCommand]):
+    __slots__ = ("_commands", "_parallel", "_max_concurrency")
+
+    def __init__(
+        self,
+        commands: list[HubCommand],
+        parallel: bool = False,
+        max_concurrency: Optional[int] = None,
+    ):
         super().__init__()
-        self._commands = commands
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self._parallel = parallel
+        self._max_concurrency = max_concurrency
+        self._commands: list[HubCommand] = []
+        for cmd in commands:
+            if isinstance(cmd, Sequence) and cmd._parallel == parallel:
+                self._commands.extend(cmd._commands)
+            else:
+                self._commands.append(cmd)
+
+    @property
+    def commands(self) -> list[HubCommand]:
+        return self._commands
+
+    @property
+    def addresses(self) -> Optional[tuple[DeviceAddress, ...]]:
+        addresses: list[DeviceAddress] = []
+        for cmd in self._commands:
+            cmd_addresses = cmd.addresses
+            if cmd_addresses is None:
+                return None
+            addresses.extend(cmd_addresses)
+        return tuple(addresses)
 
     async def _perform_command(self, sender: CommandSender):
+        if not self._parallel:
+            for cmd in self._commands:
+                await cmd.execute(sender)
+            return
+
+        limit = (
+            asyncio.Semaphore(self._max_concurrency)
+            if self._max_concurrency is not None
+            else contextlib.nullcontext()
+        )
+        tasks: list[asyncio.Task] = []
+        last_task_by_address: dict[str, asyncio.Task] = {}
+        barrier: Optional[asyncio.Task] = None
         for cmd in self._commands:
+            addresses = cmd.addresses
+            if addresses is None:
+                waits = list(tasks)
+            else:
+                keys = {address.encoded for address in addresses}
+                waits = [
+                    last_task_by_address[key]
+                    for key in keys
+                    if key in last_task_by_address
+                ]
+                if barrier is not None:
+                    waits.append(barrier)
+
+            task = asyncio.create_task(self._execute_after(cmd, sender, waits, limit))
+            tasks.append(task)
+            if addresses is None:
+                barrier = task
+                last_task_by_address.clear()
+            else:
+                for key in keys:
+                    last_task_by_address[key] = task
+        await asyncio.gather(*tasks)
+
+    @staticmethod
+    async def _execute_after(
+        cmd: HubCommand,
+        sender: CommandSender,
+        waits: list[asyncio.Task],
+        limit,
+    ):
+        if waits:
+            await asyncio.wait(waits)
+        async with limit:
             await cmd.execute(sender)
@@ -6,6 +6,8 @@ from .sender import CommandSender
 
 
 class KeypadButtonCommand(SessionActionCommand, ABC):
+    __slots__ = ("_command_name", "_address", "_button_number")
+
     def __init__(self, command_name: str, address: DeviceAddress, button: int):
         self._command_name = command_name
         self._address = address
@@ -13,6 +15,10 @@ class KeypadButtonCommand(SessionActionCommand, ABC):
         if button < 1 or button > 24:
             raise ValueError("Invalid button number: %d" % button)
 
+    @property
+    def addresses(self) -> tuple[DeviceAddress, ...]:
+        return (self._address,)
+
     async def _perform_command(self, sender: CommandSender):
         await sender.send_raw_command(
             self._command_name,
@@ -25,6 +31,8 @@ class KeypadButtonPress(KeypadButtonCommand):
     """Simulates the press action of a keypad button.
     This does not simulate a true keypad button press that might include an immediate release."""
 
+    __slots__ = ()
+
     def __init__(self, address: DeviceAddress, button: int):
         super().__init__(command_name="KBP", address=address, button=button)
 
@@ -33,6 +41,8 @@ class KeypadButtonRelease(KeypadButtonCommand):
     """Simulates the press action of a keypad button.
     This does not simulate a true keypad button press that might include an immediate release."""
 
+    __slots__ = ()
+
     def __init__(self, address: DeviceAddress, button: int):
         super().__init__(command_name="KBP", address=address, button=button)
 
@@ -41,6 +51,8 @@ class KeypadButtonHold(KeypadButtonCommand):
     """Simulates the hold action of a keypad button.
     This does not simulate a true keypad button hold that will include a preceeding press"""
 
+    __slots__ = ()
+
     def __init__(self, address: DeviceAddress, button: int):
         super().__init__(command_name="KBH", address=address, button=button)
 
@@ -49,6 +61,8 @@ class KeypadButtonDoubleTap(KeypadButtonCommand):
     """Simulates the double tap action of a keypad button.
     This does not simulate a true keypad button double tap that is preceeded by a press and release, and followed by a release"""
 
+    __slots__ = ()
+
     def __init__(self, address: DeviceAddress, button: int):
         super().__init__(command_name="KBDT", address=address, button=button)
 
@@ -57,9 +71,15 @@ class RequestKeypadLedStates(SessionRequestCommand):
     """Queries the system for the state of the LEDs on a specified keypad.
     24 led digits will be returned regardless of the number of physical leds on the keypad."""
 
+    __slots__ = ("_keypad_address",)
+
     def __init__(self, keypad_address: DeviceAddress):
         self._keypad_address = keypad_address
 
+    @property
+    def addresses(self) -> tuple[DeviceAddress, ...]:
+        return (self._keypad_address,)
+
     async def _perform_command(self, sender: CommandSender):
         await sender.send_raw_command(
             "RKLS", self._keypad_address.unencoded_with_brackets
@@ -0,0 +1,21 @@
+from ..connection.message import RequestPriority
+from ..monitoring import MonitoringKind
+from .hub import SessionActionCommand
+from .sender import CommandSender
+
+
+class SetMonitoring(SessionActionCommand):
+    """Turns one kind of processor monitoring on or off for this session"""
+
+    __slots__ = ("_kind", "_enabled")
+
+    def __init__(self, kind: MonitoringKind, enabled: bool):
+        """<kind>MON or <kind>MOFF"""
+        self._kind = kind
+        self._enabled = enabled
+
+    async def _perform_command(self, sender: CommandSender):
+        command = (
+            self._kind.enable_command if self._enabled else self._kind.disable_command
+        )
+        await sender.send_raw_command(command, priority=RequestPriority.MONITORING)
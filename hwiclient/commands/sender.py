@@ -1,5 +1,13 @@
+from __future__ import annotations
+
 from abc import abstractmethod
-from typing import Protocol
+from datetime import timedelta
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from ..device import DeviceAddress
+
+from ..connection.message import RequestPriority
 
 
 class CommandSender(Protocol):
@@ -8,5 +16,26 @@ class CommandSender(Protocol):
     def ready_for_command(self) -> bool:
         pass
 
-    async def send_raw_command(self, name: str, *args: str):
+    async def send_raw_command(
+        self, name: str, *args: str, priority: int = RequestPriority.COMMAND
+    ):
+        pass
+
+    async def send_encoded_command(
+        self, data: bytes, priority: int = RequestPriority.COMMAND
+    ):
+        """Sends a line that is already encoded and terminated."""
+        pass
+
+    async def expect_level(
+        self,
+        addresses: tuple[DeviceAddress, ...],
+        level: float,
+        settle_time: timedelta,
+        delay: timedelta = timedelta(),
+    ):
+        """
+        Called before a command moves zones to `level` over `settle_time`, starting
+        after `delay`.
+        """
         pass
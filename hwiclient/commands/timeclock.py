@@ -0,0 +1,29 @@
+from .hub import SessionRequestCommand
+from .sender import CommandSender
+
+
+class RequestSunrise(SessionRequestCommand):
+    """Requests today's sunrise time from the processor's timeclock"""
+
+    __slots__ = ()
+
+    async def _perform_command(self, sender: CommandSender):
+        await sender.send_raw_command("SUNRISE")
+
+
+class RequestSunset(SessionRequestCommand):
+    """Requests today's sunset time from the processor's timeclock"""
+
+    __slots__ = ()
+
+    async def _perform_command(self, sender: CommandSender):
+        await sender.send_raw_command("SUNSET")
+
+
+class RequestSystemTime(SessionRequestCommand):
+    """Requests the processor's current time"""
+
+    __slots__ = ()
+
+    async def _perform_command(self, sender: CommandSender):
+        await sender.send_raw_command("RST")
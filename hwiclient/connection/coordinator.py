@@ -1,13 +1,16 @@
 import asyncio
 import logging
-from typing import Callable, Tuple
+from typing import TYPE_CHECKING, Callable, Iterable, Optional, Tuple
 
+from ..monitoring import MonitoringKind
+from ..trace import TRACER, TracePoint
 from .adapter import DataToResponseAdapter
 from .login import LutronServerAddress
 from .message import (
     RequestEnqueuer,
     RequestMessage,
     RequestMessageKind,
+    RequestPriority,
     ResponseMessage,
     ResponseMessageKind,
     _RequestMessageQueue,
@@ -15,24 +18,101 @@ from .message import (
 from .state import ConnectionState
 from .tcp import TcpConnection
 
+if TYPE_CHECKING:
+    from ..metrics import HubMetrics
+
 _LOGGER = logging.getLogger(__name__)
 
 
 class ConnectionCoordinator(RequestEnqueuer):
     _ENCODING = "ascii"
 
-    def __init__(self, on_received_response: Callable[[ResponseMessage], bool]) -> None:
+    def __init__(
+        self,
+        on_received_response: Callable[[ResponseMessage], bool],
+        monitoring: Optional[Iterable[MonitoringKind]] = None,
+    ) -> None:
+        """
+        Args:
+            monitoring: The only kinds of monitoring that may be enabled, or None to
+                allow every kind.
+        """
         self._queue = _RequestMessageQueue()
         self._on_received_response_callback = on_received_response
         self._data_to_response_adapter = DataToResponseAdapter(self._ENCODING)
+        self._connection: Optional[TcpConnection] = None
+        self._allowed_monitoring = None if monitoring is None else frozenset(monitoring)
+        self._wanted_monitoring: set[MonitoringKind] = set()
+        self._line_filter: Optional[Callable[[bytes], bool]] = None
+        self._metrics: Optional["HubMetrics"] = None
+
+    @property
+    def monitoring(self) -> frozenset[MonitoringKind]:
+        """The kinds of monitoring that are enabled, or will be once connected."""
+        if self._allowed_monitoring is None:
+            return frozenset(self._wanted_monitoring)
+        return self._allowed_monitoring.intersection(self._wanted_monitoring)
+
+    def set_monitoring(self, kind: MonitoringKind, wanted: bool):
+        """
+        Enables or disables a kind of monitoring, on the current connection and on
+        every later one.
+        """
+        was_enabled = kind in self.monitoring
+        if wanted:
+            self._wanted_monitoring.add(kind)
+        else:
+            self._wanted_monitoring.discard(kind)
+        is_enabled = kind in self.monitoring
+        if is_enabled != was_enabled and self._connection is not None:
+            self._enqueue_nowait(self._monitoring_request(kind, is_enabled))
+
+    def _monitoring_request(
+        self, kind: MonitoringKind, enabled: bool
+    ) -> RequestMessage:
+        command = kind.enable_command if enabled else kind.disable_command
+        return RequestMessage(
+            RequestMessageKind.SEND_DATA, command, RequestPriority.MONITORING
+        )
 
     async def _put_priory_requests_in_queue(self):
-        mon_cmds = ["DLMON", "KBMON", "KLMON", "GSMON", "TEMON"]
-        msgs = [
-            RequestMessage(RequestMessageKind.SEND_DATA, cmd, 1) for cmd in mon_cmds
-        ]
-        for msg in msgs:
-            await self.enqueue(msg)
+        # Every kind is set explicitly, so a new connection never keeps monitoring
+        # that a previous session or the processor's defaults turned on.
+        enabled = self.monitoring
+        for kind in MonitoringKind:
+            await self.enqueue(self._monitoring_request(kind, kind in enabled))
+
+    @property
+    def line_filter(self) -> Optional[Callable[[bytes], bool]]:
+        """Called with each received line; lines it returns False for are dropped."""
+        return self._line_filter
+
+    @line_filter.setter
+    def line_filter(self, line_filter: Optional[Callable[[bytes], bool]]):
+        self._line_filter = line_filter
+
+    @property
+    def metrics(self) -> Optional["HubMetrics"]:
+        return self._metrics
+
+    @metrics.setter
+    def metrics(self, metrics: Optional["HubMetrics"]):
+        self._metrics = metrics
+
+    def queue_depths(self) -> dict[str, int]:
+        """The number of requests waiting in each lane."""
+        depths = {lane.name.lower(): 0 for lane in RequestPriority}
+        for request in list(self._queue._queue):
+            try:
+                lane = RequestPriority(request.priority).name.lower()
+            except ValueError:
+                lane = str(request.priority)
+            depths[lane] = depths.get(lane, 0) + 1
+        return depths
+
+    @property
+    def encoding(self) -> str:
+        return self._ENCODING
 
     @property
     def connection_state(self) -> ConnectionState:
@@ -43,6 +123,8 @@ class ConnectionCoordinator(RequestEnqueuer):
     async def connect(self, server: LutronServerAddress) -> TcpConnection:
         self._connection = TcpConnection(server, self._on_data_received, self._ENCODING)
         await self._connection.open()
+        if self._metrics is not None:
+            self._metrics.connected()
         await self._put_priory_requests_in_queue()
         self._connection.on_next_state_change.add_done_callback(self._on_next_state)
         return self._connection
@@ -50,19 +132,28 @@ class ConnectionCoordinator(RequestEnqueuer):
     def _on_next_state(
         self, future: asyncio.Future[Tuple[ConnectionState, ConnectionState]]
     ) -> None:
-        _LOGGER.debug(f"ON NEXT STATE {future.result}")
+        _LOGGER.debug("ON NEXT STATE %s", future.result)
         pass
 
     def _write_next_pending_request(self):
         try:
             request = self._queue.get_nowait()
             self._connection.write_request(request)
+            if self._metrics is not None:
+                self._metrics.request_written(request)
         except asyncio.QueueEmpty:
             pass
 
     def _on_data_received(self, data: bytes) -> None:
+        if TRACER.enabled:
+            TRACER.emit(TracePoint.LINE_RECEIVED, data)
+        if self._metrics is not None:
+            self._metrics.line_received(data)
+        if self._line_filter is not None and not self._line_filter(data):
+            if TRACER.enabled:
+                TRACER.emit(TracePoint.LINE_DROPPED, data)
+            return
         response = self._data_to_response_adapter.adapt(data)
-        _LOGGER.debug(response)
 
         if response.kind == ResponseMessageKind.STATE_UPDATE:
             self._connection.on_state_update(response.data)
@@ -71,6 +162,8 @@ class ConnectionCoordinator(RequestEnqueuer):
             response.kind == ResponseMessageKind.STATE_UPDATE
             and response.data == ConnectionState.CONNECTED_READY_FOR_COMMAND
         ):
+            if self._metrics is not None:
+                self._metrics.prompt_received()
             self._write_next_pending_request()
 
         if (
@@ -82,7 +175,12 @@ class ConnectionCoordinator(RequestEnqueuer):
         else:
             self._on_received_response_callback(response)
 
-    async def enqueue(self, message: RequestMessage):
-        await self._queue.put(message)
+    def _enqueue_nowait(self, message: RequestMessage):
+        self._queue.put_nowait(message)
+        if self._metrics is not None:
+            self._metrics.request_enqueued(message)
         if self._connection._state == ConnectionState.CONNECTED_READY_FOR_COMMAND:
             self._write_next_pending_request()
+
+    async def enqueue(self, message: RequestMessage):
+        self._enqueue_nowait(message)
@@ -1,6 +1,7 @@
+import itertools
 from asyncio import PriorityQueue
-from dataclasses import dataclass
-from enum import Enum
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum
 from typing import Any, Protocol
 
 from .state import ConnectionState
@@ -11,26 +12,40 @@ class ResponseMessageKind(Enum):
     STATE_UPDATE = 2
 
 
-@dataclass
+@dataclass(slots=True)
 class ResponseMessage:
     kind: ResponseMessageKind
     data: Any
 
 
+class RequestPriority(IntEnum):
+    """Queue lanes for outgoing requests. Lower values are written first."""
+
+    MONITORING = 1
+    COMMAND = 20
+    BULK = 30
+
+
 class RequestMessageKind(Enum):
     SEND_DATA = 1
     DISCONNECT = 2
     SEND_COMMAND = 3
+    SEND_ENCODED = 4
+
+
+_request_sequence = itertools.count()
 
 
-@dataclass
+@dataclass(slots=True)
 class RequestMessage:
     kind: RequestMessageKind
     data: Any
-    priority: int = 20
+    priority: int = RequestPriority.COMMAND
+    # Breaks priority ties so requests of the same lane are written in creation order.
+    sequence: int = field(default_factory=_request_sequence.__next__, compare=False)
 
     def __lt__(self, other: "RequestMessage") -> int:
-        return self.priority < other.priority
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
 
 
 class RequestEnqueuer(Protocol):
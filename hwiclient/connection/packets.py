@@ -1,6 +1,7 @@
 class PacketBuffer:
     _LOGIN_BYTES = b"LOGIN: "
     _LNET_BYTES = b"\r\nLNET> "
+    _PROMPT_BYTES = b"LNET> "
     _NEWLINE_BYTES = b"\r\n"
     _EMPTY_BYTES = b""
 
@@ -18,7 +19,10 @@ class PacketBuffer:
             return True
         elif self._buffer.endswith(self._NEWLINE_BYTES):
             return True
-        elif self._buffer.endswith(self._LNET_BYTES):
+        elif self._buffer.endswith(self._PROMPT_BYTES):
+            # The prompt may arrive apart from the newline that precedes it.
+            return True
+        elif self._buffer.endswith(self._LOGIN_BYTES):
             return True
         return False
 
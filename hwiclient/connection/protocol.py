@@ -2,6 +2,7 @@ import asyncio
 import logging
 from typing import Callable, Optional
 
+from ..trace import TRACER, TracePoint
 from .packets import PacketBuffer
 
 _LOGGER = logging.getLogger(__name__)
@@ -21,10 +22,9 @@ class LutronClientProtocol(asyncio.Protocol):
         self._transport = transport
 
     def data_received(self, data: bytes) -> None:
+        if TRACER.enabled:
+            TRACER.emit(TracePoint.PACKET_RECEIVED, data)
         self._buffer.append(data)
-        _LOGGER.debug(f"packet `{data}`")
-        _LOGGER.debug(f"buffer: `{self._buffer.data}")
-        _LOGGER.debug(f"is_complete: `{self._buffer.is_complete}`")
         if self._buffer.is_complete:
             complete_data = self._buffer.data
             self._buffer.clear()
@@ -33,6 +33,9 @@ class LutronClientProtocol(asyncio.Protocol):
                 self._on_data_received(line)
 
     def _split_lines(self, data: bytes) -> list[bytes]:
+        if b"LNET> " in data:
+            # Output that follows a prompt starts on the prompt's line.
+            data = data.replace(b"LNET> ", b"LNET>\r\n")
         lines = data.split(b"\r\n")
         lines = [line.strip() for line in lines]
         lines = [line for line in lines if line != b"\r\n" and line != b""]
@@ -2,6 +2,7 @@ import asyncio
 import logging
 from typing import Callable, Optional, Tuple, cast
 
+from ..trace import TRACER, TracePoint
 from .login import LutronCredentials, LutronServerAddress
 from .message import RequestMessage, RequestMessageKind
 from .protocol import LutronClientProtocol
@@ -61,14 +62,22 @@ class TcpConnection:
     def write_str(self, data: str):
         if self._transport is None:
             raise ConnectionError("Cannot write when transport is None")
-        _LOGGER.debug("WRITE: %s" % data)
         self._transport.write(f"{data}\r\n".encode(self._encoding))
 
+    def write_bytes(self, data: bytes):
+        if self._transport is None:
+            raise ConnectionError("Cannot write when transport is None")
+        self._transport.write(data)
+
     def write_request(self, request: RequestMessage):
+        if TRACER.enabled:
+            TRACER.emit(TracePoint.REQUEST_WRITTEN, request)
         if request.kind == RequestMessageKind.SEND_DATA:
             self.write_str(request.data)
         elif request.kind == RequestMessageKind.SEND_COMMAND:
             self.write_str(request.data)
+        elif request.kind == RequestMessageKind.SEND_ENCODED:
+            self.write_bytes(request.data)
 
     @property
     def on_connection_lost(self) -> asyncio.Future:
@@ -4,19 +4,23 @@ from .utils import HwiUtils
 
 
 class DeviceAddress:
+    __slots__ = ("_unencoded", "_encoded")
+
     def __init__(self, unencoded: str):
         if unencoded.startswith("["):
             unencoded = unencoded.removeprefix("[")
             assert unencoded.endswith("]")
             unencoded = unencoded.removesuffix("]")
 
-        self._unencoded = self._standardize(unencoded)
+        self._unencoded, self._encoded = self._standardize(unencoded)
 
-    def _standardize(self, unencoded: str) -> str:
+    def _standardize(self, unencoded: str) -> tuple[str, str]:
         if unencoded.count(":") == 2:
-            return ":".join(HwiUtils.keypad_address_components(unencoded))
+            components = HwiUtils.keypad_address_components(unencoded)
+            return (":".join(components), "keypad_" + "_".join(components))
         else:
-            return ":".join(HwiUtils.zone_address_components(unencoded))
+            components = HwiUtils.zone_address_components(unencoded)
+            return (":".join(components), "zone_" + "_".join(components))
 
     @property
     def unencoded(self) -> str:
@@ -28,16 +32,16 @@ class DeviceAddress:
 
     @property
     def encoded(self) -> str:
-        if self.unencoded.count(":") == 2:
-            return HwiUtils.encode_keypad_address(self.unencoded)
-        else:
-            return HwiUtils.encode_zone_address(self.unencoded)
+        return self._encoded
 
     def __eq__(self, __o: object) -> bool:
         if not isinstance(__o, self.__class__):
             return False
         return self.unencoded == __o.unencoded
 
+    def __hash__(self) -> int:
+        return hash(self._unencoded)
+
     def __ne__(self, __o: object) -> bool:
         return not self.__eq__(__o)
 
@@ -46,6 +50,8 @@ class DeviceAddress:
 
 
 class Device(ABC):
+    __slots__ = ("_name", "_room", "_address")
+
     def __init__(self, name: str, room: str, address: DeviceAddress) -> None:
         self._name = name
         self._room = room
@@ -65,11 +71,11 @@ class Device(ABC):
 
 
 class OutputDevice(Device, ABC):
-    pass
+    __slots__ = ()
 
 
 class InputDevice(Device, ABC):
-    pass
+    __slots__ = ()
 
 
 class DeviceType(ABC):
@@ -90,10 +96,14 @@ class OutputDeviceType(DeviceType, ABC):
 
 
 class Actions(ABC):
+    __slots__ = ("_target",)
+
     def __init__(self, target) -> None:
         self._target = target
 
 
 class Requests(ABC):
+    __slots__ = ("_target",)
+
     def __init__(self, target) -> None:
         self._target = target
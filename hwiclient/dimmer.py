@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from datetime import timedelta
+from typing import Optional
 
 from .commands.dimmer import FadeDimmer, RequestDimmerLevel, StopDimmer
 from .commands.hub import (
@@ -29,6 +30,8 @@ class DimmerDeviceType(OutputDeviceType, ABC):
 
 
 class DimmerActions(Actions):
+    __slots__ = ()
+
     def set_level(
         self,
         level: float,
@@ -48,11 +51,23 @@ class DimmerActions(Actions):
 
 
 class DimmerRequests(Requests):
+    __slots__ = ()
+
     def level(self) -> SessionRequestCommand:
         return RequestDimmerLevel(self._target.address)
 
 
 class DimmerDevice(OutputDevice, EventListener):
+    __slots__ = (
+        "_zone_number",
+        "_device_type",
+        "_level",
+        "_pending_level",
+        "_event_source",
+        "_actions",
+        "_requests",
+    )
+
     def __init__(
         self,
         name: str,
@@ -65,7 +80,10 @@ class DimmerDevice(OutputDevice, EventListener):
         self._zone_number = zone_number
         self._device_type = device_type
         self._level: float = 0
+        self._pending_level: Optional[float] = None
         self._event_source = DeviceEventSource()
+        self._actions: Optional[DimmerActions] = None
+        self._requests: Optional[DimmerRequests] = None
 
     def __repr__(self) -> str:
         return f"<DimmerDevice(name={self.name}, room={self.room} level={self.level}, address={self.address}, type={self.device_type})>"
@@ -78,6 +96,11 @@ class DimmerDevice(OutputDevice, EventListener):
     def device_type(self) -> DimmerDeviceType:
         return self._device_type
 
+    def _set_device_type(self, device_type: DimmerDeviceType):
+        self._device_type = device_type
+        self._actions = None
+        self._requests = None
+
     @property
     def is_dimmable(self) -> bool:
         """Whether or not the actual device is a dimmer or switch."""
@@ -85,15 +108,32 @@ class DimmerDevice(OutputDevice, EventListener):
 
     @property
     def level(self) -> float:
+        """The commanded level while one is pending, otherwise the reported level."""
+        if self._pending_level is not None:
+            return self._pending_level
+        return self._level
+
+    @property
+    def confirmed_level(self) -> float:
+        """The level last reported by the processor."""
         return self._level
 
+    @property
+    def pending_level(self) -> Optional[float]:
+        """The commanded level, until the processor reports a level or it times out."""
+        return self._pending_level
+
     @property
     def action(self) -> DimmerActions:
-        return self._device_type.actions(self)
+        if self._actions is None:
+            self._actions = self._device_type.actions(self)
+        return self._actions
 
     @property
     def request(self) -> DimmerRequests:
-        return self._device_type.requests(self)
+        if self._requests is None:
+            self._requests = self._device_type.requests(self)
+        return self._requests
 
     @property
     def event_source(self) -> DeviceEventSource:
@@ -102,6 +142,11 @@ class DimmerDevice(OutputDevice, EventListener):
     def on_event(self, kind: str, data: dict):
         if kind == DeviceEventKind.DIMMER_LEVEL_CHANGED:
             self._level = data[DeviceEventKey.DIMMER_LEVEL]
+            self._pending_level = None
+        elif kind == DeviceEventKind.DIMMER_LEVEL_PENDING:
+            self._pending_level = data[DeviceEventKey.PENDING_LEVEL]
+        elif kind == DeviceEventKind.DIMMER_LEVEL_REVERTED:
+            self._pending_level = None
 
         # post to event_source
         data[DeviceEventKey.DEVICE] = self
@@ -109,6 +154,8 @@ class DimmerDevice(OutputDevice, EventListener):
 
 
 class DimmerDeviceGroup(EventListener):
+    __slots__ = ("_level", "_devices", "_event_source", "_has_dimmer")
+
     def __init__(self, devices: list[DimmerDevice]):
         self._level: float = 0
         self._devices = devices
@@ -146,13 +193,8 @@ class DimmerDeviceGroup(EventListener):
         return Sequence([z.request.level() for z in self._devices])
 
     def set_level(self, level: float) -> HubCommand:
-        cmds: list[HubCommand] = []
-
-        for device in self.devices:
-            device._level = level
-            cmds.append(device.action.set_level(level))
-
-        self._level = self._calculate_group_level()
+        cmds = [device.action.set_level(level) for device in self.devices]
+        self._level = level if self._has_dimmer else 0
         return Sequence(cmds)
 
     @property
@@ -0,0 +1,363 @@
+"""
+A local stand-in for a HomeWorks processor's LNET port, for tests and benchmarks.
+
+Run one with `python -m hwiclient.emulator`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from datetime import timedelta
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from .connection.login import LutronCredentials, LutronServerAddress
+from .connection.state import ConnectionState
+from .monitoring import MonitoringKind
+
+if TYPE_CHECKING:
+    from .connection.tcp import TcpConnection
+    from .homeworks import HomeworksHub
+
+_PROMPT = b"\r\nLNET> "
+_LOGIN_PROMPT = b"LOGIN: "
+_LED_COUNT = 24
+
+
+def _address_key(address: str) -> tuple[int, ...]:
+    return tuple(int(part) for part in address.strip().strip("[]").split(":"))
+
+
+def _format_address(key: tuple[int, ...]) -> str:
+    return "[" + ":".join("%02d" % part for part in key) + "]"
+
+
+def _parse_time(time: str) -> float:
+    """Seconds in an LNET time, given as `ss`, `mm:ss` or `hh:mm:ss`."""
+    seconds = 0.0
+    for part in time.split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def _format_level(level: float) -> str:
+    return "%d" % level if level == int(level) else "%.2f" % level
+
+
+class _LnetSession:
+    __slots__ = ("_emulator", "_reader", "_writer", "monitoring", "_write_lock")
+
+    def __init__(
+        self,
+        emulator: LnetEmulator,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ):
+        self._emulator = emulator
+        self._reader = reader
+        self._writer = writer
+        self.monitoring: set[MonitoringKind] = set()
+        self._write_lock = asyncio.Lock()
+
+    async def write(self, data: bytes):
+        """Writes `data`, split into fragments when the emulator fragments output."""
+        async with self._write_lock:
+            size = self._emulator.fragment_size
+            if size is None:
+                self._writer.write(data)
+            else:
+                for start in range(0, len(data), size):
+                    self._writer.write(data[start : start + size])
+                    await self._writer.drain()
+                    await asyncio.sleep(0)
+            await self._writer.drain()
+
+    async def _read_line(self) -> Optional[str]:
+        line = await self._reader.readline()
+        if not line:
+            return None
+        return line.decode("ascii", "replace").strip()
+
+    async def run(self):
+        emulator = self._emulator
+        while True:
+            await self.write(_LOGIN_PROMPT)
+            line = await self._read_line()
+            if line is None:
+                return
+            if line == emulator.login_line:
+                break
+            await self.write(b"login incorrect\r\n")
+        await self.write(b"login successful\r\n" + _PROMPT)
+
+        while True:
+            line = await self._read_line()
+            if line is None:
+                return
+            if not line:
+                continue
+            if emulator.latency:
+                await asyncio.sleep(emulator.latency.total_seconds())
+            replies = emulator.handle_command(self, line)
+            if emulator.prompt_delay:
+                if replies:
+                    await self.write(replies)
+                await asyncio.sleep(emulator.prompt_delay.total_seconds())
+                await self.write(_PROMPT)
+            else:
+                await self.write(replies + _PROMPT)
+
+    def close(self):
+        self._writer.close()
+
+
+class LnetEmulator:
+    """
+    An asyncio TCP server that speaks enough LNET to drive a HomeworksHub.
+
+    It prompts for a login, then answers FADEDIM, STOPDIM, RDL, RKLS and the keypad
+    button commands, keeping a level for every zone and 24 LEDs for every keypad.
+    Changes are reported to the sessions that enabled the matching monitoring. Fades
+    complete at once, after their delay time.
+
+    Args:
+        zones: Zone addresses, such as `1:1:0:1:1`.
+        keypads: Keypad addresses, such as `1:4:1`.
+        latency: Added before each command is handled.
+        prompt_delay: Added between a command's replies and the following prompt.
+        fragment_size: When set, output is written in chunks of at most this many
+            bytes, to exercise the client's framing.
+        burst_lines: DL lines to send to monitoring sessions every `burst_interval`,
+            for random zones, as background traffic.
+    """
+
+    def __init__(
+        self,
+        zones: Iterable[str] = (),
+        keypads: Iterable[str] = (),
+        credentials: LutronCredentials = LutronCredentials("user", "pass"),
+        latency: timedelta = timedelta(),
+        prompt_delay: timedelta = timedelta(),
+        fragment_size: Optional[int] = None,
+        burst_lines: int = 0,
+        burst_interval: timedelta = timedelta(seconds=1),
+    ):
+        if fragment_size is not None and fragment_size < 1:
+            raise ValueError("fragment_size must be at least 1")
+        self.levels: dict[tuple[int, ...], float] = {
+            _address_key(zone): 0.0 for zone in zones
+        }
+        self.leds: dict[tuple[int, ...], list[int]] = {
+            _address_key(keypad): [0] * _LED_COUNT for keypad in keypads
+        }
+        self.login_line = f"{credentials.username},{credentials.password}"
+        self.latency = latency
+        self.prompt_delay = prompt_delay
+        self.fragment_size = fragment_size
+        self.burst_lines = burst_lines
+        self.burst_interval = burst_interval
+        self.commands_received = 0
+        self._credentials = credentials
+        self._sessions: set[_LnetSession] = set()
+        self._session_tasks: set[asyncio.Task] = set()
+        self._monitor_tasks: set[asyncio.Task] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._burst_task: Optional[asyncio.Task] = None
+        self._timers: set[asyncio.TimerHandle] = set()
+
+    @property
+    def address(self) -> LutronServerAddress:
+        if self._server is None:
+            raise RuntimeError("emulator is not started")
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return LutronServerAddress(host, port)
+
+    async def start(
+        self, host: str = "127.0.0.1", port: int = 0
+    ) -> LutronServerAddress:
+        """Starts listening; port 0 picks a free port. Returns the bound address."""
+        self._server = await asyncio.start_server(self._on_client, host, port)
+        if self.burst_lines > 0:
+            self._burst_task = asyncio.create_task(self._send_bursts())
+        return self.address
+
+    async def close(self):
+        if self._burst_task is not None:
+            self._burst_task.cancel()
+        for timer in self._timers:
+            timer.cancel()
+        self._timers.clear()
+        for task in self._monitor_tasks:
+            task.cancel()
+        if self._monitor_tasks:
+            await asyncio.gather(*self._monitor_tasks, return_exceptions=True)
+        for session in list(self._sessions):
+            session.close()
+        if self._session_tasks:
+            await asyncio.gather(*self._session_tasks, return_exceptions=True)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> LnetEmulator:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def connect(self, hub: HomeworksHub) -> TcpConnection:
+        """Connects `hub` to this emulator and logs in, ready for commands."""
+        connection = await hub.connect(self.address)
+        await _wait_for_state(
+            connection, ConnectionState.CONNECTED_READY_FOR_LOGIN_ATTEMPT
+        )
+        await (await connection.attempt_login(self._credentials))
+        await _wait_for_state(connection, ConnectionState.CONNECTED_READY_FOR_COMMAND)
+        return connection
+
+    async def _on_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        session = _LnetSession(self, reader, writer)
+        task = asyncio.current_task()
+        self._sessions.add(session)
+        self._session_tasks.add(task)
+        try:
+            await session.run()
+        except ConnectionError:
+            pass
+        finally:
+            self._sessions.discard(session)
+            self._session_tasks.discard(task)
+            session.close()
+
+    def monitoring_sessions(self, kind: MonitoringKind) -> int:
+        """How many logged in sessions have enabled monitoring of `kind`."""
+        return sum(1 for session in self._sessions if kind in session.monitoring)
+
+    async def broadcast(self, kind: MonitoringKind, lines: Iterable[str]):
+        """Writes `lines` to every session that monitors `kind`, as unsolicited output."""
+        data = "".join(line + "\r\n" for line in lines).encode("ascii")
+        # A session that disconnects meanwhile is dropped by its own task.
+        await asyncio.gather(
+            *(
+                session.write(data)
+                for session in self._sessions
+                if kind in session.monitoring
+            ),
+            return_exceptions=True,
+        )
+
+    def _monitor(self, kind: MonitoringKind, line: str):
+        task = asyncio.create_task(self.broadcast(kind, (line,)))
+        self._monitor_tasks.add(task)
+        task.add_done_callback(self._monitor_tasks.discard)
+
+    def _set_level(self, key: tuple[int, ...], level: float):
+        if key not in self.levels:
+            return
+        self.levels[key] = level
+        self._monitor(
+            MonitoringKind.DIMMER_LEVEL,
+            f"DL, {_format_address(key)}, {_format_level(level)}",
+        )
+
+    def _fade(self, keys: list[tuple[int, ...]], level: float, delay: float):
+        if delay <= 0:
+            for key in keys:
+                self._set_level(key, level)
+            return
+
+        def apply():
+            self._timers.discard(timer)
+            for key in keys:
+                self._set_level(key, level)
+
+        timer = asyncio.get_running_loop().call_later(delay, apply)
+        self._timers.add(timer)
+
+    def _led_states_line(self, key: tuple[int, ...]) -> str:
+        states = "".join(str(state) for state in self.leds[key])
+        return f"KLS, {_format_address(key)}, {states}"
+
+    def _button(self, name: str, key: tuple[int, ...], button: int):
+        if key not in self.leds or not 1 <= button <= _LED_COUNT:
+            return
+        self._monitor(
+            MonitoringKind.KEYPAD_BUTTON, f"{name}, {_format_address(key)}, {button}"
+        )
+        if name == "KBP":
+            states = self.leds[key]
+            states[button - 1] = 0 if states[button - 1] else 1
+            self._monitor(MonitoringKind.KEYPAD_LED, self._led_states_line(key))
+
+    def handle_command(self, session: _LnetSession, line: str) -> bytes:
+        """Applies one command line and returns its direct replies."""
+        self.commands_received += 1
+        name, *args = [part.strip() for part in line.split(",")]
+        name = name.upper()
+        replies: list[str] = []
+        try:
+            if name == "FADEDIM":
+                level = float(args[0])
+                delay = _parse_time(args[2])
+                self._fade([_address_key(arg) for arg in args[3:]], level, delay)
+            elif name == "STOPDIM":
+                pass
+            elif name == "RDL":
+                key = _address_key(args[0])
+                if key in self.levels:
+                    replies.append(
+                        f"DL, {_format_address(key)}, {_format_level(self.levels[key])}"
+                    )
+            elif name == "RKLS":
+                key = _address_key(args[0])
+                if key in self.leds:
+                    replies.append(self._led_states_line(key))
+            elif name in ("KBP", "KBR", "KBH", "KBDT"):
+                self._button(name, _address_key(args[0]), int(args[1]))
+            elif name.endswith("MON") or name.endswith("MOFF"):
+                enabled = name.endswith("MON")
+                kind = MonitoringKind(name.removesuffix("MON").removesuffix("MOFF"))
+                if enabled:
+                    session.monitoring.add(kind)
+                else:
+                    session.monitoring.discard(kind)
+            else:
+                replies.append("Invalid command")
+        except (IndexError, ValueError):
+            replies.append("Invalid command")
+        return "".join(reply + "\r\n" for reply in replies).encode("ascii")
+
+    async def _send_bursts(self):
+        keys = list(self.levels)
+        if not keys:
+            return
+        while True:
+            await asyncio.sleep(self.burst_interval.total_seconds())
+            lines = []
+            for key in random.choices(keys, k=self.burst_lines):
+                level = float(random.randint(0, 100))
+                self.levels[key] = level
+                lines.append(f"DL, {_format_address(key)}, {_format_level(level)}")
+            await self.broadcast(MonitoringKind.DIMMER_LEVEL, lines)
+
+
+async def _wait_for_state(connection: TcpConnection, state: ConnectionState):
+    while connection.connection_state != state:
+        await connection.on_next_state_change
+
+
+async def _serve(port: int):
+    zones = [f"1:1:0:{link}:{zone}" for link in range(1, 5) for zone in range(1, 33)]
+    keypads = [f"1:4:{keypad}" for keypad in range(1, 33)]
+    emulator = LnetEmulator(zones, keypads)
+    address = await emulator.start(port=port)
+    print(f"LNET emulator on {address.host}:{address.port} (user,pass)")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(_serve(2323))
@@ -1,14 +1,22 @@
 import logging
+import time
 from abc import abstractmethod
 from enum import StrEnum
 from typing import Optional, Protocol
 
+from .profiling import DISPATCH_PROFILER
+from .trace import TRACER, TracePoint
+
 _LOGGER = logging.getLogger(__name__)
 
 
 class DeviceEventKind(StrEnum):
     DIMMER_LEVEL_CHANGED = "dimmer_level_changed"
+    DIMMER_LEVEL_PENDING = "dimmer_level_pending"
+    DIMMER_LEVEL_CONFIRMED = "dimmer_level_confirmed"
+    DIMMER_LEVEL_REVERTED = "dimmer_level_reverted"
     KEYPAD_LED_STATES_CHANGED = "keypad_led_states_changed"
+    KEYPAD_BUTTON_LED_CHANGED = "keypad_button_led_changed"
     KEYPAD_BUTTON_PRESSED = "keypad_button_pressed"
     KEYPAD_BUTTON_RELEASED = "keypad_button_released"
     KEYPAD_BUTTON_HELD = "keypad_button_held"
@@ -19,7 +27,10 @@ class DeviceEventKind(StrEnum):
 class DeviceEventKey(StrEnum):
     DEVICE_ADDRESS = "address"
     DIMMER_LEVEL = "level"
+    PENDING_LEVEL = "pending_level"
     KEYPAD_LED_STATES = "keypad_led_states"
+    KEYPAD_LED_STATE = "keypad_led_state"
+    PREDICTED = "predicted"
     BUTTON_NUMBER = "button"
     DEVICE = "device"
     DEVICE_GROUP = "device_group"
@@ -36,11 +47,15 @@ class TimeclockEventKey(StrEnum):
 
 
 class EventListener(Protocol):
+    __slots__ = ()
+
     def on_event(self, kind: str, data: dict):
         pass
 
 
 class EventSource(Protocol):
+    __slots__ = ()
+
     @abstractmethod
     def register_listener(
         self, listener: EventListener, filter: Optional[dict] = None, *kind: str
@@ -53,10 +68,16 @@ class EventSource(Protocol):
 
 
 class FilteredListener(EventListener):
+    __slots__ = ("_listener", "_filter")
+
     def __init__(self, listener: EventListener, filter: dict):
         self._listener = listener
         self._filter = filter
 
+    @property
+    def listener(self) -> EventListener:
+        return self._listener
+
     def _passes_filter(self, data, filter: dict) -> bool:
         result = True
         for key, value in filter.items():
@@ -75,6 +96,8 @@ class FilteredListener(EventListener):
 
 
 class DeviceEventSource(EventSource):
+    __slots__ = ("_listeners",)
+
     def __init__(self):
         self._listeners: dict[DeviceEventKind, list[EventListener]] = {}
 
@@ -97,9 +120,25 @@ class DeviceEventSource(EventSource):
         return listener in self._listeners[event_kind]
 
     def post(self, kind: DeviceEventKind, data: dict):
+        if TRACER.enabled:
+            TRACER.emit(TracePoint.EVENT_POSTED, kind, data)
         if kind not in self._listeners:
             return
 
+        if DISPATCH_PROFILER.enabled:
+            for listener in self._listeners[kind]:
+                # Only time calls that reach the listener, so rejections by an
+                # address filter do not dilute its stats.
+                if isinstance(listener, FilteredListener):
+                    if not listener._passes_filter(data, listener._filter):
+                        continue
+                    listener = listener.listener
+                start = time.perf_counter_ns()
+                listener.on_event(kind, data)
+                elapsed = time.perf_counter_ns() - start
+                DISPATCH_PROFILER.record(listener, kind, elapsed)
+            return
+
         for listener in self._listeners[kind]:
             listener.on_event(kind, data)
 
@@ -126,6 +165,8 @@ class DeviceEventSource(EventSource):
     ):
         if event_kind in self._listeners:
             for index, event_listener in enumerate(self._listeners[event_kind]):
+                if isinstance(event_listener, FilteredListener):
+                    event_listener = event_listener.listener
                 if event_listener == listener:
                     self._listeners[event_kind].pop(index)
                     return
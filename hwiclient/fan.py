@@ -30,6 +30,8 @@ class FanDimmerType(DimmerDeviceType):
 
 
 class SetFanLevel(FadeDimmer):
+    __slots__ = ()
+
     def __init__(self, dimmer: DimmerDevice, fan_speeds: int, level: float):
         assert dimmer.device_type.type_id() == FanDimmerType.type_id()
         super().__init__(
@@ -1,37 +1,101 @@
 import asyncio
-from typing import Any
+from datetime import timedelta
+from typing import Any, Iterable, Optional
 
+from .commands.compiled import CommandCompiler, CompiledCommand, format_raw_command
 from .commands.hub import HubCommand
 from .connection.coordinator import ConnectionCoordinator
 from .connection.login import LutronServerAddress
 from .connection.message import (
     RequestMessage,
     RequestMessageKind,
+    RequestPriority,
     ResponseMessage,
     ResponseMessageKind,
 )
 from .connection.state import ConnectionState
 from .connection.tcp import TcpConnection
+from .device import DeviceAddress
 from .hub import Hub
+from .journal import ChangeJournal, ChangeSet
+from .metrics import HubMetrics
 from .monitoring import (
+    MonitoringKind,
     MonitoringTopic,
     MonitoringTopicKey,
     MonitoringTopicNotifier,
     TopicSubscriber,
 )
-from .repos import DeviceRepository
+from .planning import StatePlan, Timeline, plan_state
+from .repos import DeviceRepository, ReloadReport
 from .responsehandler import ServerResponseDataHandler
+from .resync import ResyncEngine, ResyncReport
+from .scheduler import CommandScheduler
+from .timeclock import Timeclock
 
 
 class HomeworksHub(Hub):
-    def __init__(self, homeworks_config: dict[str, Any]) -> None:
+    def __init__(
+        self,
+        homeworks_config: dict[str, Any],
+        journal_capacity: int = 4096,
+        lazy_devices: bool = False,
+        predict_leds: bool = False,
+        pending_timeout: timedelta = timedelta(seconds=5),
+        monitoring: Optional[Iterable[MonitoringKind]] = None,
+        drop_unknown_lines: bool = False,
+        metrics: bool = False,
+    ) -> None:
+        """
+        Args:
+            pending_timeout: How long after a commanded fade should have finished its
+                level stays pending before it is reverted.
+            monitoring: The only kinds of monitoring the processor is asked for, or None
+                to allow every kind. Within these, a kind is only enabled while some
+                subscriber needs one of its topics.
+            drop_unknown_lines: Drop received zone and keypad lines for addresses that
+                are not configured before they are decoded. This is faster, but topic
+                subscribers then never see those lines either.
+            metrics: Collect connection, queue and dispatch metrics, read through
+                `metrics`.
+        """
         self._homeworks_config = homeworks_config
-        self._monitoring_topic_notifier = MonitoringTopicNotifier()
-        self._devices = DeviceRepository(homeworks_config, self)
-        self._coordinator = ConnectionCoordinator(self._handle_response)
+        self._coordinator = ConnectionCoordinator(self._handle_response, monitoring)
+        self._monitoring_topic_notifier = MonitoringTopicNotifier(
+            self._coordinator.set_monitoring
+        )
+        self._devices = DeviceRepository(
+            homeworks_config,
+            self,
+            ChangeJournal(journal_capacity),
+            lazy=lazy_devices,
+            predict_leds=predict_leds,
+        )
+        if drop_unknown_lines:
+            self._coordinator.line_filter = self._devices.ingest_filter.accepts
         self._response_data_handler = ServerResponseDataHandler(
             self._monitoring_topic_notifier
         )
+        self._scenes: dict[str, CompiledCommand] = {}
+        self._pending_timeout = pending_timeout
+        self._scheduler = CommandScheduler(self)
+        self._timeclock = Timeclock(self._monitoring_topic_notifier)
+        self._metrics = self._create_metrics() if metrics else None
+
+    def _create_metrics(self) -> HubMetrics:
+        metrics = HubMetrics()
+        metrics.observe_queue(self._coordinator.queue_depths)
+        metrics.observe_dropped_lines(lambda: self._devices.ingest_filter.dropped)
+        handler = self._response_data_handler
+        metrics.observe_unparsed_lines(
+            lambda: {
+                "unknown": handler.unknown_lines,
+                "malformed": handler.malformed_lines,
+            }
+        )
+        self._coordinator.metrics = metrics
+        self._monitoring_topic_notifier.metrics = metrics
+        return metrics
 
     def _handle_response(self, response: ResponseMessage) -> bool:
         if response.kind == ResponseMessageKind.STATE_UPDATE:
@@ -50,23 +114,145 @@ class HomeworksHub(Hub):
     def connection_state(self) -> ConnectionState:
         return self._coordinator.connection_state
 
+    def changes_since(self, seq: int) -> ChangeSet:
+        """Returns the state changes applied after `seq`, or a resync marker."""
+        return self._devices.journal.changes_since(seq)
+
+    async def apply_state(
+        self,
+        targets: dict[DeviceAddress, float],
+        fade_time: timedelta = timedelta(),
+        delay_time: timedelta = timedelta(),
+        tolerance: float = 0.5,
+    ) -> StatePlan:
+        """
+        Moves each zone of `targets` to its level with as few FADEDIM commands as
+        possible.
+
+        Zones already within `tolerance` of their target are skipped, and the rest are
+        batched per level, up to 10 zones per command. Returns the plan that was sent.
+        """
+        plan = plan_state(
+            targets,
+            self._devices.level_at_address,
+            fade_time=fade_time,
+            delay_time=delay_time,
+            tolerance=tolerance,
+        )
+        for command in plan.commands:
+            await command.execute(self)
+        return plan
+
+    async def run_timeline(self, timeline: Timeline) -> StatePlan:
+        """
+        Sends every step of `timeline` at once, as FADEDIM commands whose delay times
+        make the processor carry out the steps at their offsets.
+        """
+        plan = timeline.plan()
+        for command in plan.commands:
+            await command.execute(self)
+        return plan
+
+    def reload_config(self, homeworks_config: dict[str, Any]) -> ReloadReport:
+        """
+        Switches to a new device configuration without dropping the connection.
+
+        Only the devices that were added, removed or changed are touched; every other
+        device object keeps its state and listeners.
+        """
+        report = self._devices.reload(homeworks_config)
+        self._homeworks_config = homeworks_config
+        return report
+
     @property
     def ready_for_command(self) -> bool:
         return True
         return self.connection_state == ConnectionState.CONNECTED_READY_FOR_COMMAND
 
-    async def send_raw_command(self, name: str, *args: str):
-        if len(args) > 0:
-            data = name + "," + ",".join(args)
-        else:
-            data = name
+    async def send_raw_command(
+        self, name: str, *args: str, priority: int = RequestPriority.COMMAND
+    ):
+        await self._coordinator.enqueue(
+            RequestMessage(
+                RequestMessageKind.SEND_COMMAND,
+                format_raw_command(name, *args),
+                priority,
+            )
+        )
+
+    async def send_encoded_command(
+        self, data: bytes, priority: int = RequestPriority.COMMAND
+    ):
         await self._coordinator.enqueue(
-            RequestMessage(RequestMessageKind.SEND_COMMAND, data)
+            RequestMessage(RequestMessageKind.SEND_ENCODED, data, priority)
         )
 
+    async def expect_level(
+        self,
+        addresses: tuple[DeviceAddress, ...],
+        level: float,
+        settle_time: timedelta,
+        delay: timedelta = timedelta(),
+    ):
+        if delay > timedelta():
+            # The processor holds a delayed fade, so its zones keep their current
+            # level, and accept unrelated reports, until the fade starts.
+            asyncio.get_running_loop().call_later(
+                delay.total_seconds(),
+                self._expect_level_now,
+                addresses,
+                level,
+                settle_time,
+            )
+            return
+        self._expect_level_now(addresses, level, settle_time)
+
+    def _expect_level_now(
+        self, addresses: tuple[DeviceAddress, ...], level: float, settle_time: timedelta
+    ):
+        timeout = settle_time + self._pending_timeout
+        for address in addresses:
+            self._devices.expect_level(address, level, timeout)
+
+    async def compile(self, command: HubCommand) -> CompiledCommand:
+        """
+        Formats and encodes the lines `command` sends, so it can be run repeatedly
+        without building them again.
+
+        The lines are captured once, so levels or addresses computed when the command
+        runs are frozen at their values at compile time.
+        """
+        return await CommandCompiler(self._coordinator.encoding).compile(command)
+
+    async def define_scene(self, name: str, command: HubCommand) -> CompiledCommand:
+        """Compiles `command` and stores it under `name` for `run_scene`."""
+        compiled = await self.compile(command)
+        self._scenes[name] = compiled
+        return compiled
+
+    async def run_scene(self, name: str):
+        if name not in self._scenes:
+            raise ValueError(f"scene `{name}`: not defined")
+        return await self.enqueue_command(self._scenes[name])
+
     async def connect(self, server: LutronServerAddress) -> TcpConnection:
         return await self._coordinator.connect(server)
 
+    @property
+    def metrics(self) -> Optional[HubMetrics]:
+        """The hub's metrics, or None when it was created without them."""
+        return self._metrics
+
+    @property
+    def timeclock(self) -> Timeclock:
+        """The processor's timeclock, updated from replies to timeclock requests."""
+        return self._timeclock
+
+    @property
+    def scheduler(self) -> CommandScheduler:
+        """Runs commands at later times, once or periodically."""
+        return self._scheduler
+
     async def disconnect(self):
         await self._coordinator.enqueue(
             RequestMessage(RequestMessageKind.DISCONNECT, None)
@@ -76,6 +262,23 @@ class HomeworksHub(Hub):
         # TODO: actually use a queue
         return asyncio.create_task(command._perform_command(self))
 
+    async def resync(
+        self,
+        zones: bool = True,
+        keypads: bool = True,
+        max_in_flight: int = 8,
+        reply_timeout: timedelta = timedelta(seconds=2),
+        max_attempts: int = 3,
+    ) -> ResyncReport:
+        """Requests the state of every known zone and keypad and waits for the replies."""
+        engine = ResyncEngine(
+            self,
+            max_in_flight=max_in_flight,
+            reply_timeout=reply_timeout,
+            max_attempts=max_attempts,
+        )
+        return await engine.run(zones=zones, keypads=keypads)
+
     def subscribe(self, subscriber: TopicSubscriber, *topics: MonitoringTopic):
         self._monitoring_topic_notifier.subscribe(subscriber, *topics)
 
@@ -4,10 +4,16 @@ from abc import abstractmethod
 from typing import TYPE_CHECKING, Any, Protocol
 
 if TYPE_CHECKING:
+    from .commands.compiled import CompiledCommand
+    from .commands.hub import HubCommand
     from .connection.login import LutronServerAddress
     from .connection.state import ConnectionState
     from .connection.tcp import TcpConnection
-    from .repos import DeviceRepository
+    from .device import DeviceAddress
+    from .journal import ChangeSet
+    from .planning import StatePlan
+    from .repos import DeviceRepository, ReloadReport
+    from .resync import ResyncReport
 
 from .commands.queue import CommandQueue
 from .commands.sender import CommandSender
@@ -32,5 +38,25 @@ class Hub(TopicNotifier, CommandSender, CommandQueue, Protocol):
     def connection_state(self) -> ConnectionState:
         pass
 
+    @abstractmethod
+    def changes_since(self, seq: int) -> ChangeSet:
+        pass
+
+    @abstractmethod
+    async def compile(self, command: HubCommand) -> CompiledCommand:
+        pass
+
+    @abstractmethod
+    async def apply_state(self, targets: dict[DeviceAddress, float]) -> StatePlan:
+        pass
+
+    @abstractmethod
+    def reload_config(self, homeworks_config: dict[str, Any]) -> ReloadReport:
+        pass
+
+    @abstractmethod
+    async def resync(self, zones: bool = True, keypads: bool = True) -> ResyncReport:
+        pass
+
     async def disconnect(self):
         pass
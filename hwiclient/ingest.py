@@ -0,0 +1,71 @@
+from typing import Callable
+
+from .device import DeviceAddress
+from .monitoring import MonitoringTopic
+
+
+class IngestFilter:
+    """
+    Drops device lines for addresses that are not configured, before they are decoded.
+
+    Only lines of the device topics are checked; every other line is accepted. The
+    verdict for each bracketed address is memoized by its raw bytes, so after the first
+    line for an address, checking a line is a slice and a dict lookup.
+    """
+
+    __slots__ = ("_is_known", "_verdicts", "_dropped")
+
+    _TOPICS = frozenset(
+        topic.value.encode("ascii")
+        for topic in (
+            MonitoringTopic.DIMMER_LEVEL_CHANGED,
+            MonitoringTopic.KEYPAD_BUTTON_PRESS,
+            MonitoringTopic.KEYPAD_BUTTON_RELEASE,
+            MonitoringTopic.KEYPAD_BUTTON_HOLD,
+            MonitoringTopic.KEYPAD_BUTTON_DOUBLE_TAP,
+            MonitoringTopic.KEYPAD_LED_STATES_CHANGED,
+        )
+    )
+    # Bounds the memo when a shared link reports many addresses we do not know.
+    _MAX_VERDICTS = 4096
+
+    def __init__(self, is_known: Callable[[DeviceAddress], bool]):
+        self._is_known = is_known
+        self._verdicts: dict[bytes, bool] = {}
+        self._dropped = 0
+
+    @property
+    def dropped(self) -> int:
+        """The number of lines dropped so far."""
+        return self._dropped
+
+    def invalidate(self):
+        """Forgets every verdict, after the set of known addresses changed."""
+        self._verdicts.clear()
+
+    def accepts(self, line: bytes) -> bool:
+        comma = line.find(b",")
+        if comma < 0 or line[:comma] not in self._TOPICS:
+            return True
+        start = line.find(b"[", comma)
+        end = line.find(b"]", start)
+        if start < 0 or end < 0:
+            return True
+        raw_address = line[start : end + 1]
+        known = self._verdicts.get(raw_address)
+        if known is None:
+            known = self._check(raw_address)
+        if not known:
+            self._dropped += 1
+        return known
+
+    def _check(self, raw_address: bytes) -> bool:
+        try:
+            known = self._is_known(DeviceAddress(raw_address.decode("ascii")))
+        except (AssertionError, IndexError, UnicodeDecodeError):
+            # Leave malformed addresses to the response handler.
+            return True
+        if len(self._verdicts) >= self._MAX_VERDICTS:
+            self._verdicts.clear()
+        self._verdicts[raw_address] = known
+        return known
@@ -0,0 +1,75 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from .device import DeviceAddress
+from .events import DeviceEventKind
+
+
+@dataclass(frozen=True, slots=True)
+class Change:
+    seq: int
+    kind: DeviceEventKind
+    address: DeviceAddress
+    value: Any
+
+
+@dataclass(frozen=True)
+class ChangeSet:
+    """
+    The changes recorded after a given sequence number.
+
+    Attributes:
+        seq (int): The latest sequence number. Pass it to the next `changes_since` call.
+        changes (list[Change]): The changes in the order they were applied.
+        resync_needed (bool): The requested changes are no longer in the journal and the
+            caller has to rebuild its state from the device repository.
+    """
+
+    seq: int
+    changes: list[Change] = field(default_factory=list)
+    resync_needed: bool = False
+
+
+class ChangeJournal:
+    """A bounded ring of state changes, each with a monotonically increasing sequence number."""
+
+    def __init__(self, capacity: int = 4096):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._changes: deque[Change] = deque(maxlen=capacity)
+        self._last_seq = 0
+
+    @property
+    def capacity(self) -> int:
+        assert self._changes.maxlen is not None
+        return self._changes.maxlen
+
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    def record(
+        self, kind: DeviceEventKind, address: DeviceAddress, value: Any
+    ) -> Change:
+        self._last_seq += 1
+        change = Change(self._last_seq, kind, address, value)
+        self._changes.append(change)
+        return change
+
+    def changes_since(self, seq: int) -> ChangeSet:
+        if seq == self._last_seq:
+            return ChangeSet(self._last_seq)
+
+        oldest_seq = self._changes[0].seq if self._changes else self._last_seq + 1
+        if seq < oldest_seq - 1 or seq > self._last_seq:
+            return ChangeSet(self._last_seq, resync_needed=True)
+
+        # Walk back from the newest change so the cost is proportional to the delta.
+        changes = []
+        for change in reversed(self._changes):
+            if change.seq <= seq:
+                break
+            changes.append(change)
+        changes.reverse()
+        return ChangeSet(self._last_seq, changes)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 from enum import IntEnum
-from typing import Collection, Optional
+from typing import Optional, Sequence
 
 from .commands.hub import HubRequestCommand
 from .commands.keypad import RequestKeypadLedStates
@@ -20,39 +20,102 @@ class KeypadLedState(IntEnum):
     FLASH_2 = 3
 
 
-class KeypadLedStates(Collection[KeypadLedState]):
+class KeypadLedStates(Sequence[KeypadLedState]):
+    """The states of a keypad's 24 LEDs, packed two bits per LED into one integer."""
+
+    __slots__ = ("_packed",)
+
+    _COUNT = 24
+    _STATES = tuple(KeypadLedState)
+
     def __init__(self, states_str: str = "000000000000000000000000"):
-        if len(states_str) != 24:
+        if len(states_str) != self._COUNT:
             raise ValueError("LED states string must be 24 characters long")
+        if not (states_str.isascii() and states_str.isdigit()):
+            raise ValueError("invalid keypad led state char")
+
+        # Each digit is one base-4 place, so reading the string backwards puts LED n
+        # at bits 2n and 2n + 1.
+        try:
+            self._packed = int(states_str[::-1], 4)
+        except ValueError:
+            raise ValueError("invalid keypad led state char") from None
+
+    @classmethod
+    def from_packed(cls, packed: int) -> KeypadLedStates:
+        states = cls.__new__(cls)
+        states._packed = packed & ((1 << (2 * cls._COUNT)) - 1)
+        return states
+
+    @property
+    def packed(self) -> int:
+        """LED `n` (zero-based) is stored in bits `2n` and `2n + 1`."""
+        return self._packed
+
+    def with_state(self, index: int, state: KeypadLedState) -> KeypadLedStates:
+        """A copy of these states with LED `index` (zero-based) set to `state`."""
+        shift = 2 * index
+        return self.from_packed(self._packed & ~(3 << shift) | (state << shift))
+
+    def changed_indexes(self, other: KeypadLedStates) -> list[int]:
+        """The zero-based indexes of the LEDs whose state differs from `other`."""
+        changed = self._packed ^ other._packed
+        indexes = []
+        while changed:
+            index = (changed & -changed).bit_length() - 1 >> 1
+            indexes.append(index)
+            changed &= ~(3 << (2 * index))
+        return indexes
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._COUNT))]
+        if index < 0:
+            index += self._COUNT
+        if index < 0 or index >= self._COUNT:
+            raise IndexError("keypad led index out of range")
+        return self._STATES[(self._packed >> (2 * index)) & 3]
 
-        self._states = list[KeypadLedState]()
-        for index, char in enumerate(states_str):
-            if char == "0" or char == "1" or char == "2" or char == "3":
-                self._states.append(KeypadLedState(int(char)))
-            else:
-                raise ValueError("invalid keypad led state char")
+    def __len__(self) -> int:
+        return self._COUNT
 
-        if len(self._states) != 24:
-            raise ValueError("Invalid keypad led state string")
+    def __eq__(self, __o: object) -> bool:
+        if not isinstance(__o, KeypadLedStates):
+            return False
+        return self._packed == __o._packed
 
-    def __getitem__(self, index: int) -> KeypadLedState:
-        return self._states[index]
+    def __hash__(self) -> int:
+        return hash(self._packed)
 
-    def __len__(self) -> int:
-        return len(self._states)
+    def __str__(self) -> str:
+        """The 24 digits of a KLS report."""
+        return "".join(str(int(state)) for state in self)
+
+    def __repr__(self) -> str:
+        return f"<KeypadLedStates: {self}>"
 
 
 # Note button 23 and 24 are usually the dimmer arrows
 
 
 class KeypadButton(EventListener):
+    __slots__ = ("_name", "_number", "_device_group", "_keypad", "_preset_levels")
+
     def __init__(
-        self, name: str, number: int, device_group: DimmerDeviceGroup, keypad: Keypad
+        self,
+        name: str,
+        number: int,
+        device_group: DimmerDeviceGroup,
+        keypad: Keypad,
+        preset_levels: Optional[list[float]] = None,
     ):
         self._name = name
         self._number = number
         self._device_group = device_group
         self._keypad = keypad
+        if preset_levels is None:
+            preset_levels = [100.0] * len(device_group.devices)
+        self._preset_levels = preset_levels
 
     @property
     def name(self) -> str:
@@ -70,16 +133,21 @@ class KeypadButton(EventListener):
     def keypad(self) -> Keypad:
         return self._keypad
 
+    @property
+    def preset_levels(self) -> list[float]:
+        """The level the button's preset sets each device of `device_group` to."""
+        return self._preset_levels
+
     @property
     def is_led_on(self) -> bool:
         return self.keypad.is_led_on(self.number)
 
+    @property
+    def led_state(self) -> KeypadLedState:
+        return self.keypad.led_states[self.number - 1]
+
     def on_event(self, kind: str, data: dict):
-        if kind == DeviceEventKind.KEYPAD_LED_STATES_CHANGED:
-            if self.is_led_on:
-                _LOGGER.warning(self._name + " is on")
-            else:
-                _LOGGER.warning(self._name + " is off")
+        pass
 
     def debug_description(self):
         description = (
@@ -95,6 +163,8 @@ class KeypadButton(EventListener):
 
 
 class Keypad(InputDevice, EventListener):
+    __slots__ = ("_led_states", "_buttons_by_number", "_event_source")
+
     def __init__(
         self, address: DeviceAddress, name: str, room: str, buttons: list[ButtonBuilder]
     ):
@@ -102,19 +172,26 @@ class Keypad(InputDevice, EventListener):
         self._led_states: KeypadLedStates = KeypadLedStates()
         self._buttons_by_number: dict[int, KeypadButton] = {}
         self._event_source = DeviceEventSource()
+        self._set_buttons(buttons)
+
+    _BUTTON_EVENT_KINDS = (
+        DeviceEventKind.KEYPAD_BUTTON_PRESSED,
+        DeviceEventKind.KEYPAD_BUTTON_DOUBLE_TAPPED,
+        DeviceEventKind.KEYPAD_BUTTON_HELD,
+        DeviceEventKind.KEYPAD_BUTTON_RELEASED,
+    )
+
+    def _set_buttons(self, buttons: list[ButtonBuilder]):
+        for btn in self._buttons_by_number.values():
+            self._event_source.unregister_listener(btn, *self._BUTTON_EVENT_KINDS)
+        self._buttons_by_number = {}
         for builder in buttons:
             builder.set_keypad(self)
             btn = builder.build()
             self._event_source.register_listener(
                 btn,
                 {DeviceEventKey.BUTTON_NUMBER: btn.number},
-                DeviceEventKind.KEYPAD_BUTTON_PRESSED,
-                DeviceEventKind.KEYPAD_BUTTON_DOUBLE_TAPPED,
-                DeviceEventKind.KEYPAD_BUTTON_HELD,
-                DeviceEventKind.KEYPAD_BUTTON_RELEASED,
-            )
-            self._event_source.register_listener(
-                btn, None, DeviceEventKind.KEYPAD_LED_STATES_CHANGED
+                *self._BUTTON_EVENT_KINDS,
             )
             self._buttons_by_number[btn.number] = btn
 
@@ -170,14 +247,35 @@ class Keypad(InputDevice, EventListener):
 
     pass
 
+    def _update_led_states(self, data: dict):
+        old_states = self._led_states
+        new_states: KeypadLedStates = data[DeviceEventKey.KEYPAD_LED_STATES]
+        changed_indexes = new_states.changed_indexes(old_states)
+        if not changed_indexes:
+            return
+
+        self._led_states = new_states
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(self.debug_description())
+        self._event_source.post(DeviceEventKind.KEYPAD_LED_STATES_CHANGED, data)
+        predicted = data.get(DeviceEventKey.PREDICTED, False)
+        for index in changed_indexes:
+            self._event_source.post(
+                DeviceEventKind.KEYPAD_BUTTON_LED_CHANGED,
+                {
+                    DeviceEventKey.DEVICE_ADDRESS: self.address,
+                    DeviceEventKey.BUTTON_NUMBER: index + 1,
+                    DeviceEventKey.KEYPAD_LED_STATE: new_states[index],
+                    DeviceEventKey.PREDICTED: predicted,
+                },
+            )
+
     def on_event(self, kind: str, data: dict):
         if kind == DeviceEventKind.KEYPAD_LED_STATES_CHANGED:
-            # old_states = self._led_states
-            self._led_states = data[DeviceEventKey.KEYPAD_LED_STATES]
-            # SUPER HELPFUL FOR DEBUGGING
-            _LOGGER.warning(self.debug_description())
+            self._update_led_states(data)
+            return
         # forward to keypad's event source
-        self._event_source.post(DeviceEventKind(str), data)
+        self._event_source.post(DeviceEventKind(kind), data)
 
 
 class ButtonBuilder(object):
@@ -185,6 +283,7 @@ class ButtonBuilder(object):
         self._name = None
         self._number = None
         self._zones: list[DimmerDevice] = []
+        self._preset_levels: list[float] = []
 
     def set_name(self, name: str):
         self._name = name
@@ -195,8 +294,9 @@ class ButtonBuilder(object):
     def set_keypad(self, keypad: Keypad):
         self._keypad = keypad
 
-    def append_zone(self, zone: DimmerDevice):
+    def append_zone(self, zone: DimmerDevice, preset_level: float = 100.0):
         self._zones.append(zone)
+        self._preset_levels.append(preset_level)
 
     def build(self) -> KeypadButton:
         assert self._name is not None
@@ -207,6 +307,7 @@ class ButtonBuilder(object):
             number=self._number,
             device_group=DimmerDeviceGroup(self._zones),
             keypad=self._keypad,
+            preset_levels=self._preset_levels,
         )
 
 
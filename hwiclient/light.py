@@ -2,7 +2,7 @@ from .dimmer import DimmerActions, DimmerDevice, DimmerDeviceType
 
 
 class LightDimmerActions(DimmerActions):
-    pass
+    __slots__ = ()
 
 
 class LightDimmerType(DimmerDeviceType):
@@ -0,0 +1,427 @@
+import asyncio
+import bisect
+import time
+from typing import Callable, Optional, Union
+
+from .connection.message import RequestMessage, RequestMessageKind, RequestPriority
+
+Reading = Union[float, dict[str, float]]
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+
+class Counter:
+    """A monotonically increasing count, optionally split by one label."""
+
+    __slots__ = ("name", "help", "label", "_values", "_last_values", "_last_time")
+
+    def __init__(self, name: str, help: str, label: Optional[str] = None):
+        self.name = name
+        self.help = help
+        self.label = label
+        self._values: dict[str, float] = {}
+        self._last_values: dict[str, float] = {}
+        self._last_time: Optional[float] = None
+
+    def inc(self, amount: float = 1.0, label_value: str = ""):
+        self._values[label_value] = self._values.get(label_value, 0.0) + amount
+
+    def values(self) -> dict[str, float]:
+        return dict(self._values)
+
+    def rates(self, now: float) -> dict[str, float]:
+        """The increase per second of each value since the previous call."""
+        rates = {}
+        if self._last_time is not None and now > self._last_time:
+            elapsed = now - self._last_time
+            rates = {
+                label_value: (value - self._last_values.get(label_value, 0.0)) / elapsed
+                for label_value, value in self._values.items()
+            }
+        self._last_values = dict(self._values)
+        self._last_time = now
+        return rates
+
+
+class ObservedCounter:
+    """A count kept elsewhere, read when the metrics are collected."""
+
+    __slots__ = ("name", "help", "label", "_read")
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        read: Callable[[], Reading],
+        label: Optional[str] = None,
+    ):
+        self.name = name
+        self.help = help
+        self.label = label
+        self._read = read
+
+    def values(self) -> dict[str, float]:
+        reading = self._read()
+        if isinstance(reading, dict):
+            return {label_value: float(value) for label_value, value in reading.items()}
+        return {"": float(reading)}
+
+
+class Gauge(ObservedCounter):
+    """A value that can go up and down, read when the metrics are collected."""
+
+    __slots__ = ()
+
+
+class _HistogramSeries:
+    __slots__ = ("bucket_counts", "count", "sum")
+
+    def __init__(self, bucket_count: int):
+        self.bucket_counts = [0] * bucket_count
+        self.count = 0
+        self.sum = 0.0
+
+
+class Histogram:
+    """Counts observations into fixed buckets, optionally split by one label."""
+
+    __slots__ = ("name", "help", "label", "buckets", "_series")
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        label: Optional[str] = None,
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.label = label
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[str, _HistogramSeries] = {}
+
+    def observe(self, value: float, label_value: str = ""):
+        series = self._series.get(label_value)
+        if series is None:
+            series = self._series[label_value] = _HistogramSeries(len(self.buckets))
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series.bucket_counts[index] += 1
+        series.count += 1
+        series.sum += value
+
+    def summaries(self) -> dict[str, dict]:
+        summaries = {}
+        for label_value, series in self._series.items():
+            cumulative = 0
+            buckets = {}
+            for bound, count in zip(self.buckets, series.bucket_counts):
+                cumulative += count
+                buckets[bound] = cumulative
+            summaries[label_value] = {
+                "count": series.count,
+                "sum": series.sum,
+                "buckets": buckets,
+            }
+        return summaries
+
+
+Metric = Union[Counter, ObservedCounter, Histogram]
+
+
+def _labels(label: Optional[str], value: str, extra: str = "") -> str:
+    pairs = []
+    if label is not None:
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{label}="{escaped}"')
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class MetricsRegistry:
+    """A named set of metrics, readable as a snapshot or as Prometheus text."""
+
+    __slots__ = ("_metrics", "_clock")
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._metrics: dict[str, Metric] = {}
+        self._clock = clock
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"metric `{metric.name}`: already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, label: Optional[str] = None) -> Counter:
+        return self.register(Counter(name, help, label))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        label: Optional[str] = None,
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, help, label, buckets))
+
+    def observed_counter(
+        self,
+        name: str,
+        help: str,
+        read: Callable[[], Reading],
+        label: Optional[str] = None,
+    ) -> ObservedCounter:
+        return self.register(ObservedCounter(name, help, read, label))
+
+    def gauge(
+        self,
+        name: str,
+        help: str,
+        read: Callable[[], Reading],
+        label: Optional[str] = None,
+    ) -> Gauge:
+        return self.register(Gauge(name, help, read, label))
+
+    def snapshot(self) -> dict[str, dict]:
+        """
+        The current value of every metric, by name and label value.
+
+        Counters also report their rate per second since the previous snapshot, under
+        `<name>_per_second`.
+        """
+        now = self._clock()
+        snapshot: dict[str, dict] = {}
+        for name, metric in self._metrics.items():
+            if isinstance(metric, Histogram):
+                snapshot[name] = metric.summaries()
+            elif isinstance(metric, Counter):
+                snapshot[name] = metric.values()
+                snapshot[name + "_per_second"] = metric.rates(now)
+            else:
+                snapshot[name] = metric.values()
+        return snapshot
+
+    def prometheus_text(self) -> str:
+        """Every metric in the Prometheus text exposition format."""
+        lines = []
+        for name, metric in self._metrics.items():
+            lines.append(f"# HELP {name} {metric.help}")
+            if isinstance(metric, Histogram):
+                lines.append(f"# TYPE {name} histogram")
+                for label_value, summary in metric.summaries().items():
+                    for bound, count in summary["buckets"].items():
+                        bucket_labels = _labels(
+                            metric.label, label_value, f'le="{bound}"'
+                        )
+                        lines.append(f"{name}_bucket{bucket_labels} {count}")
+                    inf_labels = _labels(metric.label, label_value, 'le="+Inf"')
+                    labels = _labels(metric.label, label_value)
+                    lines.append(f"{name}_bucket{inf_labels} {summary['count']}")
+                    lines.append(f"{name}_sum{labels} {summary['sum']}")
+                    lines.append(f"{name}_count{labels} {summary['count']}")
+                continue
+            kind = "gauge" if isinstance(metric, Gauge) else "counter"
+            lines.append(f"# TYPE {name} {kind}")
+            for label_value, value in metric.values().items():
+                lines.append(f"{name}{_labels(metric.label, label_value)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+async def serve_metrics(
+    registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9464
+) -> asyncio.AbstractServer:
+    """
+    Serves `registry` in the Prometheus text format over HTTP, on any path.
+
+    The server is meant for local scraping: it reads the request head, answers and
+    closes the connection.
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+            body = registry.prometheus_text().encode("utf-8")
+            writer.write(
+                b"HTTP/1.0 200 OK\r\n"
+                b"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                b"Content-Length: " + str(len(body)).encode("ascii") + b"\r\n"
+                b"Connection: close\r\n\r\n" + body
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+def _lane_name(priority: int) -> str:
+    try:
+        return RequestPriority(priority).name.lower()
+    except ValueError:
+        return str(priority)
+
+
+class HubMetrics:
+    """
+    The connection, queue and dispatch metrics of a HomeworksHub.
+
+    The coordinator and notifier call into this only when a hub is created with
+    metrics enabled.
+    """
+
+    __slots__ = (
+        "_registry",
+        "_clock",
+        "_commands",
+        "_enqueued_at",
+        "_written_at",
+        "_bytes_in",
+        "_bytes_out",
+        "_lines_in",
+        "_lines_out",
+        "_enqueue_to_write",
+        "_write_to_prompt",
+        "_dispatch",
+        "_connections",
+    )
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._registry = MetricsRegistry()
+        self._clock = clock
+        self._commands: dict[bytes, str] = {}
+        self._enqueued_at: dict[int, float] = {}
+        self._written_at: Optional[float] = None
+        registry = self._registry
+        self._bytes_in = registry.counter(
+            "hwi_bytes_received_total", "Bytes received, including line endings."
+        )
+        self._bytes_out = registry.counter(
+            "hwi_bytes_sent_total", "Bytes written, including line endings."
+        )
+        self._lines_in = registry.counter(
+            "hwi_lines_received_total", "Lines received, by command.", "command"
+        )
+        self._lines_out = registry.counter(
+            "hwi_lines_sent_total", "Lines written, by command.", "command"
+        )
+        self._enqueue_to_write = registry.histogram(
+            "hwi_enqueue_to_write_seconds",
+            "Time requests wait in the queue, by lane.",
+            "lane",
+        )
+        self._write_to_prompt = registry.histogram(
+            "hwi_write_to_prompt_seconds",
+            "Time from writing a request to the next LNET prompt.",
+        )
+        self._dispatch = registry.histogram(
+            "hwi_dispatch_seconds",
+            "Time spent notifying the subscribers of a topic.",
+            "topic",
+        )
+        self._connections = registry.counter(
+            "hwi_connections_total", "Connections opened; reconnects are all but one."
+        )
+
+    @property
+    def registry(self) -> MetricsRegistry:
+        return self._registry
+
+    def snapshot(self) -> dict[str, dict]:
+        return self._registry.snapshot()
+
+    def prometheus_text(self) -> str:
+        return self._registry.prometheus_text()
+
+    async def serve(
+        self, host: str = "127.0.0.1", port: int = 9464
+    ) -> asyncio.AbstractServer:
+        """Serves the metrics in the Prometheus text format. See `serve_metrics`."""
+        return await serve_metrics(self._registry, host, port)
+
+    def _command_of(self, line: bytes) -> str:
+        head = line.split(b",", 1)[0]
+        command = self._commands.get(head)
+        if command is None:
+            command = head.decode("ascii", "replace").strip() or "empty"
+            # Free-form replies would otherwise grow the label set without bound.
+            if len(command) > 16 or " " in command or len(self._commands) >= 256:
+                command = "other"
+            self._commands[head] = command
+        return command
+
+    def connected(self):
+        self._connections.inc()
+
+    def line_received(self, line: bytes):
+        self._bytes_in.inc(len(line) + 2)
+        self._lines_in.inc(1.0, self._command_of(line))
+
+    def prompt_received(self):
+        if self._written_at is not None:
+            self._write_to_prompt.observe(self._clock() - self._written_at)
+            self._written_at = None
+
+    def request_enqueued(self, request: RequestMessage):
+        self._enqueued_at[request.sequence] = self._clock()
+
+    def request_written(self, request: RequestMessage):
+        now = self._clock()
+        enqueued_at = self._enqueued_at.pop(request.sequence, None)
+        if enqueued_at is not None:
+            self._enqueue_to_write.observe(
+                now - enqueued_at, _lane_name(request.priority)
+            )
+        self._written_at = now
+        if request.kind == RequestMessageKind.SEND_ENCODED:
+            line = request.data
+            self._bytes_out.inc(len(line))
+        elif isinstance(request.data, str):
+            line = request.data.encode("ascii", "replace")
+            self._bytes_out.inc(len(line) + 2)
+        else:
+            return
+        self._lines_out.inc(1.0, self._command_of(line.rstrip(b"\r\n")))
+
+    def dispatched(self, topic: str, seconds: float):
+        self._dispatch.observe(seconds, topic)
+
+    def observe_queue(self, read_depths: Callable[[], dict[str, float]]):
+        self._registry.gauge(
+            "hwi_queue_depth",
+            "Requests waiting to be written, by lane.",
+            read_depths,
+            "lane",
+        )
+
+    def observe_dropped_lines(self, read: Callable[[], float]):
+        self._registry.observed_counter(
+            "hwi_dropped_lines_total", "Lines dropped for unknown addresses.", read
+        )
+
+    def observe_unparsed_lines(self, read: Callable[[], dict[str, float]]):
+        self._registry.observed_counter(
+            "hwi_unparsed_lines_total",
+            "Lines that matched no line spec, or did not parse.",
+            read,
+            "reason",
+        )
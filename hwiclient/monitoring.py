@@ -1,8 +1,15 @@
 from __future__ import annotations
 
 import logging
+import time
 from enum import StrEnum
-from typing import Any, Protocol
+from typing import TYPE_CHECKING, Any, Callable, Optional, Protocol
+
+from .profiling import DISPATCH_PROFILER
+from .trace import TRACER, TracePoint
+
+if TYPE_CHECKING:
+    from .metrics import HubMetrics
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -14,6 +21,46 @@ class MonitoringTopic(StrEnum):
     KEYPAD_BUTTON_HOLD = "KBH"
     KEYPAD_BUTTON_DOUBLE_TAP = "KBDT"
     KEYPAD_LED_STATES_CHANGED = "KLS"
+    GRAFIK_EYE_SCENE_SELECTED = "GSS"
+    TIMECLOCK_EVENT = "TE"
+    TIMECLOCK_SUNRISE = "SUNRISE"
+    TIMECLOCK_SUNSET = "SUNSET"
+    TIMECLOCK_REALTIME = "RST"
+
+
+class MonitoringKind(StrEnum):
+    """A kind of processor monitoring, turned on with `<kind>MON` and off with `<kind>MOFF`."""
+
+    DIMMER_LEVEL = "DL"
+    KEYPAD_BUTTON = "KB"
+    KEYPAD_LED = "KL"
+    GRAFIK_EYE_SCENE = "GS"
+    TIMECLOCK = "TE"
+
+    @property
+    def enable_command(self) -> str:
+        return self.value + "MON"
+
+    @property
+    def disable_command(self) -> str:
+        return self.value + "MOFF"
+
+
+_TOPIC_MONITORING_KINDS: dict[MonitoringTopic, MonitoringKind] = {
+    MonitoringTopic.DIMMER_LEVEL_CHANGED: MonitoringKind.DIMMER_LEVEL,
+    MonitoringTopic.KEYPAD_BUTTON_PRESS: MonitoringKind.KEYPAD_BUTTON,
+    MonitoringTopic.KEYPAD_BUTTON_RELEASE: MonitoringKind.KEYPAD_BUTTON,
+    MonitoringTopic.KEYPAD_BUTTON_HOLD: MonitoringKind.KEYPAD_BUTTON,
+    MonitoringTopic.KEYPAD_BUTTON_DOUBLE_TAP: MonitoringKind.KEYPAD_BUTTON,
+    MonitoringTopic.KEYPAD_LED_STATES_CHANGED: MonitoringKind.KEYPAD_LED,
+    MonitoringTopic.GRAFIK_EYE_SCENE_SELECTED: MonitoringKind.GRAFIK_EYE_SCENE,
+    MonitoringTopic.TIMECLOCK_EVENT: MonitoringKind.TIMECLOCK,
+}
+
+
+def monitoring_kind(topic: MonitoringTopic) -> Optional[MonitoringKind]:
+    """The kind of monitoring the processor needs enabled to report `topic`."""
+    return _TOPIC_MONITORING_KINDS.get(topic)
 
 
 class MonitoringTopicKey(StrEnum):
@@ -21,9 +68,15 @@ class MonitoringTopicKey(StrEnum):
     BUTTON = "button"
     LEVEL = "level"
     LED_STATES = "led_states"
+    SCENE = "scene"
+    EVENT = "event"
+    STATE = "state"
+    TIME = "time"
 
 
 class TopicSubscriber(Protocol):
+    __slots__ = ()
+
     def on_topic_update(self, topic: MonitoringTopic, data: dict):
         pass
 
@@ -40,8 +93,36 @@ class TopicNotifier(Protocol):
 
 
 class MonitoringTopicNotifier(TopicNotifier):
-    def __init__(self):
+    def __init__(
+        self,
+        on_monitoring_changed: Optional[Callable[[MonitoringKind, bool], None]] = None,
+    ):
+        """
+        Args:
+            on_monitoring_changed: Called with a kind of monitoring and True when the
+                first subscriber to one of its topics subscribes, and with False when
+                the last one unsubscribes.
+        """
         self._subscribers: dict[MonitoringTopic, list[TopicSubscriber]] = {}
+        self._on_monitoring_changed = on_monitoring_changed
+        self._kind_subscriptions: dict[MonitoringKind, int] = {}
+        self._metrics: Optional[HubMetrics] = None
+
+    @property
+    def monitored_kinds(self) -> frozenset[MonitoringKind]:
+        """The kinds of monitoring that some subscriber needs."""
+        return frozenset(self._kind_subscriptions)
+
+    @property
+    def metrics(self) -> Optional[HubMetrics]:
+        return self._metrics
+
+    @metrics.setter
+    def metrics(self, metrics: Optional[HubMetrics]):
+        self._metrics = metrics
+
+    def has_subscribers(self, topic: MonitoringTopic) -> bool:
+        return bool(self._subscribers.get(topic))
 
     def subscribe(self, subscriber: TopicSubscriber, *topics: MonitoringTopic):
         for topic in topics:
@@ -49,16 +130,44 @@ class MonitoringTopicNotifier(TopicNotifier):
                 self._subscribers[topic] = [subscriber]
             else:
                 self._subscribers[topic].append(subscriber)
+            self._count_subscription(topic, 1)
 
     def unsubscribe(self, subscriber: TopicSubscriber, *topics: MonitoringTopic):
         for topic in topics:
             if topic in self._subscribers:
                 self._subscribers[topic].remove(subscriber)
+                self._count_subscription(topic, -1)
+
+    def _count_subscription(self, topic: MonitoringTopic, delta: int):
+        kind = _TOPIC_MONITORING_KINDS.get(topic)
+        if kind is None:
+            return
+        count = self._kind_subscriptions.get(kind, 0) + delta
+        if count > 0:
+            self._kind_subscriptions[kind] = count
+        else:
+            del self._kind_subscriptions[kind]
+        if self._on_monitoring_changed is not None and (count == 0 or count == delta):
+            self._on_monitoring_changed(kind, count > 0)
 
     def notify_subscribers(
         self, topic: MonitoringTopic, data: dict[MonitoringTopicKey, Any]
     ):
-        _LOGGER.warning(f"TOPIC {topic} data={data}")
-        if topic in self._subscribers:
-            for subscriber in self._subscribers[topic]:
+        if TRACER.enabled:
+            TRACER.emit(TracePoint.TOPIC_NOTIFIED, topic, data)
+        subscribers = self._subscribers.get(topic)
+        if not subscribers:
+            return
+        start = time.perf_counter() if self._metrics is not None else 0.0
+        if DISPATCH_PROFILER.enabled:
+            for subscriber in subscribers:
+                subscriber_start = time.perf_counter_ns()
+                subscriber.on_topic_update(topic, data)
+                DISPATCH_PROFILER.record(
+                    subscriber, topic, time.perf_counter_ns() - subscriber_start
+                )
+        else:
+            for subscriber in subscribers:
                 subscriber.on_topic_update(topic, data)
+        if self._metrics is not None:
+            self._metrics.dispatched(topic, time.perf_counter() - start)
@@ -1,6 +1,6 @@
 import logging
 import xml.etree.ElementTree as ET
-from typing import Optional, Tuple
+from typing import Any, Optional, Tuple
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -99,6 +99,8 @@ def find_text(element: ET.Element, tag_name: str) -> Optional[str]:
 class HwiXmlParser(object):
     def __init__(self, remap: dict):
         self._remap = remap
+        self._zone_addrs: dict[str, Optional[str]] = {}
+        self._deferred_zones: Optional[list[dict]] = None
 
     def _remap_str(self, input: Optional[str], key: str) -> Optional[str]:
         if key not in self._remap:
@@ -115,14 +117,17 @@ class HwiXmlParser(object):
     def _remap_button_name(self, button_name: Optional[str]) -> Optional[str]:
         return self._remap_str(button_name, key="button_names")
 
+    def _index_zone_addrs(self, root: ET.Element) -> dict[str, Optional[str]]:
+        """Maps every output's zone number to its address in a single pass."""
+        zone_addrs: dict[str, Optional[str]] = {}
+        for output in root.iterfind(".//Area/Room/Outputs/Output"):
+            zone_num = find_text(output, "ZoneNum")
+            if zone_num is not None and zone_num not in zone_addrs:
+                zone_addrs[zone_num] = find_text(output, "Address")
+        return zone_addrs
+
     def _resolve_zone_addr_from_number(self, zone_num: str) -> Optional[str]:
-        element = self._root.find(f'.//Area/Room/Outputs/Output[ZoneNum="{zone_num}"]')
-        if element is None:
-            return None
-        zone_addr = element.find("Address")
-        if zone_addr is None:
-            return None
-        return zone_addr.text
+        return self._zone_addrs.get(zone_num)
 
     def _parse_output(self, output: ET.Element) -> Tuple[str, dict]:
         output_name = find_text(output, "Name")
@@ -139,14 +144,23 @@ class HwiXmlParser(object):
         }
         return (output_type, device_dict)
 
-    def _parse_keypad_button_zone(self, zone_num_tag: ET.Element) -> dict:
-        zone_num_text = zone_num_tag.text
+    def _parse_keypad_button_zone(self, preset_output: ET.Element) -> dict:
+        zone_num_text = find_text(preset_output, "ZoneNum")
         assert zone_num_text is not None
+        zone: dict[str, Any] = {"number": zone_num_text, "address": None}
+        level_text = find_text(preset_output, "Level")
+        if level_text is not None:
+            zone["level"] = float(level_text)
+
+        if self._deferred_zones is not None:
+            self._deferred_zones.append(zone)
+            return zone
+
         # Resolve the zone address from the zone number
         zone_addr_text = self._resolve_zone_addr_from_number(zone_num_text)
         assert zone_addr_text is not None
-
-        return {"number": zone_num_text, "address": zone_addr_text}
+        zone["address"] = zone_addr_text
+        return zone
 
     def _parse_keypad_button_zones(self, button: ET.Element) -> list[dict]:
         zones = []
@@ -156,8 +170,9 @@ class HwiXmlParser(object):
         assert presets is not None
         first_preset = presets.find("Preset")
         if first_preset is not None:
-            for zone_num_tag in first_preset.findall("Output/ZoneNum"):
-                zones.append(self._parse_keypad_button_zone(zone_num_tag))
+            for preset_output in first_preset.findall("Output"):
+                if preset_output.find("ZoneNum") is not None:
+                    zones.append(self._parse_keypad_button_zone(preset_output))
         return zones
 
     def _parse_keypad_button(self, button: ET.Element) -> Optional[dict]:
@@ -211,64 +226,143 @@ class HwiXmlParser(object):
             )
             return None
 
-    def parse_file(self, xml_file) -> dict:
+    def _new_room_devices(self) -> dict[str, list]:
+        return {
+            "dimmers": [],
+            "fans": [],
+            "shades": [],
+            "switches": [],
+            "keypads": [],
+        }
+
+    def _add_room_output(self, room_devices: dict[str, list], output: ET.Element):
+        output_type, device_dict = self._parse_output(output)
+        if output_type == "DIMMER":
+            room_devices["dimmers"].append(device_dict)
+        elif output_type == "SWITCH":
+            room_devices["switches"].append(device_dict)
+        elif output_type == "FAN":
+            room_devices["fans"].append(device_dict)
+        elif output_type == "QED SHADE":
+            room_devices["shades"].append(device_dict)
+        else:
+            raise ValueError(f"Unknown output type: {output_type}")
+
+    def _add_room_control_station(
+        self, room_devices: dict[str, list], input: ET.Element
+    ):
+        dev_tuple = self._parse_control_station(input)
+        if dev_tuple is None:
+            return
+        dev_type, dev_dict = dev_tuple
+        if dev_type == "KEYPAD":
+            room_devices["keypads"].append(dev_dict)
+
+    def _merge_room_devices(
+        self,
+        devices: dict,
+        room_name: Optional[str],
+        room_devices: dict[str, list],
+    ):
+        if room_name in devices:
+            dict_to_merge = {k: v for k, v in room_devices.items() if len(v) != 0}
+            dict_orig = devices[room_name]
+            for key, value in dict_to_merge.items():
+                if key not in dict_orig:
+                    dict_orig[key] = value
+                else:
+                    dict_orig[key] += value
+            devices[room_name] = dict_orig
+        else:
+            devices[room_name] = {k: v for k, v in room_devices.items() if len(v) != 0}
+
+    def parse_file(self, xml_file, streaming: bool = False) -> dict:
+        """
+        Parses an Illumination project export into a device dictionary.
+
+        With `streaming`, the export is read incrementally and every output and
+        control station is discarded as soon as it has been parsed, so the whole
+        document is never held in memory.
+        """
+        if streaming:
+            return self._parse_file_streaming(xml_file)
+
         tree = ET.parse(xml_file)
         self._root = tree.getroot()
+        self._zone_addrs = self._index_zone_addrs(self._root)
 
         devices = {}
         for area in self._root.iter("Area"):
             area_name = find_text(area, "Name")
             # print(f"Area: {area_name}")
             for room in area.iter("Room"):
-                room_devices = {
-                    "dimmers": [],
-                    "fans": [],
-                    "shades": [],
-                    "switches": [],
-                    "keypads": [],
-                }
+                room_devices = self._new_room_devices()
                 room_name = self._remap_room_name(find_text(room, "Name"))
 
                 # print(f"\tRoom: {room_name}")
                 outputs = room.find("Outputs")
                 if outputs is not None:
                     for output in outputs.iter("Output"):
-                        output_type, device_dict = self._parse_output(output)
-                        if output_type == "DIMMER":
-                            room_devices["dimmers"].append(device_dict)
-                        elif output_type == "SWITCH":
-                            room_devices["switches"].append(device_dict)
-                        elif output_type == "FAN":
-                            room_devices["fans"].append(device_dict)
-                        elif output_type == "QED SHADE":
-                            room_devices["shades"].append(device_dict)
-                        else:
-                            raise ValueError(f"Unknown output type: {output_type}")
+                        self._add_room_output(room_devices, output)
 
                 inputs = room.find("Inputs")
                 if inputs is not None:
                     for input in inputs.iter("ControlStation"):
-                        dev_tuple = self._parse_control_station(input)
-                        if dev_tuple is None:
-                            continue
-                        dev_type, dev_dict = dev_tuple
-                        if dev_type == "KEYPAD":
-                            room_devices["keypads"].append(dev_dict)
-
-                if room_name in devices:
-                    dict_to_merge = {
-                        k: v for k, v in room_devices.items() if len(v) != 0
-                    }
-                    dict_orig = devices[room_name]
-                    for key, value in dict_to_merge.items():
-                        if key not in dict_orig:
-                            dict_orig[key] = value
-                        else:
-                            dict_orig[key] += value
-                    devices[room_name] = dict_orig
-                else:
-                    devices[room_name] = {
-                        k: v for k, v in room_devices.items() if len(v) != 0
-                    }
+                        self._add_room_control_station(room_devices, input)
+
+                self._merge_room_devices(devices, room_name, room_devices)
 
         return {"devices": devices}
+
+    def _parse_file_streaming(self, xml_file) -> dict:
+        self._zone_addrs = {}
+        deferred_zones: list[dict] = []
+        self._deferred_zones = deferred_zones
+        try:
+            devices = self._parse_rooms_streaming(xml_file)
+        finally:
+            self._deferred_zones = None
+
+        # Keypad presets can reference zones of rooms that come later in the export.
+        for zone in deferred_zones:
+            zone_addr_text = self._resolve_zone_addr_from_number(zone["number"])
+            assert zone_addr_text is not None
+            zone["address"] = zone_addr_text
+
+        return {"devices": devices}
+
+    def _parse_rooms_streaming(self, xml_file) -> dict:
+        devices = {}
+        open_elements: list[ET.Element] = []
+        open_rooms: list[dict[str, list]] = []
+        for event, element in ET.iterparse(xml_file, events=("start", "end")):
+            if event == "start":
+                open_elements.append(element)
+                if element.tag == "Room":
+                    open_rooms.append(self._new_room_devices())
+                continue
+
+            open_elements.pop()
+            parent = open_elements[-1] if open_elements else None
+            in_room = (
+                parent is not None
+                and len(open_elements) >= 2
+                and open_elements[-2].tag == "Room"
+            )
+            if element.tag == "Output" and in_room and parent.tag == "Outputs":
+                zone_num = find_text(element, "ZoneNum")
+                if zone_num is not None and zone_num not in self._zone_addrs:
+                    self._zone_addrs[zone_num] = find_text(element, "Address")
+                self._add_room_output(open_rooms[-1], element)
+            elif element.tag == "ControlStation" and in_room and parent.tag == "Inputs":
+                self._add_room_control_station(open_rooms[-1], element)
+            elif element.tag == "Room":
+                room_name = self._remap_room_name(find_text(element, "Name"))
+                self._merge_room_devices(devices, room_name, open_rooms.pop())
+            elif element.tag != "Area":
+                continue
+
+            if parent is not None:
+                parent.remove(element)
+
+        return devices
@@ -0,0 +1,68 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass(slots=True)
+class PendingLevel:
+    """A level that was commanded for a zone but not yet reported by the processor."""
+
+    level: float
+    deadline: float
+
+
+class PendingLevels:
+    """
+    Commanded zone levels, by encoded address, until they are confirmed or expire.
+
+    A single loop timer is armed for the earliest deadline; when it fires, every
+    expired level is handed to `on_expired` and the timer is re-armed for the next one.
+    """
+
+    __slots__ = ("_pending", "_on_expired", "_timer", "_timer_deadline")
+
+    def __init__(self, on_expired: Callable[[str, PendingLevel], None]):
+        self._pending: dict[str, PendingLevel] = {}
+        self._on_expired = on_expired
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_deadline: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def get(self, key: str) -> Optional[PendingLevel]:
+        return self._pending.get(key)
+
+    def add(self, key: str, level: float, timeout: float):
+        """Records `level` as pending for `timeout` seconds, replacing any earlier one."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        self._pending[key] = PendingLevel(level, deadline)
+        if self._timer_deadline is None or deadline < self._timer_deadline:
+            self._arm(loop, deadline)
+
+    def pop(self, key: str) -> Optional[PendingLevel]:
+        return self._pending.pop(key, None)
+
+    def _arm(self, loop: asyncio.AbstractEventLoop, deadline: float):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = loop.call_at(deadline, self._expire)
+        self._timer_deadline = deadline
+
+    def _expire(self):
+        self._timer = None
+        self._timer_deadline = None
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        expired = [
+            (key, pending)
+            for key, pending in self._pending.items()
+            if pending.deadline <= now
+        ]
+        for key, pending in expired:
+            del self._pending[key]
+        if self._pending:
+            self._arm(loop, min(pending.deadline for pending in self._pending.values()))
+        for key, pending in expired:
+            self._on_expired(key, pending)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Callable, Iterable, Optional
+
+from .commands.dimmer import MAX_DIMMER_ADDRESSES, FadeDimmer
+from .device import DeviceAddress
+
+FadeKey = tuple[float, timedelta, timedelta]
+
+
+@dataclass(slots=True)
+class StatePlan:
+    """The FADEDIM commands that bring a set of zones to their target levels."""
+
+    commands: list[FadeDimmer] = field(default_factory=list)
+    skipped: list[DeviceAddress] = field(default_factory=list)
+    naive_count: int = 0
+
+    @property
+    def sent_count(self) -> int:
+        return len(self.commands)
+
+    @property
+    def saved_count(self) -> int:
+        """How many fewer commands were planned than one per target zone."""
+        return self.naive_count - self.sent_count
+
+
+def batch_fades(groups: dict[FadeKey, list[DeviceAddress]]) -> list[FadeDimmer]:
+    """
+    Builds the fewest FadeDimmer commands for zones grouped by (level, fade, delay).
+
+    Each group becomes one command per `MAX_DIMMER_ADDRESSES` zones, in group order.
+    """
+    commands = []
+    for (level, fade_time, delay_time), addresses in groups.items():
+        for start in range(0, len(addresses), MAX_DIMMER_ADDRESSES):
+            chunk = addresses[start : start + MAX_DIMMER_ADDRESSES]
+            commands.append(FadeDimmer(level, fade_time, delay_time, *chunk))
+    return commands
+
+
+def plan_state(
+    targets: dict[DeviceAddress, float],
+    level_of: Callable[[DeviceAddress], Optional[float]],
+    fade_time: timedelta = timedelta(),
+    delay_time: timedelta = timedelta(),
+    tolerance: float = 0.5,
+) -> StatePlan:
+    """
+    Plans the commands that move every zone of `targets` to its level.
+
+    Args:
+        targets: The target level of each zone.
+        level_of: Returns the cached level of a zone, or None when it is not known.
+        tolerance: Zones whose cached level is within this many percent of the target
+            are skipped. Zones with no cached level are always sent.
+    """
+    plan = StatePlan(naive_count=len(targets))
+    groups: dict[FadeKey, list[DeviceAddress]] = {}
+    for address, level in targets.items():
+        current = level_of(address)
+        if current is not None and abs(current - level) <= tolerance:
+            plan.skipped.append(address)
+            continue
+        groups.setdefault((level, fade_time, delay_time), []).append(address)
+    plan.commands = batch_fades(groups)
+    return plan
+
+
+@dataclass(slots=True)
+class TimelineStep:
+    offset: timedelta
+    addresses: tuple[DeviceAddress, ...]
+    level: float
+    fade_time: timedelta
+
+
+class Timeline:
+    """
+    A staggered lighting effect that the processor times itself.
+
+    Each step fades some zones to a level, `offset` after the timeline is run. Steps
+    become FADEDIM commands whose delay time is the offset, so every command is sent
+    up front and the client holds no timers. The processor counts delays in whole
+    seconds, so offsets must be whole seconds under a day.
+
+    A zone that appears in several steps gets one delayed command per step; whether a
+    later command replaces an earlier one that is still delayed is up to the processor.
+    """
+
+    __slots__ = ("_steps",)
+
+    def __init__(self):
+        self._steps: list[TimelineStep] = []
+
+    @property
+    def steps(self) -> list[TimelineStep]:
+        return self._steps
+
+    def add(
+        self,
+        offset: timedelta,
+        addresses: Iterable[DeviceAddress],
+        level: float,
+        fade_time: timedelta = timedelta(),
+    ) -> Timeline:
+        if offset < timedelta() or offset >= timedelta(days=1):
+            raise ValueError("offset must be between 0 and 24 hours")
+        if offset.microseconds != 0:
+            raise ValueError("offset must be a whole number of seconds")
+        self._steps.append(TimelineStep(offset, tuple(addresses), level, fade_time))
+        return self
+
+    def plan(self) -> StatePlan:
+        """The fewest FADEDIM commands for the steps, earliest delay first."""
+        # Dicts keep each zone once per group, in the order it was added.
+        groups: dict[FadeKey, dict[DeviceAddress, None]] = {}
+        naive_count = 0
+        for step in sorted(self._steps, key=lambda step: step.offset):
+            naive_count += len(step.addresses)
+            group = groups.setdefault((step.level, step.fade_time, step.offset), {})
+            group.update(dict.fromkeys(step.addresses))
+        commands = batch_fades({key: list(group) for key, group in groups.items()})
+        return StatePlan(commands=commands, naive_count=naive_count)
@@ -0,0 +1,124 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from .keypad import KeypadLedState, KeypadLedStates
+
+
+@dataclass(slots=True)
+class LedPredictionStats:
+    predictions: int = 0
+    matched: int = 0
+    mismatched: int = 0
+
+    @property
+    def accuracy(self) -> Optional[float]:
+        """The share of reconciled predictions that matched the processor."""
+        reconciled = self.matched + self.mismatched
+        if reconciled == 0:
+            return None
+        return self.matched / reconciled
+
+
+@dataclass(slots=True)
+class _PresetButton:
+    keypad_key: str
+    index: int
+    presets: tuple[tuple[str, float], ...]
+
+
+@dataclass(slots=True)
+class LedPrediction:
+    keypad_key: str
+    index: int
+    is_on: bool
+
+
+class LedPredictor:
+    """
+    Predicts keypad button LEDs from zone levels, before the processor reports them.
+
+    A button's LED is predicted on when every zone of its preset is at the preset level
+    (within `tolerance` percent), and off as soon as one of them is not. Buttons are
+    indexed by zone, so a level change only looks at the buttons that use that zone.
+    Each prediction is checked against the next KLS report for its keypad.
+    """
+
+    __slots__ = ("_tolerance", "_buttons_by_zone", "_levels", "_pending", "_stats")
+
+    def __init__(self, tolerance: float = 1.0):
+        self._tolerance = tolerance
+        self._buttons_by_zone: dict[str, list[_PresetButton]] = {}
+        self._levels: dict[str, float] = {}
+        self._pending: dict[str, dict[int, bool]] = {}
+        self._stats = LedPredictionStats()
+
+    @property
+    def stats(self) -> LedPredictionStats:
+        return self._stats
+
+    def add_button(self, keypad_key: str, index: int, presets: dict[str, float]):
+        """
+        Args:
+            keypad_key: The encoded address of the keypad.
+            index: The zero-based LED index of the button.
+            presets: The preset level of each zone, by encoded zone address.
+        """
+        if not presets:
+            return
+        button = _PresetButton(keypad_key, index, tuple(presets.items()))
+        for zone_key in presets:
+            self._buttons_by_zone.setdefault(zone_key, []).append(button)
+
+    def remove_keypad(self, keypad_key: str):
+        for zone_key, buttons in list(self._buttons_by_zone.items()):
+            buttons = [button for button in buttons if button.keypad_key != keypad_key]
+            if buttons:
+                self._buttons_by_zone[zone_key] = buttons
+            else:
+                del self._buttons_by_zone[zone_key]
+        self._pending.pop(keypad_key, None)
+
+    def remove_zone(self, zone_key: str):
+        for button in self._buttons_by_zone.pop(zone_key, []):
+            button.presets = tuple(
+                preset for preset in button.presets if preset[0] != zone_key
+            )
+        self._levels.pop(zone_key, None)
+
+    def _is_at_preset(self, button: _PresetButton) -> Optional[bool]:
+        unknown = False
+        for zone_key, preset_level in button.presets:
+            level = self._levels.get(zone_key)
+            if level is None:
+                unknown = True
+            elif abs(level - preset_level) > self._tolerance:
+                return False
+        return None if unknown else True
+
+    def zone_level_changed(self, zone_key: str, level: float) -> list[LedPrediction]:
+        """Records a zone level and returns the LEDs of the buttons that use it."""
+        self._levels[zone_key] = level
+        buttons = self._buttons_by_zone.get(zone_key)
+        if buttons is None:
+            return []
+
+        predictions = []
+        for button in buttons:
+            is_on = self._is_at_preset(button)
+            if is_on is None:
+                continue
+            self._pending.setdefault(button.keypad_key, {})[button.index] = is_on
+            predictions.append(LedPrediction(button.keypad_key, button.index, is_on))
+        self._stats.predictions += len(predictions)
+        return predictions
+
+    def reconcile(self, keypad_key: str, led_states: KeypadLedStates):
+        """Counts the pending predictions for a keypad against its reported LEDs."""
+        pending = self._pending.pop(keypad_key, None)
+        if pending is None:
+            return
+        for index, is_on in pending.items():
+            if (led_states[index] == KeypadLedState.ON) == is_on:
+                self._stats.matched += 1
+            else:
+                self._stats.mismatched += 1
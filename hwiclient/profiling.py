@@ -0,0 +1,105 @@
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable, Optional
+
+
+@dataclass(slots=True)
+class DispatchStats:
+    """How long the listeners of one class took to handle one kind of event or topic."""
+
+    listener: str
+    kind: str
+    calls: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+    over_budget: int = 0
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.calls if self.calls else 0.0
+
+
+class DispatchProfiler:
+    """
+    Times listener and subscriber callbacks, by listener class and event kind.
+
+    Disabled until `enable` is called; while disabled, dispatching only checks
+    `enabled`. Times are inclusive, so a subscriber that posts device events is also
+    charged for the listeners of those events.
+    """
+
+    __slots__ = ("_stats", "_budget_ns", "_on_over_budget", "enabled")
+
+    def __init__(self):
+        self._stats: dict[tuple[type, str], DispatchStats] = {}
+        self._budget_ns = 0
+        self._on_over_budget: Optional[Callable[[DispatchStats, int], None]] = None
+        self.enabled = False
+
+    def enable(
+        self,
+        budget: timedelta = timedelta(milliseconds=1),
+        on_over_budget: Optional[Callable[[DispatchStats, int], None]] = None,
+    ):
+        """
+        Starts timing callbacks.
+
+        Args:
+            budget: Calls that take longer are counted in `DispatchStats.over_budget`.
+            on_over_budget: Called with the stats and the nanoseconds of each call
+                that goes over the budget.
+        """
+        self._budget_ns = int(budget.total_seconds() * 1_000_000_000)
+        self._on_over_budget = on_over_budget
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self._stats.clear()
+
+    def record(self, listener: object, kind: str, elapsed_ns: int):
+        key = (type(listener), kind)
+        stats = self._stats.get(key)
+        if stats is None:
+            listener_type = type(listener)
+            stats = self._stats[key] = DispatchStats(
+                f"{listener_type.__module__}.{listener_type.__qualname__}", str(kind)
+            )
+        stats.calls += 1
+        stats.total_ns += elapsed_ns
+        if elapsed_ns > stats.max_ns:
+            stats.max_ns = elapsed_ns
+        if elapsed_ns > self._budget_ns:
+            stats.over_budget += 1
+            if self._on_over_budget is not None:
+                self._on_over_budget(stats, elapsed_ns)
+
+    @property
+    def stats(self) -> list[DispatchStats]:
+        return list(self._stats.values())
+
+    def over_budget(self) -> list[DispatchStats]:
+        """The stats of every listener that went over the budget at least once."""
+        return [stats for stats in self._stats.values() if stats.over_budget > 0]
+
+    def top(self, n: int = 10) -> list[DispatchStats]:
+        """The `n` stats with the most total time."""
+        return sorted(self._stats.values(), key=lambda stats: -stats.total_ns)[:n]
+
+    def report(self, n: int = 10) -> str:
+        lines = [
+            f"{'listener':<48} {'kind':<28} {'calls':>8} {'total ms':>10}"
+            f" {'mean us':>9} {'max us':>9} {'over':>6}"
+        ]
+        for stats in self.top(n):
+            lines.append(
+                f"{stats.listener[-48:]:<48} {stats.kind[:28]:<28} {stats.calls:>8}"
+                f" {stats.total_ns / 1e6:>10.3f} {stats.mean_ns / 1e3:>9.1f}"
+                f" {stats.max_ns / 1e3:>9.1f} {stats.over_budget:>6}"
+            )
+        return "\n".join(lines)
+
+
+DISPATCH_PROFILER = DispatchProfiler()
@@ -1,12 +1,25 @@
+import logging
+import sys
+from dataclasses import dataclass, field
+from datetime import timedelta
 from typing import Any, Optional, Type
 
 import yaml
 
+from .cache import ConfigCache
 from .device import DeviceAddress
 from .dimmer import DimmerDevice, DimmerDeviceType
 from .events import DeviceEventKey, DeviceEventKind, DeviceEventSource
 from .fan import FanDimmerType
-from .keypad import Keypad
+from .ingest import IngestFilter
+from .journal import ChangeJournal
+from .keypad import (
+    ButtonBuilder,
+    Keypad,
+    KeypadBuilder,
+    KeypadLedState,
+    KeypadLedStates,
+)
 from .light import LightDimmerType
 from .monitoring import (
     MonitoringTopic,
@@ -14,81 +27,659 @@ from .monitoring import (
     TopicNotifier,
     TopicSubscriber,
 )
+from .pending import PendingLevel, PendingLevels
+from .prediction import LedPrediction, LedPredictor
 from .shade import ShadeDimmerType
 from .switch import SwitchDimmerType
 
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class ZoneRecord:
+    """The compact form of a configured zone, kept until its DimmerDevice is needed."""
+
+    address: str
+    name: str
+    number: str
+    room: str
+    type_id: str
+    fan_speeds: int = 4
+    level: float = 0
+
+
+@dataclass(slots=True)
+class KeypadRecord:
+    """The compact form of a configured keypad, kept until its Keypad is needed."""
+
+    address: str
+    name: str
+    room: str
+    buttons: list[dict]
+    led_states: int = 0
+
+
+@dataclass(slots=True)
+class ReloadReport:
+    """The devices a configuration reload added, removed or changed in place."""
+
+    added: list[DeviceAddress] = field(default_factory=list)
+    removed: list[DeviceAddress] = field(default_factory=list)
+    updated: list[DeviceAddress] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.updated)
+
 
 class DeviceRepository(TopicSubscriber):
+    _KEYPAD_TOPIC_EVENT_KINDS = {
+        MonitoringTopic.KEYPAD_BUTTON_PRESS: DeviceEventKind.KEYPAD_BUTTON_PRESSED,
+        MonitoringTopic.KEYPAD_BUTTON_RELEASE: DeviceEventKind.KEYPAD_BUTTON_RELEASED,
+        MonitoringTopic.KEYPAD_BUTTON_HOLD: DeviceEventKind.KEYPAD_BUTTON_HELD,
+        MonitoringTopic.KEYPAD_BUTTON_DOUBLE_TAP: DeviceEventKind.KEYPAD_BUTTON_DOUBLE_TAPPED,
+        MonitoringTopic.KEYPAD_LED_STATES_CHANGED: DeviceEventKind.KEYPAD_LED_STATES_CHANGED,
+    }
+
+    _DIMMER_EVENT_KINDS = (
+        DeviceEventKind.DIMMER_LEVEL_CHANGED,
+        DeviceEventKind.DIMMER_LEVEL_PENDING,
+        DeviceEventKind.DIMMER_LEVEL_CONFIRMED,
+        DeviceEventKind.DIMMER_LEVEL_REVERTED,
+    )
+
+    # How far a reported level may be from a pending one and still confirm it.
+    _PENDING_TOLERANCE = 1.0
+
+    _ZONE_SECTIONS = {
+        "dimmers": LightDimmerType.type_id(),
+        "switches": SwitchDimmerType.type_id(),
+        "fans": FanDimmerType.type_id(),
+        "shades": ShadeDimmerType.type_id(),
+    }
+
     def __init__(
-        self, homeworks_config: Optional[dict[str, Any]], notifier: TopicNotifier
+        self,
+        homeworks_config: Optional[dict[str, Any]],
+        notifier: TopicNotifier,
+        journal: Optional[ChangeJournal] = None,
+        lazy: bool = False,
+        predict_leds: bool = False,
     ):
+        """
+        Args:
+            lazy: Keep configured zones and keypads as compact records and only build
+                their device objects the first time they are accessed.
+            predict_leds: Update keypad LEDs from zone levels as soon as they change,
+                instead of waiting for the processor to report them.
+        """
         self._keypads: dict[str, Keypad] = {}
         self._dimmers: dict[str, DimmerDevice] = {}
+        self._lazy = lazy
+        self._zone_records: dict[str, ZoneRecord] = {}
+        self._keypad_records: dict[str, KeypadRecord] = {}
+        self._journal = journal if journal is not None else ChangeJournal()
+        self._led_predictor = LedPredictor() if predict_leds else None
+        self._pending_levels = PendingLevels(self._revert_pending_level)
         self._notifier = notifier
-        self._notifier.subscribe(self, MonitoringTopic.DIMMER_LEVEL_CHANGED)
+        self._subscribed_topics: set[MonitoringTopic] = set()
+        self._ingest_filter = IngestFilter(self.is_known_address)
         self._event_source = DeviceEventSource()
         if homeworks_config is not None:
             self._add_from_yaml_dict(homeworks_config)
+        else:
+            self._devices_changed()
+
+    @property
+    def journal(self) -> ChangeJournal:
+        return self._journal
+
+    @property
+    def ingest_filter(self) -> IngestFilter:
+        """Drops received lines for devices that are not in this repository."""
+        return self._ingest_filter
+
+    def is_known_address(self, address: DeviceAddress) -> bool:
+        key = address.encoded
+        return (
+            key in self._dimmers
+            or key in self._zone_records
+            or key in self._keypads
+            or key in self._keypad_records
+        )
+
+    @property
+    def is_lazy(self) -> bool:
+        return self._lazy
+
+    @property
+    def led_predictor(self) -> Optional[LedPredictor]:
+        return self._led_predictor
 
     def on_topic_update(self, topic: MonitoringTopic, data: dict):
         if topic == MonitoringTopic.DIMMER_LEVEL_CHANGED:
             address = DeviceAddress(data[MonitoringTopicKey.ADDRESS])
             level = data[MonitoringTopicKey.LEVEL]
-            data = {
-                DeviceEventKey.DEVICE_ADDRESS: address,
-                DeviceEventKey.DIMMER_LEVEL: level,
-            }
-            self._event_source.post(DeviceEventKind.DIMMER_LEVEL_CHANGED, data)
+            self._apply_dimmer_level(address, level)
+            if self._led_predictor is not None:
+                self._apply_led_predictions(
+                    self._led_predictor.zone_level_changed(address.encoded, level)
+                )
+        elif topic in self._KEYPAD_TOPIC_EVENT_KINDS:
+            if MonitoringTopicKey.ADDRESS not in data:
+                return
+            address = DeviceAddress(data[MonitoringTopicKey.ADDRESS])
+            kind = self._KEYPAD_TOPIC_EVENT_KINDS[topic]
+            if kind == DeviceEventKind.KEYPAD_LED_STATES_CHANGED:
+                self._apply_keypad_led_states(
+                    address, data[MonitoringTopicKey.LED_STATES]
+                )
+            else:
+                self._apply_keypad_button(
+                    kind, address, data[MonitoringTopicKey.BUTTON]
+                )
+
+    def expect_level(self, address: DeviceAddress, level: float, timeout: timedelta):
+        """
+        Records `level` as pending for a zone until the processor reports a level or
+        `timeout` passes, whichever comes first.
+
+        While it is pending, the zone's `level` is the pending one. A report within
+        1% of it posts DIMMER_LEVEL_CONFIRMED; a timeout posts DIMMER_LEVEL_REVERTED.
+        """
+        key = address.encoded
+        if key not in self._zone_records and key not in self._dimmers:
+            return
+        self._pending_levels.add(key, level, timeout.total_seconds())
+        if key in self._dimmers:
+            self._event_source.post(
+                DeviceEventKind.DIMMER_LEVEL_PENDING,
+                {
+                    DeviceEventKey.DEVICE_ADDRESS: address,
+                    DeviceEventKey.PENDING_LEVEL: level,
+                },
+            )
+
+    def _revert_pending_level(self, key: str, pending: PendingLevel):
+        dimmer = self._dimmers.get(key)
+        if dimmer is None:
+            return
+        self._event_source.post(
+            DeviceEventKind.DIMMER_LEVEL_REVERTED,
+            {
+                DeviceEventKey.DEVICE_ADDRESS: dimmer.address,
+                DeviceEventKey.DIMMER_LEVEL: dimmer.confirmed_level,
+                DeviceEventKey.PENDING_LEVEL: pending.level,
+            },
+        )
+
+    def _apply_dimmer_level(self, address: DeviceAddress, level: float):
+        pending = self._pending_levels.pop(address.encoded)
+        record = self._zone_records.get(address.encoded)
+        if record is not None:
+            if record.level != level:
+                self._journal.record(
+                    DeviceEventKind.DIMMER_LEVEL_CHANGED, address, level
+                )
+                record.level = level
+            return
+
+        dimmer = self._dimmers.get(address.encoded)
+        # The level seen by callers may be a pending one the processor has not yet
+        # reported, so compare against the reported level.
+        if dimmer is not None and dimmer.confirmed_level != level:
+            self._journal.record(DeviceEventKind.DIMMER_LEVEL_CHANGED, address, level)
+        data = {
+            DeviceEventKey.DEVICE_ADDRESS: address,
+            DeviceEventKey.DIMMER_LEVEL: level,
+        }
+        self._event_source.post(DeviceEventKind.DIMMER_LEVEL_CHANGED, data)
+        if (
+            pending is not None
+            and abs(pending.level - level) <= self._PENDING_TOLERANCE
+        ):
+            self._event_source.post(
+                DeviceEventKind.DIMMER_LEVEL_CONFIRMED,
+                {
+                    DeviceEventKey.DEVICE_ADDRESS: address,
+                    DeviceEventKey.DIMMER_LEVEL: level,
+                },
+            )
+
+    def _apply_led_predictions(self, predictions: list[LedPrediction]):
+        for prediction in predictions:
+            index = prediction.index
+            state = KeypadLedState.ON if prediction.is_on else KeypadLedState.OFF
+            # Only steady LEDs are predicted; flashing ones are left to the processor.
+            opposite = KeypadLedState.OFF if prediction.is_on else KeypadLedState.ON
+            record = self._keypad_records.get(prediction.keypad_key)
+            if record is not None:
+                led_states = KeypadLedStates.from_packed(record.led_states)
+                if led_states[index] == opposite:
+                    predicted = led_states.with_state(index, state)
+                    record.led_states = predicted.packed
+                    # The report that confirms it is then unchanged and not journaled.
+                    self._journal.record(
+                        DeviceEventKind.KEYPAD_LED_STATES_CHANGED,
+                        DeviceAddress(record.address),
+                        str(predicted),
+                    )
+                continue
+
+            keypad = self._keypads.get(prediction.keypad_key)
+            if keypad is None or keypad.led_states[index] != opposite:
+                continue
+            predicted = keypad.led_states.with_state(index, state)
+            self._journal.record(
+                DeviceEventKind.KEYPAD_LED_STATES_CHANGED,
+                keypad.address,
+                str(predicted),
+            )
+            self._event_source.post(
+                DeviceEventKind.KEYPAD_LED_STATES_CHANGED,
+                {
+                    DeviceEventKey.DEVICE_ADDRESS: keypad.address,
+                    DeviceEventKey.KEYPAD_LED_STATES: predicted,
+                    DeviceEventKey.PREDICTED: True,
+                },
+            )
+
+    def _apply_keypad_led_states(self, address: DeviceAddress, led_states_str: str):
+        record = self._keypad_records.get(address.encoded)
+        keypad = self._keypads.get(address.encoded) if record is None else None
+        if record is None and keypad is None:
+            return
+
+        led_states = KeypadLedStates(led_states_str)
+        if self._led_predictor is not None:
+            self._led_predictor.reconcile(address.encoded, led_states)
+
+        # An unchanged refresh stops here, before any event is built.
+        if record is not None:
+            if record.led_states == led_states.packed:
+                return
+            record.led_states = led_states.packed
+        elif keypad is not None and keypad.led_states == led_states:
+            return
+
+        self._journal.record(
+            DeviceEventKind.KEYPAD_LED_STATES_CHANGED, address, led_states_str
+        )
+        if keypad is not None:
+            self._event_source.post(
+                DeviceEventKind.KEYPAD_LED_STATES_CHANGED,
+                {
+                    DeviceEventKey.DEVICE_ADDRESS: address,
+                    DeviceEventKey.KEYPAD_LED_STATES: led_states,
+                },
+            )
+
+    def _apply_keypad_button(
+        self, kind: DeviceEventKind, address: DeviceAddress, button: int
+    ):
+        if address.encoded in self._keypad_records:
+            self._journal.record(kind, address, button)
+        elif address.encoded in self._keypads:
+            self._journal.record(kind, address, button)
+            self._event_source.post(
+                kind,
+                {
+                    DeviceEventKey.DEVICE_ADDRESS: address,
+                    DeviceEventKey.BUTTON_NUMBER: button,
+                },
+            )
+
+    def add_from_yaml(self, yaml_filepath, cache: Optional[ConfigCache] = None):
+        if cache is not None:
+            self._add_from_yaml_dict(cache.load_yaml(yaml_filepath))
+            return
 
-    def add_from_yaml(self, yaml_filepath):
         with open(yaml_filepath, "r") as file:
             yaml_dict = yaml.safe_load(file)
             self._add_from_yaml_dict(yaml_dict)
 
-    def _make_dimmer_device(
-        self, device_dict: dict, room_name: str, device_type: DimmerDeviceType
-    ) -> DimmerDevice:
-        return DimmerDevice(
-            zone_number=device_dict["number"],
-            address=DeviceAddress(device_dict["address"]),
-            name=device_dict["name"],
-            device_type=device_type,
-            room=room_name,
+    def _make_device_type(self, record: ZoneRecord) -> DimmerDeviceType:
+        if record.type_id == LightDimmerType.type_id():
+            return LightDimmerType()
+        elif record.type_id == SwitchDimmerType.type_id():
+            return SwitchDimmerType()
+        elif record.type_id == FanDimmerType.type_id():
+            return FanDimmerType(record.fan_speeds)
+        elif record.type_id == ShadeDimmerType.type_id():
+            return ShadeDimmerType()
+        raise ValueError(f"zone type id `{record.type_id}`: not handled!")
+
+    def _make_dimmer_device(self, record: ZoneRecord) -> DimmerDevice:
+        dimmer = DimmerDevice(
+            zone_number=record.number,
+            address=DeviceAddress(record.address),
+            name=record.name,
+            device_type=self._make_device_type(record),
+            room=record.room,
         )
+        dimmer._level = record.level
+        pending = self._pending_levels.get(dimmer.address.encoded)
+        if pending is not None:
+            dimmer._pending_level = pending.level
+        return dimmer
 
-    def _add_from_yaml_dict(self, yaml_dict: dict[str, Any]):
+    def _devices_changed(self):
+        self._update_subscriptions()
+        self._ingest_filter.invalidate()
+
+    def _update_subscriptions(self):
+        """
+        Subscribes to zone and keypad topics only while such devices are configured, so
+        the processor is not asked to report devices nobody tracks.
+        """
+        self._set_subscribed(
+            (MonitoringTopic.DIMMER_LEVEL_CHANGED,),
+            bool(self._dimmers or self._zone_records),
+        )
+        self._set_subscribed(
+            tuple(self._KEYPAD_TOPIC_EVENT_KINDS),
+            bool(self._keypads or self._keypad_records),
+        )
+
+    def _set_subscribed(self, topics: tuple[MonitoringTopic, ...], subscribed: bool):
+        changed = [
+            topic
+            for topic in topics
+            if (topic in self._subscribed_topics) != subscribed
+        ]
+        if not changed:
+            return
+        if subscribed:
+            self._notifier.subscribe(self, *changed)
+            self._subscribed_topics.update(changed)
+        else:
+            self._notifier.unsubscribe(self, *changed)
+            self._subscribed_topics.difference_update(changed)
+
+    def _zone_records_from_config(self, yaml_dict: dict[str, Any]):
         for room_name, room in yaml_dict["devices"].items():
-            if "dimmers" in room:
-                for light in room["dimmers"]:
-                    self.add_dimmer(
-                        self._make_dimmer_device(light, room_name, LightDimmerType())
-                    )
-            if "switches" in room:
-                for switch in room["switches"]:
-                    self.add_dimmer(
-                        self._make_dimmer_device(switch, room_name, SwitchDimmerType())
+            for section, type_id in self._ZONE_SECTIONS.items():
+                for zone in room.get(section) or []:
+                    yield ZoneRecord(
+                        address=zone["address"],
+                        name=zone["name"],
+                        number=zone["number"],
+                        room=room_name,
+                        type_id=type_id,
+                        fan_speeds=zone.get("speeds", 4),
                     )
-            if "fans" in room:
-                for fan in room["fans"]:
-                    fan_speeds = fan.get("speeds", 4)
-                    self.add_dimmer(
-                        self._make_dimmer_device(
-                            fan, room_name, FanDimmerType(fan_speeds)
-                        )
-                    )
-            if "shades" in room:
-                for shade in room["shades"]:
-                    self.add_dimmer(
-                        self._make_dimmer_device(shade, room_name, ShadeDimmerType())
+
+    def _keypad_records_from_config(self, yaml_dict: dict[str, Any]):
+        for room_name, room in yaml_dict["devices"].items():
+            for keypad in room.get("keypads") or []:
+                yield KeypadRecord(
+                    address=keypad["address"],
+                    name=keypad["name"],
+                    room=room_name,
+                    buttons=keypad.get("buttons") or [],
+                )
+
+    def _add_zone(self, record: ZoneRecord):
+        if self._lazy:
+            key = sys.intern(DeviceAddress(record.address).encoded)
+            self._zone_records[key] = record
+        else:
+            self.add_dimmer(self._make_dimmer_device(record))
+
+    def _add_keypad(
+        self,
+        record: KeypadRecord,
+        zones_by_address: dict[str, Optional[DimmerDevice]],
+    ):
+        if self._led_predictor is not None:
+            self._index_button_presets(record)
+        if self._lazy:
+            key = sys.intern(DeviceAddress(record.address).encoded)
+            self._keypad_records[key] = record
+        else:
+            self.add_keypad(self._make_keypad(record, zones_by_address))
+
+    def _add_from_yaml_dict(self, yaml_dict: dict[str, Any]):
+        for record in self._zone_records_from_config(yaml_dict):
+            self._add_zone(record)
+
+        # Keypad buttons can reference zones in any room, so every zone is added first.
+        zones_by_address: dict[str, Optional[DimmerDevice]] = {}
+        for keypad_record in self._keypad_records_from_config(yaml_dict):
+            self._add_keypad(keypad_record, zones_by_address)
+        self._devices_changed()
+
+    def reload(self, yaml_dict: dict[str, Any]) -> ReloadReport:
+        """
+        Applies a new configuration, touching only the devices that differ.
+
+        Devices are matched by address. The objects of devices that are still
+        configured are kept, along with their levels, LED states and listeners; renamed
+        devices are updated in place and keypads whose buttons changed get new buttons.
+        """
+        report = ReloadReport()
+        zone_records = {
+            sys.intern(DeviceAddress(record.address).encoded): record
+            for record in self._zone_records_from_config(yaml_dict)
+        }
+        for key in [*self._dimmers, *self._zone_records]:
+            if key not in zone_records:
+                report.removed.append(self._remove_zone(key))
+        for key, record in zone_records.items():
+            if key not in self._dimmers and key not in self._zone_records:
+                self._add_zone(record)
+                report.added.append(DeviceAddress(record.address))
+            elif self._update_zone(key, record):
+                report.updated.append(DeviceAddress(record.address))
+
+        keypad_records = {
+            sys.intern(DeviceAddress(record.address).encoded): record
+            for record in self._keypad_records_from_config(yaml_dict)
+        }
+        for key in [*self._keypads, *self._keypad_records]:
+            if key not in keypad_records:
+                report.removed.append(self._remove_keypad(key))
+        zones_by_address: dict[str, Optional[DimmerDevice]] = {}
+        for key, record in keypad_records.items():
+            if key not in self._keypads and key not in self._keypad_records:
+                self._add_keypad(record, zones_by_address)
+                report.added.append(DeviceAddress(record.address))
+            elif self._update_keypad(key, record, zones_by_address):
+                report.updated.append(DeviceAddress(record.address))
+        self._devices_changed()
+        return report
+
+    def _remove_zone(self, key: str) -> DeviceAddress:
+        record = self._zone_records.pop(key, None)
+        if record is not None:
+            address = DeviceAddress(record.address)
+        else:
+            dimmer = self._dimmers.pop(key)
+            self._event_source.unregister_listener(dimmer, *self._DIMMER_EVENT_KINDS)
+            address = dimmer.address
+        self._pending_levels.pop(key)
+        if self._led_predictor is not None:
+            self._led_predictor.remove_zone(key)
+        return address
+
+    def _update_zone(self, key: str, record: ZoneRecord) -> bool:
+        old_record = self._zone_records.get(key)
+        if old_record is not None:
+            record.level = old_record.level
+            if record == old_record:
+                return False
+            self._zone_records[key] = record
+            return True
+
+        dimmer = self._dimmers[key]
+        changed = False
+        if (dimmer.name, dimmer.room, dimmer.zone_number) != (
+            record.name,
+            record.room,
+            record.number,
+        ):
+            dimmer._name = record.name
+            dimmer._room = record.room
+            dimmer._zone_number = record.number
+            changed = True
+        device_type = dimmer.device_type
+        if device_type.type_id() != record.type_id or (
+            isinstance(device_type, FanDimmerType)
+            and device_type.fan_speeds != record.fan_speeds
+        ):
+            dimmer._set_device_type(self._make_device_type(record))
+            changed = True
+        return changed
+
+    def _remove_keypad(self, key: str) -> DeviceAddress:
+        record = self._keypad_records.pop(key, None)
+        if record is not None:
+            address = DeviceAddress(record.address)
+        else:
+            keypad = self._keypads.pop(key)
+            self._event_source.unregister_listener(
+                keypad, *self._KEYPAD_TOPIC_EVENT_KINDS.values()
+            )
+            address = keypad.address
+        if self._led_predictor is not None:
+            self._led_predictor.remove_keypad(key)
+        return address
+
+    def _update_keypad(
+        self,
+        key: str,
+        record: KeypadRecord,
+        zones_by_address: dict[str, Optional[DimmerDevice]],
+    ) -> bool:
+        old_record = self._keypad_records.get(key)
+        if old_record is not None:
+            record.led_states = old_record.led_states
+            if record == old_record:
+                return False
+            self._keypad_records[key] = record
+        else:
+            keypad = self._keypads[key]
+            changed = False
+            if (keypad.name, keypad.room) != (record.name, record.room):
+                keypad._name = record.name
+                keypad._room = record.room
+                changed = True
+            if self._keypad_buttons_differ(keypad, record):
+                keypad._set_buttons(self._button_builders(record, zones_by_address))
+                changed = True
+            if not changed:
+                return False
+
+        if self._led_predictor is not None:
+            self._led_predictor.remove_keypad(key)
+            self._index_button_presets(record)
+        return True
+
+    def _configured_button_zones(self, button: dict) -> list[tuple[str, float]]:
+        """The encoded address and preset level of each configured zone of a button."""
+        zones = []
+        for raw_zone in button.get("zones") or []:
+            zone_key = DeviceAddress(raw_zone["address"]).encoded
+            if zone_key in self._zone_records or zone_key in self._dimmers:
+                zones.append((zone_key, raw_zone.get("level", 100.0)))
+        return zones
+
+    def _keypad_buttons_differ(self, keypad: Keypad, record: KeypadRecord) -> bool:
+        built = [
+            (
+                button.name,
+                button.number,
+                [
+                    (zone.address.encoded, level)
+                    for zone, level in zip(
+                        button.device_group.devices, button.preset_levels
                     )
+                ],
+            )
+            for button in keypad.buttons
+        ]
+        configured = [
+            (button["name"], button["number"], self._configured_button_zones(button))
+            for button in record.buttons
+        ]
+        return built != configured
+
+    def _index_button_presets(self, record: KeypadRecord):
+        assert self._led_predictor is not None
+        keypad_key = DeviceAddress(record.address).encoded
+        for button in record.buttons:
+            self._led_predictor.add_button(
+                keypad_key,
+                button["number"] - 1,
+                dict(self._configured_button_zones(button)),
+            )
+
+    def _resolve_button_zone(
+        self, zone_address: str, zones_by_address: dict[str, Optional[DimmerDevice]]
+    ) -> Optional[DimmerDevice]:
+        if zone_address in zones_by_address:
+            return zones_by_address[zone_address]
+
+        zone = self._dimmer_at_key(DeviceAddress(zone_address).encoded)
+        if zone is None:
+            _LOGGER.warning("Keypad button references unknown zone %s", zone_address)
+        zones_by_address[zone_address] = zone
+        return zone
+
+    def _button_builders(
+        self,
+        record: KeypadRecord,
+        zones_by_address: dict[str, Optional[DimmerDevice]],
+    ) -> list[ButtonBuilder]:
+        builders = []
+        for button in record.buttons:
+            button_builder = ButtonBuilder()
+            button_builder.set_name(button["name"])
+            button_builder.set_number(button["number"])
+            for raw_zone in button.get("zones") or []:
+                zone = self._resolve_button_zone(raw_zone["address"], zones_by_address)
+                if zone is not None:
+                    button_builder.append_zone(zone, raw_zone.get("level", 100.0))
+            builders.append(button_builder)
+        return builders
+
+    def _make_keypad(
+        self,
+        record: KeypadRecord,
+        zones_by_address: dict[str, Optional[DimmerDevice]],
+    ) -> Keypad:
+        keypad_builder = KeypadBuilder()
+        keypad_builder.set_name(record.name)
+        keypad_builder.set_room(record.room)
+        keypad_builder.set_address(DeviceAddress(record.address))
+        for button_builder in self._button_builders(record, zones_by_address):
+            keypad_builder.append_button(button_builder)
+        keypad = keypad_builder.build()
+        keypad._led_states = KeypadLedStates.from_packed(record.led_states)
+        return keypad
+
+    def _dimmer_at_key(self, key: str) -> Optional[DimmerDevice]:
+        dimmer = self._dimmers.get(key)
+        if dimmer is None and key in self._zone_records:
+            dimmer = self._make_dimmer_device(self._zone_records.pop(key))
+            self.add_dimmer(dimmer)
+        return dimmer
+
+    def _keypad_at_key(self, key: str) -> Optional[Keypad]:
+        keypad = self._keypads.get(key)
+        if keypad is None and key in self._keypad_records:
+            keypad = self._make_keypad(self._keypad_records.pop(key), {})
+            self.add_keypad(keypad)
+        return keypad
 
     def add_dimmer(self, dimmer: DimmerDevice) -> None:
         self._event_source.register_listener(
             dimmer,
             {DeviceEventKey.DEVICE_ADDRESS: dimmer.address},
-            DeviceEventKind.DIMMER_LEVEL_CHANGED,
+            *self._DIMMER_EVENT_KINDS,
         )
-        self._dimmers[dimmer.address.encoded] = dimmer
+        self._dimmers[sys.intern(dimmer.address.encoded)] = dimmer
+        self._devices_changed()
 
     def add_keypad(self, keypad: Keypad) -> None:
         self._event_source.register_listener(
@@ -100,27 +691,58 @@ class DeviceRepository(TopicSubscriber):
             DeviceEventKind.KEYPAD_BUTTON_HELD,
             DeviceEventKind.KEYPAD_BUTTON_DOUBLE_TAPPED,
         )
-        self._keypads[keypad.address.encoded] = keypad
+        self._keypads[sys.intern(keypad.address.encoded)] = keypad
+        self._devices_changed()
 
     def get_keypad_named(self, keypad_name: str) -> Optional[Keypad]:
         for keypad_address, keypad in self._keypads.items():
             if keypad.name == keypad_name:
                 return keypad
+        for keypad_address, record in self._keypad_records.items():
+            if record.name == keypad_name:
+                return self._keypad_at_key(keypad_address)
         return None
 
     def get_keypad_at_address(self, keypad_address: str) -> Optional[Keypad]:
-        if keypad_address in self._keypads:
-            return self._keypads[keypad_address]
-        else:
-            return None
+        return self._keypad_at_key(keypad_address)
+
+    def all_keypads(self) -> list[Keypad]:
+        for keypad_address in list(self._keypad_records):
+            self._keypad_at_key(keypad_address)
+        return list(self._keypads.values())
+
+    def keypad_addresses(self) -> list[DeviceAddress]:
+        """The addresses of every keypad, without building pending keypads."""
+        return [keypad.address for keypad in self._keypads.values()] + [
+            DeviceAddress(record.address) for record in self._keypad_records.values()
+        ]
 
     def dimmer_device_at_address(
         self, address: DeviceAddress
     ) -> Optional[DimmerDevice]:
-        if address.encoded in self._dimmers:
-            return self._dimmers[address.encoded]
-        else:
-            return None
+        return self._dimmer_at_key(address.encoded)
+
+    def level_at_address(self, address: DeviceAddress) -> Optional[float]:
+        """
+        The cached level of a zone, without building a pending dimmer. A level that
+        was commanded but not reported yet is returned while it is pending.
+        """
+        pending = self._pending_levels.get(address.encoded)
+        if pending is not None:
+            return pending.level
+        record = self._zone_records.get(address.encoded)
+        if record is not None:
+            return record.level
+        dimmer = self._dimmers.get(address.encoded)
+        if dimmer is not None:
+            return dimmer.level
+        return None
+
+    def dimmer_addresses(self) -> list[DeviceAddress]:
+        """The addresses of every zone, without building pending dimmers."""
+        return [dimmer.address for dimmer in self._dimmers.values()] + [
+            DeviceAddress(record.address) for record in self._zone_records.values()
+        ]
 
     def find_dimmer_device_named(
         self, zone_name: str, room_name: Optional[str] = None
@@ -130,9 +752,15 @@ class DeviceRepository(TopicSubscriber):
                 return zone
             elif zone.name == zone_name and zone.room == room_name:
                 return zone
+        for zone_address, record in self._zone_records.items():
+            if record.name == zone_name and room_name in (None, record.room):
+                return self._dimmer_at_key(zone_address)
         return None
 
     def all_dimmer_devices(self, room_name: Optional[str] = None) -> list[DimmerDevice]:
+        for zone_address, record in list(self._zone_records.items()):
+            if room_name is None or record.room == room_name:
+                self._dimmer_at_key(zone_address)
         if room_name is None:
             return list(self._dimmers.values())
         return [dimmer for dimmer in self._dimmers.values() if dimmer.room == room_name]
@@ -141,6 +769,9 @@ class DeviceRepository(TopicSubscriber):
         self, *types: Type[DimmerDeviceType]
     ) -> list[DimmerDevice]:
         types_strs = [devtype.type_id() for devtype in types]
+        for zone_address, record in list(self._zone_records.items()):
+            if record.type_id in types_strs:
+                self._dimmer_at_key(zone_address)
         return [
             dimmer
             for dimmer in self._dimmers.values()
@@ -1,74 +1,140 @@
-import logging
-from typing import Callable, Optional
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
 
 from .monitoring import MonitoringTopic, MonitoringTopicKey, MonitoringTopicNotifier
 
-_LOGGER = logging.getLogger(__name__)
+Field = tuple[MonitoringTopicKey, Callable[[str], Any]]
+LineParser = Callable[[str], dict[MonitoringTopicKey, Any]]
 
 
-class ServerResponseDataHandler:
-    def __init__(self, notifier: MonitoringTopicNotifier) -> None:
-        self._notifier = notifier
-        self._handlers = {}
-        self._register_handlers()
-
-    def _register_handler(self, handler: Callable, command_name: str):
-        self._handlers[command_name] = handler
-
-    def _register_handlers(self):
-        self._register_handler(
-            self._keypad_btn_handler, MonitoringTopic.KEYPAD_BUTTON_PRESS
-        )
-        self._register_handler(
-            self._keypad_btn_handler, MonitoringTopic.KEYPAD_BUTTON_DOUBLE_TAP
-        )
-        self._register_handler(
-            self._keypad_btn_handler, MonitoringTopic.KEYPAD_BUTTON_HOLD
-        )
-        self._register_handler(
-            self._keypad_btn_handler, MonitoringTopic.KEYPAD_BUTTON_RELEASE
-        )
-        self._register_handler(
-            self._keypad_led_states_changed_handler,
-            MonitoringTopic.KEYPAD_LED_STATES_CHANGED,
-        )
-
-        self._register_handler(
-            self._dimmer_level_changed_handler, MonitoringTopic.DIMMER_LEVEL_CHANGED
-        )
+@dataclass(frozen=True, slots=True)
+class LineSpec:
+    """
+    How one kind of LNET line becomes a monitoring topic.
 
-    def handle(self, data: str):
-        args = list(map(lambda e: e.strip(), data.strip().split(",")))
-        cmd_name = args[0]
-        if cmd_name in self._handlers:
-            handler = self._handlers[cmd_name]
-            args.pop(0)
-            if handler is not None:
-                _LOGGER.debug(f"Calling handler {args}")
-                handler_data = handler(*args)
-                topic = MonitoringTopic(cmd_name)
-                self._notifier.notify_subscribers(topic, data=handler_data)
-        else:
-            _LOGGER.debug("Unknown command: " + data)
-
-    def _keypad_btn_handler(self, keypad_addr: str, button_num: str) -> Optional[dict]:
-        return {
-            MonitoringTopicKey.ADDRESS: keypad_addr,
-            MonitoringTopicKey.BUTTON: int(button_num),
-        }
+    A line is its head, the separator, then one value per field, separated the same
+    way. The last field takes the rest of the line, so it may contain the separator.
+    """
 
-    def _keypad_led_states_changed_handler(
-        self, keypad_addr: str, led_states: str
-    ) -> Optional[dict]:
-        return {
-            MonitoringTopicKey.ADDRESS: keypad_addr,
-            MonitoringTopicKey.LED_STATES: led_states,
-        }
+    head: str
+    topic: MonitoringTopic
+    fields: tuple[Field, ...]
+    separator: str = ","
+
+
+_ADDRESS: Field = (MonitoringTopicKey.ADDRESS, str)
+_BUTTON: Field = (MonitoringTopicKey.BUTTON, int)
+_TIME: Field = (MonitoringTopicKey.TIME, str)
+
+LINE_SPECS: tuple[LineSpec, ...] = (
+    LineSpec(
+        "DL",
+        MonitoringTopic.DIMMER_LEVEL_CHANGED,
+        (_ADDRESS, (MonitoringTopicKey.LEVEL, float)),
+    ),
+    LineSpec("KBP", MonitoringTopic.KEYPAD_BUTTON_PRESS, (_ADDRESS, _BUTTON)),
+    LineSpec("KBR", MonitoringTopic.KEYPAD_BUTTON_RELEASE, (_ADDRESS, _BUTTON)),
+    LineSpec("KBH", MonitoringTopic.KEYPAD_BUTTON_HOLD, (_ADDRESS, _BUTTON)),
+    LineSpec("KBDT", MonitoringTopic.KEYPAD_BUTTON_DOUBLE_TAP, (_ADDRESS, _BUTTON)),
+    LineSpec(
+        "KLS",
+        MonitoringTopic.KEYPAD_LED_STATES_CHANGED,
+        (_ADDRESS, (MonitoringTopicKey.LED_STATES, str)),
+    ),
+    LineSpec(
+        "GSS",
+        MonitoringTopic.GRAFIK_EYE_SCENE_SELECTED,
+        (_ADDRESS, (MonitoringTopicKey.SCENE, int)),
+    ),
+    LineSpec("TE", MonitoringTopic.TIMECLOCK_EVENT, ((MonitoringTopicKey.EVENT, int),)),
+    LineSpec("Sunrise", MonitoringTopic.TIMECLOCK_SUNRISE, (_TIME,), separator=":"),
+    LineSpec("Sunset", MonitoringTopic.TIMECLOCK_SUNSET, (_TIME,), separator=":"),
+    LineSpec(
+        "Processor Time", MonitoringTopic.TIMECLOCK_REALTIME, (_TIME,), separator=":"
+    ),
+)
+
+
+def compile_line_spec(spec: LineSpec) -> LineParser:
+    """
+    Builds the parser for the values of a line, after its head and separator.
+
+    Raises ValueError from the parser when the line has too few values or a value does
+    not convert.
+    """
+    keys = tuple(key for key, _ in spec.fields)
+    converters = tuple(convert for _, convert in spec.fields)
+    count = len(spec.fields)
+    separator = spec.separator
 
-    def _dimmer_level_changed_handler(
-        self, dimmer_addr: str, level: str
-    ) -> Optional[dict]:
+    def parse(values: str) -> dict[MonitoringTopicKey, Any]:
+        parts = values.split(separator, count - 1)
+        if len(parts) != count:
+            raise ValueError(f"expected {count} values, got {len(parts)}")
         return {
-            MonitoringTopicKey.ADDRESS: dimmer_addr,
-            MonitoringTopicKey.LEVEL: float(level),
+            key: convert(part.strip())
+            for key, convert, part in zip(keys, converters, parts)
         }
+
+    return parse
+
+
+class ServerResponseDataHandler:
+    """
+    Turns received LNET lines into monitoring topics, as described by `LINE_SPECS`.
+
+    Lines are not parsed when nothing subscribes to their topic. Lines that match no
+    spec, or whose values do not parse, are only counted.
+    """
+
+    def __init__(
+        self,
+        notifier: MonitoringTopicNotifier,
+        specs: tuple[LineSpec, ...] = LINE_SPECS,
+    ) -> None:
+        self._notifier = notifier
+        self._parsers: dict[str, dict[str, tuple[MonitoringTopic, LineParser]]] = {}
+        for spec in specs:
+            self._parsers.setdefault(spec.separator, {})[spec.head] = (
+                spec.topic,
+                compile_line_spec(spec),
+            )
+        self._unknown_lines = 0
+        self._malformed_lines = 0
+
+    @property
+    def unknown_lines(self) -> int:
+        """The number of lines that matched no spec."""
+        return self._unknown_lines
+
+    @property
+    def malformed_lines(self) -> int:
+        """The number of lines that matched a spec but did not parse."""
+        return self._malformed_lines
+
+    def _find_parser(
+        self, line: str
+    ) -> Optional[tuple[MonitoringTopic, LineParser, str]]:
+        for separator, parsers in self._parsers.items():
+            head, found, values = line.partition(separator)
+            if not found:
+                continue
+            entry = parsers.get(head.strip())
+            if entry is not None:
+                return entry[0], entry[1], values
+        return None
+
+    def handle(self, data: str):
+        found = self._find_parser(data.strip())
+        if found is None:
+            self._unknown_lines += 1
+            return
+        topic, parse, values = found
+        if not self._notifier.has_subscribers(topic):
+            return
+        try:
+            handler_data = parse(values)
+        except ValueError:
+            self._malformed_lines += 1
+            return
+        self._notifier.notify_subscribers(topic, data=handler_data)
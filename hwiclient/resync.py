@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from .connection.message import RequestPriority
+from .device import DeviceAddress
+from .monitoring import MonitoringTopic, MonitoringTopicKey, TopicSubscriber
+
+if TYPE_CHECKING:
+    from .hub import Hub
+
+
+@dataclass
+class ResyncReport:
+    zones_requested: int = 0
+    zones_received: int = 0
+    keypads_requested: int = 0
+    keypads_received: int = 0
+    retries: int = 0
+    missing: list[DeviceAddress] = field(default_factory=list)
+    elapsed: timedelta = timedelta()
+
+    @property
+    def requested(self) -> int:
+        return self.zones_requested + self.keypads_requested
+
+    @property
+    def received(self) -> int:
+        return self.zones_received + self.keypads_received
+
+    @property
+    def coverage(self) -> float:
+        """Fraction of requested devices that replied, between 0 and 1."""
+        if self.requested == 0:
+            return 1.0
+        return self.received / self.requested
+
+
+class ResyncEngine(TopicSubscriber):
+    """
+    Requests the state of many devices at bulk priority and tracks the replies.
+
+    At most `max_in_flight` requests are outstanding at once. A request whose reply
+    does not arrive within `reply_timeout` is sent again, up to `max_attempts` times.
+    Any monitoring update for a device counts as its reply.
+    """
+
+    _REPLY_TOPICS = (
+        MonitoringTopic.DIMMER_LEVEL_CHANGED,
+        MonitoringTopic.KEYPAD_LED_STATES_CHANGED,
+    )
+
+    def __init__(
+        self,
+        hub: Hub,
+        max_in_flight: int = 8,
+        reply_timeout: timedelta = timedelta(seconds=2),
+        max_attempts: int = 3,
+    ):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self._hub = hub
+        self._max_in_flight = max_in_flight
+        self._reply_timeout = reply_timeout
+        self._max_attempts = max_attempts
+        self._waiting: dict[tuple[MonitoringTopic, str], asyncio.Future] = {}
+        self._report = ResyncReport()
+
+    async def run(self, zones: bool = True, keypads: bool = True) -> ResyncReport:
+        targets: list[tuple[str, DeviceAddress, MonitoringTopic]] = []
+        if zones:
+            for address in self._hub.devices.dimmer_addresses():
+                targets.append(("RDL", address, MonitoringTopic.DIMMER_LEVEL_CHANGED))
+        if keypads:
+            for address in self._hub.devices.keypad_addresses():
+                targets.append(
+                    ("RKLS", address, MonitoringTopic.KEYPAD_LED_STATES_CHANGED)
+                )
+
+        self._report = ResyncReport()
+        started = time.perf_counter()
+        slots = asyncio.Semaphore(self._max_in_flight)
+        self._hub.subscribe(self, *self._REPLY_TOPICS)
+        try:
+            results = await asyncio.gather(
+                *(self._request(slots, *target) for target in targets)
+            )
+        finally:
+            self._hub.unsubscribe(self, *self._REPLY_TOPICS)
+            self._waiting.clear()
+
+        for (_, address, topic), received in zip(targets, results):
+            is_zone = topic == MonitoringTopic.DIMMER_LEVEL_CHANGED
+            if is_zone:
+                self._report.zones_requested += 1
+            else:
+                self._report.keypads_requested += 1
+            if not received:
+                self._report.missing.append(address)
+            elif is_zone:
+                self._report.zones_received += 1
+            else:
+                self._report.keypads_received += 1
+
+        self._report.elapsed = timedelta(seconds=time.perf_counter() - started)
+        return self._report
+
+    async def _request(
+        self,
+        slots: asyncio.Semaphore,
+        command: str,
+        address: DeviceAddress,
+        topic: MonitoringTopic,
+    ) -> bool:
+        key = (topic, address.unencoded)
+        loop = asyncio.get_running_loop()
+        async with slots:
+            for attempt in range(self._max_attempts):
+                if attempt > 0:
+                    self._report.retries += 1
+                reply = loop.create_future()
+                self._waiting[key] = reply
+                try:
+                    await self._hub.send_raw_command(
+                        command,
+                        address.unencoded_with_brackets,
+                        priority=RequestPriority.BULK,
+                    )
+                    await asyncio.wait_for(reply, self._reply_timeout.total_seconds())
+                    return True
+                except asyncio.TimeoutError:
+                    continue
+                finally:
+                    self._waiting.pop(key, None)
+        return False
+
+    def on_topic_update(self, topic: MonitoringTopic, data: dict):
+        if not self._waiting:
+            return
+        address = DeviceAddress(data[MonitoringTopicKey.ADDRESS])
+        reply = self._waiting.get((topic, address.unencoded))
+        if reply is not None and not reply.done():
+            reply.set_result(True)
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from datetime import timedelta
+from typing import Callable, Optional
+
+from .commands.hub import HubCommand
+from .commands.queue import CommandQueue
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ScheduledCommand:
+    """A handle to a command in a CommandScheduler, used to cancel it."""
+
+    __slots__ = ("_when", "_interval", "_command", "_condition", "_cancelled", "_done")
+
+    def __init__(
+        self,
+        when: float,
+        interval: Optional[float],
+        command: HubCommand,
+        condition: Optional[Callable[[], bool]],
+    ):
+        self._when = when
+        self._interval = interval
+        self._command = command
+        self._condition = condition
+        self._cancelled = False
+        self._done = False
+
+    @property
+    def when(self) -> float:
+        """The loop time the command runs at next."""
+        return self._when
+
+    @property
+    def command(self) -> HubCommand:
+        return self._command
+
+    @property
+    def is_periodic(self) -> bool:
+        return self._interval is not None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    @property
+    def done(self) -> bool:
+        """A one-shot command that has come due and left the scheduler."""
+        return self._done
+
+
+class CommandScheduler:
+    """
+    Runs HubCommands at later times through a CommandQueue.
+
+    Every entry lives in one min-heap ordered by due time, and a single loop timer is
+    armed for the earliest one, so pending entries cost no tasks or timers of their
+    own. Cancelled entries are left in the heap and skipped when they come up; the
+    heap is rebuilt without them once they make up most of it.
+    """
+
+    __slots__ = (
+        "_queue",
+        "_heap",
+        "_counter",
+        "_timer",
+        "_timer_when",
+        "_cancelled",
+        "_tasks",
+    )
+
+    def __init__(self, queue: CommandQueue):
+        self._queue = queue
+        self._heap: list[tuple[float, int, ScheduledCommand]] = []
+        self._counter = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_when: Optional[float] = None
+        self._cancelled = 0
+        self._tasks: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        """The number of entries that have not run or been cancelled."""
+        return len(self._heap) - self._cancelled
+
+    def call_later(
+        self,
+        delay: timedelta,
+        command: HubCommand,
+        condition: Optional[Callable[[], bool]] = None,
+    ) -> ScheduledCommand:
+        """
+        Runs `command` once after `delay`.
+
+        Args:
+            condition: Checked when the command is due; the command is skipped when it
+                returns False.
+        """
+        loop = asyncio.get_running_loop()
+        entry = ScheduledCommand(
+            loop.time() + delay.total_seconds(), None, command, condition
+        )
+        self._push(loop, entry)
+        return entry
+
+    def call_every(
+        self,
+        interval: timedelta,
+        command: HubCommand,
+        first_delay: Optional[timedelta] = None,
+        condition: Optional[Callable[[], bool]] = None,
+    ) -> ScheduledCommand:
+        """
+        Runs `command` every `interval` until it is cancelled, starting after
+        `first_delay`, or after one interval when it is None.
+        """
+        if interval <= timedelta():
+            raise ValueError("interval must be positive")
+        loop = asyncio.get_running_loop()
+        delay = interval if first_delay is None else first_delay
+        entry = ScheduledCommand(
+            loop.time() + delay.total_seconds(),
+            interval.total_seconds(),
+            command,
+            condition,
+        )
+        self._push(loop, entry)
+        return entry
+
+    def cancel(self, entry: ScheduledCommand):
+        """Stops `entry` from running; does nothing once a one-shot entry is done."""
+        if entry._cancelled or entry._done:
+            return
+        entry._cancelled = True
+        self._cancelled += 1
+        if self._cancelled > 64 and self._cancelled * 2 > len(self._heap):
+            self._heap = [item for item in self._heap if not item[2]._cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+    def close(self):
+        """Cancels every entry and the loop timer."""
+        for _, _, entry in self._heap:
+            entry._cancelled = True
+        self._heap.clear()
+        self._cancelled = 0
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = None
+        self._timer_when = None
+
+    def _push(self, loop: asyncio.AbstractEventLoop, entry: ScheduledCommand):
+        heapq.heappush(self._heap, (entry._when, next(self._counter), entry))
+        if self._timer_when is None or entry._when < self._timer_when:
+            self._arm(loop, entry._when)
+
+    def _arm(self, loop: asyncio.AbstractEventLoop, when: float):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = loop.call_at(when, self._run_due)
+        self._timer_when = when
+
+    def _run_due(self):
+        self._timer = None
+        self._timer_when = None
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, _, entry = heapq.heappop(heap)
+            if entry._cancelled:
+                self._cancelled -= 1
+                continue
+            if entry._interval is None:
+                entry._done = True
+            try:
+                if entry._condition is None or entry._condition():
+                    task = loop.create_task(self._queue.enqueue_command(entry._command))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+            except Exception:
+                # A failing entry must not stall the ones after it.
+                _LOGGER.exception("Scheduled command %r failed", entry._command)
+            if entry._interval is not None:
+                # Fixed rate; runs missed while the loop was blocked are skipped.
+                entry._when += entry._interval
+                if entry._when <= now:
+                    entry._when = now + entry._interval
+                heapq.heappush(heap, (entry._when, next(self._counter), entry))
+
+        while heap and heap[0][2]._cancelled:
+            heapq.heappop(heap)
+            self._cancelled -= 1
+        if heap:
+            self._arm(loop, heap[0][0])
@@ -5,6 +5,7 @@ from datetime import timedelta
 from .commands.dimmer import FadeDimmer, StopDimmer
 from .commands.hub import SessionActionCommand
 from .commands.sender import CommandSender
+from .device import DeviceAddress
 from .dimmer import DimmerActions, DimmerDevice, DimmerDeviceType
 
 
@@ -22,6 +23,8 @@ class ShadeDimmerType(DimmerDeviceType):
 
 
 class ShadeActions(DimmerActions):
+    __slots__ = ()
+
     def set_position(self, position: float) -> SessionActionCommand:
         return SetShadePosition(self._target, position)
 
@@ -38,19 +41,29 @@ class ShadeActions(DimmerActions):
 class SetShadePosition(SessionActionCommand):
     """Sets the current position of cover where 0 means closed and 100 is fully open."""
 
+    __slots__ = ("_fadedimmer",)
+
     def __init__(self, shade: DimmerDevice, position: float):
         assert shade.device_type.type_id() == ShadeDimmerType.type_id()
         self._fadedimmer = FadeDimmer(position, timedelta(), timedelta(), shade.address)
 
+    @property
+    def addresses(self) -> tuple[DeviceAddress, ...]:
+        return self._fadedimmer.addresses
+
     async def _perform_command(self, sender: CommandSender):
         await self._fadedimmer._perform_command(sender)
 
 
 class OpenShade(SetShadePosition):
+    __slots__ = ()
+
     def __init__(self, shade: DimmerDevice):
         super().__init__(shade, position=100.0)
 
 
 class CloseShade(SetShadePosition):
+    __slots__ = ()
+
     def __init__(self, shade: DimmerDevice):
         super().__init__(shade, position=0)
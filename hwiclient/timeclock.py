@@ -0,0 +1,82 @@
+from typing import Optional
+
+from .events import (
+    EventListener,
+    EventSource,
+    FilteredListener,
+    TimeclockEventKey,
+    TimeclockEventKind,
+)
+from .monitoring import (
+    MonitoringTopic,
+    MonitoringTopicKey,
+    TopicNotifier,
+    TopicSubscriber,
+)
+
+
+class Timeclock(TopicSubscriber, EventSource):
+    """
+    The processor's timeclock, as last reported.
+
+    Replies to the SUNRISE, SUNSET and RST requests are posted as TimeclockEventKinds,
+    with the time as the processor formatted it under `TimeclockEventKey.RAW_DATA`.
+    """
+
+    __slots__ = ("_times", "_listeners")
+
+    _TOPIC_EVENT_KINDS = {
+        MonitoringTopic.TIMECLOCK_SUNRISE: TimeclockEventKind.TIMECLOCK_SUNRISE,
+        MonitoringTopic.TIMECLOCK_SUNSET: TimeclockEventKind.TIMECLOCK_SUNSET,
+        MonitoringTopic.TIMECLOCK_REALTIME: TimeclockEventKind.TIMECLOCK_REALTIME,
+    }
+
+    def __init__(self, notifier: TopicNotifier):
+        self._times: dict[TimeclockEventKind, str] = {}
+        self._listeners: dict[TimeclockEventKind, list[EventListener]] = {}
+        notifier.subscribe(self, *self._TOPIC_EVENT_KINDS)
+
+    @property
+    def sunrise(self) -> Optional[str]:
+        return self._times.get(TimeclockEventKind.TIMECLOCK_SUNRISE)
+
+    @property
+    def sunset(self) -> Optional[str]:
+        return self._times.get(TimeclockEventKind.TIMECLOCK_SUNSET)
+
+    @property
+    def realtime(self) -> Optional[str]:
+        return self._times.get(TimeclockEventKind.TIMECLOCK_REALTIME)
+
+    def on_topic_update(self, topic: MonitoringTopic, data: dict):
+        kind = self._TOPIC_EVENT_KINDS.get(topic)
+        if kind is None:
+            return
+        time = data[MonitoringTopicKey.TIME]
+        self._times[kind] = time
+        for listener in self._listeners.get(kind, ()):
+            listener.on_event(kind, {TimeclockEventKey.RAW_DATA: time})
+
+    def register_listener(
+        self, listener: EventListener, filter: Optional[dict] = None, *kind: str
+    ):
+        for event_kind in kind:
+            if not isinstance(event_kind, TimeclockEventKind):
+                raise ValueError(f"Invalid event kind: {event_kind}")
+        listener_to_register = (
+            FilteredListener(listener, filter) if filter is not None else listener
+        )
+        for event_kind in kind:
+            self._listeners.setdefault(event_kind, []).append(listener_to_register)
+
+    def unregister_listener(self, listener: EventListener, *kind: str):
+        for event_kind in kind:
+            self._listeners[event_kind] = [
+                registered
+                for registered in self._listeners.get(event_kind, [])
+                if registered is not listener
+                and not (
+                    isinstance(registered, FilteredListener)
+                    and registered.listener is listener
+                )
+            ]
@@ -0,0 +1,89 @@
+import logging
+from enum import StrEnum
+from typing import Any, Callable, Iterable
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TracePoint(StrEnum):
+    """A place on the hot path that can be traced, and what its hooks receive."""
+
+    PACKET_RECEIVED = "packet_received"  # data: bytes
+    LINE_RECEIVED = "line_received"  # line: bytes
+    LINE_DROPPED = "line_dropped"  # line: bytes
+    REQUEST_WRITTEN = "request_written"  # request: RequestMessage
+    TOPIC_NOTIFIED = "topic_notified"  # topic: MonitoringTopic, data: dict
+    EVENT_POSTED = "event_posted"  # kind: str, data: dict
+
+
+TraceHook = Callable[..., None]
+
+
+class _SampledHook:
+    __slots__ = ("hook", "sample_every", "_countdown")
+
+    def __init__(self, hook: TraceHook, sample_every: int):
+        self.hook = hook
+        self.sample_every = sample_every
+        self._countdown = 1
+
+    def __call__(self, point: TracePoint, *args: Any):
+        self._countdown -= 1
+        if self._countdown > 0:
+            return
+        self._countdown = self.sample_every
+        self.hook(point, *args)
+
+
+class Tracer:
+    """
+    Hands the objects passing through the hot path to registered hooks.
+
+    Hooks are called with the trace point and the objects themselves, never with
+    formatted strings. Call sites check `enabled` before calling `emit`, so while no
+    hook is registered tracing costs one attribute check per trace point.
+    """
+
+    __slots__ = ("_hooks", "enabled")
+
+    def __init__(self):
+        self._hooks: dict[TracePoint, tuple[_SampledHook, ...]] = {}
+        self.enabled = False
+
+    def add_hook(
+        self,
+        hook: TraceHook,
+        points: Iterable[TracePoint] = tuple(TracePoint),
+        sample_every: int = 1,
+    ):
+        """
+        Calls `hook(point, *objects)` at each of `points`.
+
+        Args:
+            sample_every: Only call the hook for every n-th occurrence of each point.
+        """
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+        for point in points:
+            sampled = _SampledHook(hook, sample_every)
+            self._hooks[point] = (*self._hooks.get(point, ()), sampled)
+        self.enabled = bool(self._hooks)
+
+    def remove_hook(self, hook: TraceHook):
+        for point, hooks in list(self._hooks.items()):
+            remaining = tuple(sampled for sampled in hooks if sampled.hook is not hook)
+            if remaining:
+                self._hooks[point] = remaining
+            else:
+                del self._hooks[point]
+        self.enabled = bool(self._hooks)
+
+    def emit(self, point: TracePoint, *args: Any):
+        for sampled in self._hooks.get(point, ()):
+            try:
+                sampled(point, *args)
+            except Exception:
+                _LOGGER.exception("Trace hook failed at %s", point)
+
+
+TRACER = Tracer()
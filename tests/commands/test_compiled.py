@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+import pytest
+
+from hwiclient.commands.compiled import CommandCompiler, format_raw_command
+from hwiclient.commands.dimmer import FadeDimmer, RequestDimmerLevel
+from hwiclient.commands.hub import Sequence
+from hwiclient.commands.sender import CommandSender
+from hwiclient.connection.message import RequestPriority
+from hwiclient.device import DeviceAddress
+
+
+@pytest.fixture
+def mock_sender(mocker):
+    return mocker.AsyncMock(spec=CommandSender)
+
+
+def test_format_raw_command():
+    assert format_raw_command("FADEDIM", "50", "[01:01:00:01:01]") == (
+        "FADEDIM,50,[01:01:00:01:01]"
+    )
+    assert format_raw_command("DLMON") == "DLMON"
+
+
+@pytest.mark.asyncio
+async def test_compile_captures_encoded_lines():
+    address = DeviceAddress("1:1:0:1:1")
+    command = Sequence(
+        [
+            FadeDimmer(50, timedelta(seconds=2), timedelta(), address),
+            RequestDimmerLevel(address),
+        ]
+    )
+    compiled = await CommandCompiler("ascii").compile(command)
+    assert compiled.lines == (
+        (b"FADEDIM,50,00:00:02,00:00:00,[1:1:0:1:1]\r\n", RequestPriority.COMMAND),
+        (b"RDL,[1:1:0:1:1]\r\n", RequestPriority.COMMAND),
+    )
+
+
+@pytest.mark.asyncio
+async def test_compiled_command_sends_stored_bytes(mock_sender):
+    address = DeviceAddress("1:1:0:1:1")
+    compiled = await CommandCompiler("ascii").compile(
+        FadeDimmer(100, timedelta(), timedelta(), address)
+    )
+    await compiled.execute(mock_sender)
+    await compiled.execute(mock_sender)
+    assert mock_sender.send_encoded_command.await_count == 2
+    mock_sender.send_encoded_command.assert_awaited_with(
+        b"FADEDIM,100,00:00:00,00:00:00,[1:1:0:1:1]\r\n",
+        priority=RequestPriority.COMMAND,
+    )
+    mock_sender.send_raw_command.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_compiled_commands_can_be_recompiled():
+    compiler = CommandCompiler("ascii")
+    inner = await compiler.compile(RequestDimmerLevel(DeviceAddress("1:1:0:1:1")))
+    outer = await compiler.compile(Sequence([inner, inner]))
+    assert outer.lines == inner.lines * 2
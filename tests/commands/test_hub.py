@@ -0,0 +1,106 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from hwiclient.commands.dimmer import FadeDimmer, RequestDimmerLevel
+from hwiclient.commands.hub import HubCommand, Sequence
+from hwiclient.commands.sender import CommandSender
+from hwiclient.device import DeviceAddress
+
+
+class RecordingSender(CommandSender):
+    def __init__(self):
+        self.events = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def ready_for_command(self) -> bool:
+        return True
+
+    async def send_raw_command(self, name: str, *args: str, priority: int = 0):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.events.append(("start", name, args[-1]))
+        # Later commands for the first zone finish faster, to expose reordering.
+        await asyncio.sleep(0.01 if args[-1] == "[1:1:0:1:1]" and name == "RDL" else 0)
+        self.events.append(("end", name, args[-1]))
+        self.in_flight -= 1
+
+
+class OpaqueCommand(HubCommand):
+    async def _perform_command(self, sender: CommandSender):
+        await sender.send_raw_command("OPAQUE", "-")
+
+
+def _fade(*addresses: DeviceAddress) -> FadeDimmer:
+    return FadeDimmer(50, timedelta(), timedelta(), *addresses)
+
+
+ZONE_1 = DeviceAddress("1:1:0:1:1")
+ZONE_2 = DeviceAddress("1:1:0:1:2")
+
+
+def test_nested_sequences_are_flattened():
+    inner = Sequence([RequestDimmerLevel(ZONE_1), RequestDimmerLevel(ZONE_2)])
+    parallel = Sequence([RequestDimmerLevel(ZONE_1)], parallel=True)
+    outer = Sequence([inner, Sequence([inner]), parallel])
+    assert len(outer.commands) == 5
+    assert outer.commands[4] is parallel
+    assert outer.addresses == (ZONE_1, ZONE_2, ZONE_1, ZONE_2, ZONE_1)
+
+
+def test_addresses_are_unknown_with_opaque_commands():
+    assert Sequence([RequestDimmerLevel(ZONE_1), OpaqueCommand()]).addresses is None
+
+
+@pytest.mark.asyncio
+async def test_parallel_sequence_keeps_order_per_address():
+    sender = RecordingSender()
+    command = Sequence(
+        [RequestDimmerLevel(ZONE_1), RequestDimmerLevel(ZONE_2), _fade(ZONE_1)],
+        parallel=True,
+    )
+    await command.execute(sender)
+
+    assert sender.max_in_flight == 2
+    zone_1_events = [event for event in sender.events if event[2] == "[1:1:0:1:1]"]
+    assert zone_1_events == [
+        ("start", "RDL", "[1:1:0:1:1]"),
+        ("end", "RDL", "[1:1:0:1:1]"),
+        ("start", "FADEDIM", "[1:1:0:1:1]"),
+        ("end", "FADEDIM", "[1:1:0:1:1]"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_parallel_sequence_respects_max_concurrency():
+    sender = RecordingSender()
+    addresses = [DeviceAddress(f"1:1:0:2:{i}") for i in range(1, 6)]
+    command = Sequence(
+        [RequestDimmerLevel(address) for address in addresses],
+        parallel=True,
+        max_concurrency=2,
+    )
+    await command.execute(sender)
+    assert sender.max_in_flight <= 2
+    assert len(sender.events) == 10
+
+
+@pytest.mark.asyncio
+async def test_opaque_command_is_a_barrier():
+    sender = RecordingSender()
+    command = Sequence(
+        [RequestDimmerLevel(ZONE_1), OpaqueCommand(), RequestDimmerLevel(ZONE_2)],
+        parallel=True,
+    )
+    await command.execute(sender)
+    names = [name for kind, name, _ in sender.events if kind == "start"]
+    assert names == ["RDL", "OPAQUE", "RDL"]
+    assert sender.max_in_flight == 1
+
+
+def test_invalid_max_concurrency():
+    with pytest.raises(ValueError, match="max_concurrency"):
+        Sequence([], parallel=True, max_concurrency=0)
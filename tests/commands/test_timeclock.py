@@ -0,0 +1,36 @@
+import pytest
+
+from hwiclient.commands.monitoring import SetMonitoring
+from hwiclient.commands.sender import CommandSender
+from hwiclient.commands.timeclock import (
+    RequestSunrise,
+    RequestSunset,
+    RequestSystemTime,
+)
+from hwiclient.connection.message import RequestPriority
+from hwiclient.monitoring import MonitoringKind
+
+
+@pytest.fixture
+def mock_sender(mocker):
+    return mocker.AsyncMock(spec=CommandSender)
+
+
+@pytest.mark.parametrize(
+    "command,name",
+    [
+        (RequestSunrise(), "SUNRISE"),
+        (RequestSunset(), "SUNSET"),
+        (RequestSystemTime(), "RST"),
+    ],
+)
+async def test_timeclock_requests(mock_sender, command, name):
+    await command._perform_command(mock_sender)
+    mock_sender.send_raw_command.assert_awaited_once_with(name)
+
+
+async def test_set_monitoring(mock_sender):
+    await SetMonitoring(MonitoringKind.TIMECLOCK, False)._perform_command(mock_sender)
+    mock_sender.send_raw_command.assert_awaited_once_with(
+        "TEMOFF", priority=RequestPriority.MONITORING
+    )
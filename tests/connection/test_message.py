@@ -0,0 +1,23 @@
+from hwiclient.connection.message import (
+    RequestMessage,
+    RequestMessageKind,
+    RequestPriority,
+    _RequestMessageQueue,
+)
+
+
+def test_queue_is_fifo_within_a_priority():
+    queue = _RequestMessageQueue()
+    for data, priority in (
+        ("a", RequestPriority.COMMAND),
+        ("b", RequestPriority.BULK),
+        ("c", RequestPriority.COMMAND),
+        ("d", RequestPriority.MONITORING),
+        ("e", RequestPriority.COMMAND),
+    ):
+        queue.put_nowait(
+            RequestMessage(RequestMessageKind.SEND_COMMAND, data, priority)
+        )
+
+    order = [queue.get_nowait().data for _ in range(5)]
+    assert order == ["d", "a", "c", "e", "b"]
@@ -42,3 +42,15 @@ def test_clear():
     buffer.append(b"TEST")
     buffer.clear()
     assert buffer.data == PacketBuffer._EMPTY_BYTES
+
+
+def test_is_complete_prompt_split_from_newline():
+    buffer = PacketBuffer()
+    buffer.append(b"LNET> ")
+    assert buffer.is_complete
+
+
+def test_is_complete_login_after_rejection():
+    buffer = PacketBuffer()
+    buffer.append(b"login incorrect\r\nLOGIN: ")
+    assert buffer.is_complete
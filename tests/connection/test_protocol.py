@@ -0,0 +1,18 @@
+import asyncio
+
+from hwiclient.connection.protocol import LutronClientProtocol
+
+
+async def test_line_after_prompt_is_split_off():
+    lines = []
+    protocol = LutronClientProtocol(
+        lines.append, asyncio.get_running_loop().create_future()
+    )
+    protocol.data_received(b"DL, [01:01:00:01:01], 0\r\n\r\nLNET> KLS, [01:04:01], 0")
+    protocol.data_received(b"1\r\n\r\nLNET> ")
+    assert lines == [
+        b"DL, [01:01:00:01:01], 0",
+        b"LNET>",
+        b"KLS, [01:04:01], 01",
+        b"LNET>",
+    ]
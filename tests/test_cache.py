@@ -0,0 +1,86 @@
+import pytest
+
+from hwiclient.cache import ConfigCache
+
+_YAML = """devices:
+  room1:
+    dimmers:
+      - {number: 1, address: "1:1:0:1:1", name: light1}
+"""
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "homeworks.yaml"
+    path.write_text(_YAML)
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ConfigCache(tmp_path / "cache")
+
+
+def _counting_compiler(calls: list):
+    def compile(source: bytes) -> dict:
+        calls.append(source)
+        return {"devices": {"compiled": len(calls)}}
+
+    return compile
+
+
+def test_load_yaml_round_trips(cache, config_file):
+    cold = cache.load_yaml(config_file)
+    warm = cache.load_yaml(config_file)
+    assert cold == warm
+    assert warm["devices"]["room1"]["dimmers"][0]["name"] == "light1"
+
+
+def test_warm_load_skips_compile(cache, config_file):
+    calls = []
+    cache.load(config_file, _counting_compiler(calls))
+    cache.load(config_file, _counting_compiler(calls))
+    assert len(calls) == 1
+
+
+def test_changed_source_recompiles_and_replaces_entry(cache, config_file, tmp_path):
+    calls = []
+    cache.load(config_file, _counting_compiler(calls))
+    config_file.write_text(_YAML + "# re-exported\n")
+    config = cache.load(config_file, _counting_compiler(calls))
+    assert config == {"devices": {"compiled": 2}}
+    assert len(list((tmp_path / "cache").glob("*.bin"))) == 1
+
+
+def test_corrupt_entry_recompiles(cache, config_file, tmp_path):
+    calls = []
+    cache.load(config_file, _counting_compiler(calls))
+    for entry in (tmp_path / "cache").glob("*.bin"):
+        entry.write_bytes(b"\x00garbage")
+    cache.load(config_file, _counting_compiler(calls))
+    assert len(calls) == 2
+
+
+def test_same_named_sources_keep_their_own_entries(cache, tmp_path):
+    first = tmp_path / "a" / "homeworks.yaml"
+    second = tmp_path / "b" / "homeworks.yaml"
+    for path, text in ((first, _YAML), (second, _YAML + "# other\n")):
+        path.parent.mkdir()
+        path.write_text(text)
+    unrelated = tmp_path / "cache" / "homeworks.yaml.bak.1.bin"
+    unrelated.parent.mkdir()
+    unrelated.write_bytes(b"keep")
+
+    calls = []
+    for path in (first, second, first, second):
+        cache.load(path, _counting_compiler(calls))
+    assert len(calls) == 2
+    assert unrelated.read_bytes() == b"keep"
+
+
+def test_unwritable_cache_dir_still_loads(tmp_path, config_file):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    cache = ConfigCache(blocker / "cache")
+    config = cache.load_yaml(config_file)
+    assert config["devices"]["room1"]["dimmers"][0]["name"] == "light1"
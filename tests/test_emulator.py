@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from hwiclient.device import DeviceAddress
+from hwiclient.emulator import LnetEmulator
+from hwiclient.homeworks import HomeworksHub
+
+
+@pytest.fixture
+def homeworks_config():
+    return {
+        "devices": {
+            "room1": {
+                "dimmers": [
+                    {"number": 1, "address": "1:1:0:1:1", "name": "light1"},
+                    {"number": 2, "address": "1:1:0:1:2", "name": "light2"},
+                ],
+                "keypads": [{"address": "1:4:1", "name": "keypad1", "buttons": []}],
+            }
+        }
+    }
+
+
+async def _wait_for(predicate, timeout: float = 2.0):
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+@pytest.mark.parametrize("fragment_size", [None, 3])
+async def test_hub_drives_emulated_processor(homeworks_config, fragment_size):
+    hub = HomeworksHub(homeworks_config)
+    light1 = hub.devices.find_dimmer_device_named("light1")
+    async with LnetEmulator(
+        ["1:1:0:1:1", "1:1:0:1:2"], ["1:4:1"], fragment_size=fragment_size
+    ) as emulator:
+        connection = await emulator.connect(hub)
+        await hub.apply_state({DeviceAddress("1:1:0:1:1"): 60})
+        await _wait_for(lambda: emulator.levels[(1, 1, 0, 1, 1)] == 60)
+        assert light1.level == 60
+
+        emulator.levels[(1, 1, 0, 1, 2)] = 25
+        report = await hub.resync(keypads=False)
+        assert report.coverage == 1.0
+        assert hub.devices.find_dimmer_device_named("light2").level == 25
+        connection.close()
+
+
+async def test_wrong_password_is_rejected(homeworks_config):
+    async with LnetEmulator() as emulator:
+        reader, writer = await asyncio.open_connection(
+            emulator.address.host, emulator.address.port
+        )
+        assert await reader.readexactly(7) == b"LOGIN: "
+        writer.write(b"user,wrong\r\n")
+        assert await reader.readexactly(24) == b"login incorrect\r\nLOGIN: "
+        writer.write(b"user,pass\r\nRDL, [9:9:9:9:9]\r\nBOGUS\r\n")
+        await writer.drain()
+        expected = (
+            b"login successful\r\n\r\nLNET> \r\nLNET> Invalid command\r\n\r\nLNET> "
+        )
+        assert await reader.readexactly(len(expected)) == expected
+        writer.close()
+
+
+async def test_keypad_press_toggles_led(homeworks_config):
+    async with LnetEmulator(keypads=["1:4:1"]) as emulator:
+        reader, writer = await asyncio.open_connection(
+            emulator.address.host, emulator.address.port
+        )
+        writer.write(b"user,pass\r\nKLMON\r\nKBP, [1:4:1], 2\r\n")
+        await writer.drain()
+        line = await asyncio.wait_for(reader.readuntil(b"KLS, "), 2)
+        assert line.endswith(b"KLS, ")
+        assert (await reader.readline()).strip() == b"[01:04:01], " + b"01" + b"0" * 22
+        writer.close()
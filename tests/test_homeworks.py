@@ -6,9 +6,19 @@ import pytest
 from hwiclient.commands.hub import HubCommand
 from hwiclient.commands.sender import CommandSender
 from hwiclient.connection.login import LutronServerAddress
-from hwiclient.connection.message import ResponseMessage, ResponseMessageKind
+from hwiclient.connection.message import (
+    RequestMessageKind,
+    ResponseMessage,
+    ResponseMessageKind,
+)
+from hwiclient.connection.state import ConnectionState
 from hwiclient.homeworks import HomeworksHub
-from hwiclient.monitoring import MonitoringTopic, MonitoringTopicKey, TopicSubscriber
+from hwiclient.monitoring import (
+    MonitoringKind,
+    MonitoringTopic,
+    MonitoringTopicKey,
+    TopicSubscriber,
+)
 
 
 @pytest.fixture
@@ -76,6 +86,34 @@ async def test_send_raw_command(homeworks_hub):
     homeworks_hub._coordinator.enqueue.assert_awaited_once()
 
 
+@pytest.mark.asyncio
+async def test_run_scene_sends_compiled_lines(homeworks_hub):
+    homeworks_hub._coordinator.enqueue = AsyncMock()
+    light = homeworks_hub.devices.find_dimmer_device_named("light1")
+    assert light.action is light.action
+    await homeworks_hub.define_scene("evening", light.action.set_level(30))
+    task = await homeworks_hub.run_scene("evening")
+    await task
+
+    request = homeworks_hub._coordinator.enqueue.await_args.args[0]
+    assert request.kind == RequestMessageKind.SEND_ENCODED
+    assert request.data == b"FADEDIM,30,00:00:00,00:00:00,[1:1:1]\r\n"
+    with pytest.raises(ValueError, match="not defined"):
+        await homeworks_hub.run_scene("morning")
+
+
+@pytest.mark.asyncio
+async def test_run_scene_marks_zones_pending(homeworks_hub):
+    homeworks_hub._coordinator.enqueue = AsyncMock()
+    light = homeworks_hub.devices.find_dimmer_device_named("light1")
+    await homeworks_hub.define_scene("evening", light.action.set_level(30))
+    assert light.pending_level is None
+
+    await (await homeworks_hub.run_scene("evening"))
+    assert light.pending_level == 30
+    assert light.level == 30
+
+
 class TestSubscriber(TopicSubscriber):
     def __init__(self):
         self.notified = False
@@ -131,3 +169,27 @@ def test_notify_subscribers(homeworks_hub):
     homeworks_hub.notify_subscribers(topic, data)
     assert subscriber.notified
     assert subscriber.data == data
+
+
+async def test_monitoring_follows_subscriptions(homeworks_hub):
+    coordinator = homeworks_hub._coordinator
+    assert coordinator.monitoring == {MonitoringKind.DIMMER_LEVEL}
+
+    coordinator._connection = MagicMock()
+    coordinator._connection._state = ConnectionState.CONNECTED_READY_FOR_COMMAND
+    subscriber = TestSubscriber()
+    homeworks_hub.subscribe(subscriber, MonitoringTopic.KEYPAD_BUTTON_PRESS)
+    homeworks_hub.unsubscribe(subscriber, MonitoringTopic.KEYPAD_BUTTON_PRESS)
+    written = [
+        call.args[0].data for call in coordinator._connection.write_request.mock_calls
+    ]
+    assert written == ["KBMON", "KBMOFF"]
+
+
+async def test_monitoring_is_reapplied_on_connect(homeworks_config):
+    hub = HomeworksHub(homeworks_config, monitoring=[MonitoringKind.KEYPAD_BUTTON])
+    hub.subscribe(TestSubscriber(), MonitoringTopic.KEYPAD_BUTTON_HOLD)
+    hub._coordinator.enqueue = AsyncMock()
+    await hub._coordinator._put_priory_requests_in_queue()
+    sent = [call.args[0].data for call in hub._coordinator.enqueue.await_args_list]
+    assert sent == ["DLMOFF", "KBMON", "KLMOFF", "GSMOFF", "TEMOFF"]
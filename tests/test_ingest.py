@@ -0,0 +1,67 @@
+import pytest
+
+from hwiclient.homeworks import HomeworksHub
+from hwiclient.monitoring import MonitoringTopic
+
+
+@pytest.fixture
+def homeworks_config():
+    return {
+        "devices": {
+            "room1": {
+                "dimmers": [{"number": 1, "address": "1:1:0:1:1", "name": "light1"}],
+                "keypads": [{"address": "1:4:1", "name": "kp1", "buttons": []}],
+            }
+        }
+    }
+
+
+@pytest.fixture
+def ingest_filter(homeworks_config):
+    return HomeworksHub(homeworks_config).devices.ingest_filter
+
+
+def test_accepts_known_addresses_and_other_lines(ingest_filter):
+    assert ingest_filter.accepts(b"DL, [01:01:00:01:01], 60")
+    assert ingest_filter.accepts(b"KBP, [01:04:01], 3")
+    assert ingest_filter.accepts(b"GSS, [01:06:01], 2")
+    assert ingest_filter.accepts(b"Processor Time: 12:00")
+    assert ingest_filter.dropped == 0
+
+
+def test_drops_unknown_addresses(ingest_filter):
+    assert not ingest_filter.accepts(b"DL, [02:01:00:01:01], 60")
+    assert not ingest_filter.accepts(b"DL, [02:01:00:01:01], 20")
+    assert not ingest_filter.accepts(b"KLS, [01:04:09], 000000000000000000000000")
+    assert ingest_filter.dropped == 3
+
+
+def test_malformed_address_is_left_to_the_handler(ingest_filter):
+    assert ingest_filter.accepts(b"DL, [garbage], 60")
+
+
+def test_reload_updates_known_addresses(homeworks_config):
+    hub = HomeworksHub(homeworks_config)
+    line = b"DL, [01:01:00:01:02], 60"
+    assert not hub.devices.ingest_filter.accepts(line)
+
+    homeworks_config["devices"]["room1"]["dimmers"].append(
+        {"number": 2, "address": "1:1:0:1:2", "name": "light2"}
+    )
+    hub.reload_config(homeworks_config)
+    assert hub.devices.ingest_filter.accepts(line)
+
+
+def test_hub_drops_lines_before_decoding(homeworks_config, mocker):
+    hub = HomeworksHub(homeworks_config, drop_unknown_lines=True)
+    hub._coordinator._data_to_response_adapter.adapt = mocker.Mock()
+    hub._coordinator._on_data_received(b"DL, [02:01:00:01:01], 60")
+    hub._coordinator._data_to_response_adapter.adapt.assert_not_called()
+
+
+def test_hub_passes_unknown_lines_to_subscribers_by_default(homeworks_config, mocker):
+    hub = HomeworksHub(homeworks_config)
+    subscriber = mocker.Mock()
+    hub.subscribe(subscriber, MonitoringTopic.DIMMER_LEVEL_CHANGED)
+    hub._coordinator._on_data_received(b"DL, [02:01:00:01:01], 60")
+    subscriber.on_topic_update.assert_called_once()
@@ -0,0 +1,63 @@
+import pytest
+
+from hwiclient.device import DeviceAddress
+from hwiclient.events import DeviceEventKind
+from hwiclient.homeworks import HomeworksHub
+from hwiclient.journal import ChangeJournal
+
+
+@pytest.fixture
+def journal():
+    return ChangeJournal(capacity=3)
+
+
+def _record_levels(journal: ChangeJournal, *levels: float):
+    for level in levels:
+        journal.record(
+            DeviceEventKind.DIMMER_LEVEL_CHANGED, DeviceAddress("1:1:0:1:1"), level
+        )
+
+
+def test_changes_since_returns_delta(journal):
+    _record_levels(journal, 10, 20, 30)
+    change_set = journal.changes_since(1)
+    assert change_set.seq == 3
+    assert not change_set.resync_needed
+    assert [change.value for change in change_set.changes] == [20, 30]
+
+
+def test_changes_since_latest_is_empty(journal):
+    _record_levels(journal, 10)
+    change_set = journal.changes_since(journal.last_seq)
+    assert change_set.changes == []
+    assert not change_set.resync_needed
+
+
+def test_changes_since_evicted_seq_needs_resync(journal):
+    _record_levels(journal, 10, 20, 30, 40, 50)
+    assert journal.changes_since(2).changes[0].seq == 3
+    assert journal.changes_since(1).resync_needed
+    assert journal.changes_since(99).resync_needed
+
+
+def test_hub_records_applied_dimmer_levels():
+    hub = HomeworksHub(
+        {
+            "devices": {
+                "room1": {
+                    "dimmers": [{"number": 1, "address": "1:1:0:1:1", "name": "a"}]
+                }
+            }
+        }
+    )
+    hub._response_data_handler.handle("DL, [01:01:00:01:01], 50")
+    hub._response_data_handler.handle("DL, [01:01:00:01:01], 50")
+    hub._response_data_handler.handle("DL, [01:01:00:09:09], 50")
+
+    change_set = hub.changes_since(0)
+    assert len(change_set.changes) == 1
+    change = change_set.changes[0]
+    assert change.kind == DeviceEventKind.DIMMER_LEVEL_CHANGED
+    assert change.address == DeviceAddress("1:1:0:1:1")
+    assert change.value == 50
+    assert hub.changes_since(change_set.seq).changes == []
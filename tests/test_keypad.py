@@ -0,0 +1,44 @@
+import pytest
+
+from hwiclient.keypad import KeypadLedState, KeypadLedStates
+
+
+def test_led_states_are_packed_two_bits_per_led():
+    states = KeypadLedStates("130000000000000000000002")
+    assert states.packed == (1 | 3 << 2 | 2 << 46)
+    assert states[0] == KeypadLedState.ON
+    assert states[1] == KeypadLedState.FLASH_2
+    assert states[-1] == KeypadLedState.FLASH_1
+    assert len(states) == 24
+    assert list(states)[2:] == [KeypadLedState.OFF] * 21 + [KeypadLedState.FLASH_1]
+
+
+def test_led_states_from_packed_round_trips():
+    states = KeypadLedStates("010203010203010203010203")
+    assert KeypadLedStates.from_packed(states.packed) == states
+
+
+def test_led_states_rejects_invalid_strings():
+    with pytest.raises(ValueError, match="24 characters"):
+        KeypadLedStates("0101")
+    with pytest.raises(ValueError, match="invalid keypad led state char"):
+        KeypadLedStates("4" * 24)
+
+
+def test_led_states_index_out_of_range():
+    with pytest.raises(IndexError):
+        KeypadLedStates()[24]
+
+
+def test_changed_indexes_lists_only_differing_leds():
+    old = KeypadLedStates("100000000000000000000001")
+    new = KeypadLedStates("120000000000000000000000")
+    assert new.changed_indexes(old) == [1, 23]
+    assert new.changed_indexes(new) == []
+
+
+def test_with_state_replaces_one_led():
+    states = KeypadLedStates("130000000000000000000002")
+    updated = states.with_state(1, KeypadLedState.OFF)
+    assert updated == KeypadLedStates("100000000000000000000002")
+    assert states[1] == KeypadLedState.FLASH_2
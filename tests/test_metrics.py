@@ -0,0 +1,112 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from hwiclient.connection.message import (
+    RequestMessage,
+    RequestMessageKind,
+    RequestPriority,
+)
+from hwiclient.connection.state import ConnectionState
+from hwiclient.homeworks import HomeworksHub
+from hwiclient.metrics import MetricsRegistry, serve_metrics
+
+
+@pytest.fixture
+def registry():
+    times = iter([10.0, 12.0])
+    return MetricsRegistry(clock=lambda: next(times))
+
+
+def test_counter_snapshot_includes_rates(registry):
+    lines = registry.counter("lines_total", "Lines.", "command")
+    lines.inc(1.0, "DL")
+    assert registry.snapshot() == {
+        "lines_total": {"DL": 1.0},
+        "lines_total_per_second": {},
+    }
+    lines.inc(4.0, "DL")
+    assert registry.snapshot()["lines_total_per_second"] == {"DL": 2.0}
+
+
+def test_prometheus_text(registry):
+    registry.counter("bytes_total", "Bytes.").inc(42)
+    latency = registry.histogram("latency_seconds", "Latency.", "lane", (0.1, 1.0))
+    latency.observe(0.05, "command")
+    latency.observe(5.0, "command")
+    registry.gauge("depth", "Depth.", lambda: {"bulk": 3}, "lane")
+
+    text = registry.prometheus_text()
+    assert "# TYPE bytes_total counter\nbytes_total 42.0\n" in text
+    assert 'latency_seconds_bucket{lane="command",le="0.1"} 1\n' in text
+    assert 'latency_seconds_bucket{lane="command",le="1.0"} 1\n' in text
+    assert 'latency_seconds_bucket{lane="command",le="+Inf"} 2\n' in text
+    assert 'latency_seconds_count{lane="command"} 2\n' in text
+    assert '# TYPE depth gauge\ndepth{lane="bulk"} 3.0\n' in text
+
+
+def test_duplicate_metric_is_rejected(registry):
+    registry.counter("lines_total", "Lines.")
+    with pytest.raises(ValueError):
+        registry.counter("lines_total", "Lines.")
+
+
+def test_hub_metrics_follow_the_connection():
+    hub = HomeworksHub(
+        {
+            "devices": {
+                "room1": {
+                    "dimmers": [{"number": 1, "address": "1:1:0:1:1", "name": "a"}]
+                }
+            }
+        },
+        drop_unknown_lines=True,
+        metrics=True,
+    )
+    coordinator = hub._coordinator
+    coordinator._connection = MagicMock()
+    coordinator._connection._state = ConnectionState.CONNECTED_LOGGED_IN
+    coordinator._enqueue_nowait(
+        RequestMessage(RequestMessageKind.SEND_DATA, "RDL, [1:1:0:1:1]")
+    )
+    coordinator._enqueue_nowait(
+        RequestMessage(
+            RequestMessageKind.SEND_DATA, "DLMON", RequestPriority.MONITORING
+        )
+    )
+    assert coordinator.queue_depths() == {"monitoring": 1, "command": 1, "bulk": 0}
+
+    coordinator._on_data_received(b"LNET>")
+    coordinator._on_data_received(b"DL, [01:01:00:01:01], 60")
+    coordinator._on_data_received(b"DL, [02:01:00:01:01], 60")
+    coordinator._on_data_received(b"LNET>")
+
+    snapshot = hub.metrics.snapshot()
+    assert snapshot["hwi_lines_sent_total"] == {"DLMON": 1.0, "RDL": 1.0}
+    assert snapshot["hwi_lines_received_total"]["DL"] == 2.0
+    assert snapshot["hwi_dropped_lines_total"] == {"": 1.0}
+    assert snapshot["hwi_enqueue_to_write_seconds"].keys() == {"monitoring", "command"}
+    assert snapshot["hwi_write_to_prompt_seconds"][""]["count"] == 1
+    assert snapshot["hwi_dispatch_seconds"]["DL"]["count"] == 1
+    assert snapshot["hwi_queue_depth"] == {"monitoring": 0, "command": 0, "bulk": 0}
+
+
+def test_hub_without_metrics():
+    assert HomeworksHub({"devices": {}}).metrics is None
+
+
+async def test_serve_metrics(registry):
+    registry.counter("bytes_total", "Bytes.").inc(7)
+    server = await serve_metrics(registry, port=0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        response = await reader.read()
+        writer.close()
+    finally:
+        server.close()
+        await server.wait_closed()
+    assert response.startswith(b"HTTP/1.0 200 OK\r\n")
+    assert response.endswith(b"bytes_total 7.0\n")
@@ -1,6 +1,7 @@
 import pytest
 
 from hwiclient.monitoring import (
+    MonitoringKind,
     MonitoringTopic,
     MonitoringTopicKey,
     MonitoringTopicNotifier,
@@ -69,3 +70,29 @@ def test_subscribe_to_multiple_topics(notifier, subscriber):
         (MonitoringTopic.DIMMER_LEVEL_CHANGED, data1),
         (MonitoringTopic.KEYPAD_BUTTON_PRESS, data2),
     ]
+
+
+def test_first_and_last_subscriber_toggle_monitoring():
+    changes = []
+    notifier = MonitoringTopicNotifier(
+        lambda kind, wanted: changes.append((kind, wanted))
+    )
+    subscriber1 = TestSubscriber()
+    subscriber2 = TestSubscriber()
+    notifier.subscribe(subscriber1, MonitoringTopic.KEYPAD_BUTTON_PRESS)
+    notifier.subscribe(subscriber2, MonitoringTopic.KEYPAD_BUTTON_RELEASE)
+    assert notifier.monitored_kinds == {MonitoringKind.KEYPAD_BUTTON}
+
+    notifier.unsubscribe(subscriber1, MonitoringTopic.KEYPAD_BUTTON_PRESS)
+    assert changes == [(MonitoringKind.KEYPAD_BUTTON, True)]
+    notifier.unsubscribe(subscriber2, MonitoringTopic.KEYPAD_BUTTON_RELEASE)
+    assert changes == [
+        (MonitoringKind.KEYPAD_BUTTON, True),
+        (MonitoringKind.KEYPAD_BUTTON, False),
+    ]
+    assert notifier.monitored_kinds == frozenset()
+
+
+def test_monitoring_commands():
+    assert MonitoringKind.DIMMER_LEVEL.enable_command == "DLMON"
+    assert MonitoringKind.TIMECLOCK.disable_command == "TEMOFF"
@@ -0,0 +1,115 @@
+import pytest
+
+from hwiclient.parser import HwiXmlParser
+
+_EXPORT = """<Project>
+  <Area>
+    <Name>House</Name>
+    <Room>
+      <Name>Kitchen</Name>
+      <Outputs>
+        <Output>
+          <Name>Island</Name>
+          <Type>DIMMER</Type>
+          <Address>[01:01:00:01:01]</Address>
+          <ZoneNum>1</ZoneNum>
+        </Output>
+        <Output>
+          <Name>Disposal</Name>
+          <Type>SWITCH</Type>
+          <Address>[01:01:00:01:02]</Address>
+          <ZoneNum>2</ZoneNum>
+        </Output>
+      </Outputs>
+      <Inputs>
+        <ControlStation>
+          <Name>Kitchen Entry</Name>
+          <Devices>
+            <Device>
+              <Type>KEYPAD</Type>
+              <Address>[01:06:03]</Address>
+              <Buttons>
+                <Button>
+                  <Name>Cook</Name>
+                  <Number>1</Number>
+                  <Type>Single Action</Type>
+                  <Actions>
+                    <Presets>
+                      <Preset>
+                        <Output><ZoneNum>1</ZoneNum></Output>
+                        <Output><ZoneNum>3</ZoneNum><Level>75</Level></Output>
+                      </Preset>
+                    </Presets>
+                  </Actions>
+                </Button>
+                <Button>
+                  <Name>Unused</Name>
+                  <Number>2</Number>
+                  <Type>Not Programmed</Type>
+                </Button>
+              </Buttons>
+            </Device>
+          </Devices>
+        </ControlStation>
+      </Inputs>
+    </Room>
+    <Room>
+      <Name>Porch</Name>
+      <Outputs>
+        <Output>
+          <Name>Fan</Name>
+          <Type>FAN</Type>
+          <Address>[01:01:00:02:01]</Address>
+          <ZoneNum>3</ZoneNum>
+        </Output>
+      </Outputs>
+    </Room>
+  </Area>
+</Project>
+"""
+
+
+@pytest.fixture
+def export_file(tmp_path):
+    path = tmp_path / "export.xml"
+    path.write_text(_EXPORT)
+    return path
+
+
+def test_parse_file_outputs(export_file):
+    devices = HwiXmlParser({}).parse_file(export_file)["devices"]
+    assert devices["Kitchen"]["dimmers"] == [
+        {"name": "Island", "address": "[01:01:00:01:01]", "number": "1"}
+    ]
+    assert devices["Kitchen"]["switches"][0]["name"] == "Disposal"
+    assert devices["Porch"]["fans"][0]["address"] == "[01:01:00:02:01]"
+
+
+def test_parse_file_resolves_keypad_zones_across_rooms(export_file):
+    devices = HwiXmlParser({}).parse_file(export_file)["devices"]
+    keypad = devices["Kitchen"]["keypads"][0]
+    assert keypad["address"] == "[01:06:03]"
+    assert keypad["buttons"] == [
+        {
+            "name": "Cook",
+            "number": 1,
+            "zones": [
+                {"number": "1", "address": "[01:01:00:01:01]"},
+                {"number": "3", "address": "[01:01:00:02:01]", "level": 75.0},
+            ],
+        }
+    ]
+
+
+def test_parse_file_remaps_names(export_file):
+    remap = {"room_names": {"Porch": "Back Porch"}, "button_names": {"Cook": "Chef"}}
+    devices = HwiXmlParser(remap).parse_file(export_file)["devices"]
+    assert "Back Porch" in devices
+    assert devices["Kitchen"]["keypads"][0]["buttons"][0]["name"] == "Chef"
+
+
+def test_streaming_parse_matches_tree_parse(export_file):
+    parser = HwiXmlParser({})
+    assert parser.parse_file(export_file, streaming=True) == parser.parse_file(
+        export_file
+    )
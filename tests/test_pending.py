@@ -0,0 +1,120 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from hwiclient.device import DeviceAddress
+from hwiclient.events import DeviceEventKey, DeviceEventKind, EventListener
+from hwiclient.homeworks import HomeworksHub
+
+
+@pytest.fixture
+def homeworks_hub(mocker):
+    hub = HomeworksHub(
+        {
+            "devices": {
+                "room1": {
+                    "dimmers": [
+                        {"number": 1, "address": "1:1:0:1:1", "name": "light1"},
+                        {"number": 2, "address": "1:1:0:1:2", "name": "light2"},
+                    ]
+                }
+            }
+        },
+        pending_timeout=timedelta(milliseconds=20),
+    )
+    hub.send_raw_command = mocker.AsyncMock()
+    return hub
+
+
+@pytest.fixture
+def light1(homeworks_hub):
+    return homeworks_hub.devices.find_dimmer_device_named("light1")
+
+
+def _listen(mocker, dimmer, *kinds: DeviceEventKind):
+    listener = mocker.Mock(spec=EventListener)
+    dimmer.event_source.register_listener(listener, None, *kinds)
+    return listener
+
+
+@pytest.mark.asyncio
+async def test_commanded_level_is_pending_until_confirmed(
+    homeworks_hub, light1, mocker
+):
+    listener = _listen(mocker, light1, DeviceEventKind.DIMMER_LEVEL_CONFIRMED)
+    await light1.action.set_level(60).execute(homeworks_hub)
+    assert light1.level == 60
+    assert light1.pending_level == 60
+    assert light1.confirmed_level == 0
+
+    homeworks_hub._response_data_handler.handle("DL, [01:01:00:01:01], 60")
+    assert light1.pending_level is None
+    assert light1.level == 60
+    listener.on_event.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_report_corrects_pending_level(homeworks_hub, light1, mocker):
+    listener = _listen(mocker, light1, DeviceEventKind.DIMMER_LEVEL_CONFIRMED)
+    await light1.action.set_level(60).execute(homeworks_hub)
+    homeworks_hub._response_data_handler.handle("DL, [01:01:00:01:01], 20")
+    assert light1.level == 20
+    assert light1.pending_level is None
+    listener.on_event.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_unconfirmed_level_reverts_on_timeout(homeworks_hub, light1, mocker):
+    listener = _listen(mocker, light1, DeviceEventKind.DIMMER_LEVEL_REVERTED)
+    homeworks_hub._response_data_handler.handle("DL, [01:01:00:01:01], 10")
+    await light1.action.set_level(60).execute(homeworks_hub)
+    await asyncio.sleep(0.05)
+
+    assert light1.level == 10
+    assert light1.pending_level is None
+    data = listener.on_event.call_args.args[1]
+    assert data[DeviceEventKey.DIMMER_LEVEL] == 10
+    assert data[DeviceEventKey.PENDING_LEVEL] == 60
+
+
+@pytest.mark.asyncio
+async def test_pending_level_survives_lazy_materialization(mocker):
+    hub = HomeworksHub(
+        {
+            "devices": {
+                "room1": {
+                    "dimmers": [{"number": 1, "address": "1:1:0:1:1", "name": "a"}]
+                }
+            }
+        },
+        lazy_devices=True,
+    )
+    hub.send_raw_command = mocker.AsyncMock()
+    await hub.apply_state({hub.devices.dimmer_addresses()[0]: 80})
+    assert hub.devices._dimmers == {}
+    assert hub.devices.find_dimmer_device_named("a").level == 80
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("lazy", [False, True])
+async def test_confirmed_command_is_journaled(mocker, lazy):
+    hub = HomeworksHub(
+        {
+            "devices": {
+                "room1": {
+                    "dimmers": [{"number": 1, "address": "1:1:0:1:1", "name": "a"}]
+                }
+            }
+        },
+        lazy_devices=lazy,
+    )
+    hub.send_raw_command = mocker.AsyncMock()
+    seq = hub.changes_since(0).seq
+    await hub.apply_state({DeviceAddress("1:1:0:1:1"): 60})
+    hub._response_data_handler.handle("DL, [01:01:00:01:01], 60")
+
+    changes = hub.changes_since(seq).changes
+    assert [(change.kind, change.value) for change in changes] == [
+        (DeviceEventKind.DIMMER_LEVEL_CHANGED, 60)
+    ]
@@ -0,0 +1,140 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from hwiclient.device import DeviceAddress
+from hwiclient.homeworks import HomeworksHub
+from hwiclient.planning import Timeline, plan_state
+
+
+def _addresses(count: int) -> list[DeviceAddress]:
+    return [DeviceAddress(f"1:1:0:1:{i}") for i in range(1, count + 1)]
+
+
+def test_plan_state_batches_zones_per_level():
+    targets = {address: 50 for address in _addresses(12)}
+    targets[DeviceAddress("1:1:0:2:1")] = 0
+    plan = plan_state(targets, lambda address: None)
+    assert plan.naive_count == 13
+    assert plan.sent_count == 3
+    assert [len(command._dimmer_adresses) for command in plan.commands] == [10, 2, 1]
+    assert plan.commands[2]._intensity == 0
+
+
+def test_plan_state_skips_zones_at_target():
+    addresses = _addresses(3)
+    levels = {addresses[0]: 50.4, addresses[1]: 20}
+    plan = plan_state(
+        {address: 50 for address in addresses},
+        levels.get,
+        fade_time=timedelta(seconds=3),
+    )
+    assert plan.skipped == [addresses[0]]
+    assert plan.sent_count == 1
+    assert plan.saved_count == 2
+    assert plan.commands[0]._dimmer_adresses == (addresses[1], addresses[2])
+    assert plan.commands[0]._fade_time == timedelta(seconds=3)
+
+
+@pytest.mark.asyncio
+async def test_apply_state_sends_only_the_plan():
+    hub = HomeworksHub(
+        {
+            "devices": {
+                "room1": {
+                    "dimmers": [
+                        {"number": 1, "address": "1:1:0:1:1", "name": "a"},
+                        {"number": 2, "address": "1:1:0:1:2", "name": "b"},
+                    ]
+                }
+            }
+        },
+        lazy_devices=True,
+    )
+    hub._response_data_handler.handle("DL, [01:01:00:01:01], 100")
+    sent = []
+
+    async def send_raw_command(name: str, *args: str, priority: int = 0):
+        sent.append((name, *args))
+
+    hub.send_raw_command = send_raw_command
+    plan = await hub.apply_state(
+        {DeviceAddress("1:1:0:1:1"): 100, DeviceAddress("1:1:0:1:2"): 100}
+    )
+    assert plan.skipped == [DeviceAddress("1:1:0:1:1")]
+    assert sent == [("FADEDIM", "100", "00:00:00", "00:00:00", "[1:1:0:1:2]")]
+    assert hub.devices._dimmers == {}
+
+
+def test_timeline_plans_delayed_fades():
+    zones = _addresses(12)
+    timeline = Timeline()
+    for second, zone in enumerate(zones[:3]):
+        timeline.add(timedelta(seconds=2 * second), [zone], 100)
+    timeline.add(timedelta(seconds=10), zones, 0, fade_time=timedelta(seconds=3))
+    timeline.add(timedelta(seconds=10), zones[:2], 0, fade_time=timedelta(seconds=3))
+
+    plan = timeline.plan()
+    assert plan.naive_count == 17
+    assert [command._delay_time.seconds for command in plan.commands] == [
+        0,
+        2,
+        4,
+        10,
+        10,
+    ]
+    assert plan.commands[3]._dimmer_adresses == tuple(zones[:10])
+    assert plan.commands[4]._dimmer_adresses == tuple(zones[10:])
+
+
+def test_timeline_rejects_sub_second_offsets():
+    with pytest.raises(ValueError, match="whole number of seconds"):
+        Timeline().add(timedelta(milliseconds=1500), _addresses(1), 50)
+    with pytest.raises(ValueError, match="between 0 and 24 hours"):
+        Timeline().add(timedelta(seconds=-1), _addresses(1), 50)
+
+
+@pytest.mark.asyncio
+async def test_run_timeline_sends_everything_up_front(mocker):
+    hub = HomeworksHub({"devices": {}})
+    hub.send_raw_command = mocker.AsyncMock()
+    timeline = Timeline()
+    timeline.add(timedelta(), _addresses(1), 100)
+    timeline.add(timedelta(seconds=2), _addresses(2)[1:], 100)
+    plan = await hub.run_timeline(timeline)
+    assert plan.sent_count == 2
+    assert hub.send_raw_command.await_args.args == (
+        "FADEDIM",
+        "100",
+        "00:00:00",
+        "00:00:02",
+        "[1:1:0:1:2]",
+    )
+
+
+@pytest.mark.asyncio
+async def test_delayed_step_is_not_pending_before_it_starts(mocker):
+    hub = HomeworksHub(
+        {
+            "devices": {
+                "room1": {
+                    "dimmers": [{"number": 1, "address": "1:1:0:1:1", "name": "a"}]
+                }
+            }
+        }
+    )
+    hub.send_raw_command = mocker.AsyncMock()
+    zone = hub.devices.find_dimmer_device_named("a")
+    timeline = Timeline()
+    timeline.add(timedelta(seconds=1), [zone.address], 100)
+    await hub.run_timeline(timeline)
+
+    assert zone.level == 0
+    assert zone.pending_level is None
+    assert hub.devices.level_at_address(zone.address) == 0
+    plan = plan_state({zone.address: 100}, hub.devices.level_at_address)
+    assert plan.skipped == []
+
+    await asyncio.sleep(1.05)
+    assert zone.pending_level == 100
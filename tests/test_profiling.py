@@ -0,0 +1,93 @@
+import time
+from datetime import timedelta
+
+import pytest
+
+from hwiclient.events import DeviceEventKind, DeviceEventSource
+from hwiclient.monitoring import MonitoringTopic, MonitoringTopicNotifier
+from hwiclient.profiling import DISPATCH_PROFILER, DispatchProfiler
+
+
+class SlowListener:
+    def on_event(self, kind: str, data: dict):
+        time.sleep(0.002)
+
+
+class FastListener:
+    def on_event(self, kind: str, data: dict):
+        pass
+
+
+class Subscriber:
+    def on_topic_update(self, topic: MonitoringTopic, data: dict):
+        pass
+
+
+@pytest.fixture
+def profiler():
+    DISPATCH_PROFILER.reset()
+    yield DISPATCH_PROFILER
+    DISPATCH_PROFILER.disable()
+    DISPATCH_PROFILER.reset()
+
+
+def test_disabled_profiler_records_nothing(profiler):
+    source = DeviceEventSource()
+    source.register_listener(FastListener(), None, DeviceEventKind.DIMMER_LEVEL_CHANGED)
+    source.post(DeviceEventKind.DIMMER_LEVEL_CHANGED, {})
+    assert profiler.stats == []
+
+
+def test_listeners_are_timed_by_class_and_kind(profiler):
+    flagged = []
+    profiler.enable(
+        budget=timedelta(milliseconds=1),
+        on_over_budget=lambda stats, elapsed: flagged.append(stats.listener),
+    )
+    source = DeviceEventSource()
+    kind = DeviceEventKind.DIMMER_LEVEL_CHANGED
+    source.register_listener(SlowListener(), {"address": "a"}, kind)
+    source.register_listener(FastListener(), None, kind)
+    source.register_listener(FastListener(), None, kind)
+    source.post(kind, {"address": "a"})
+
+    slow, fast = profiler.top(2)
+    assert slow.listener.endswith("SlowListener")
+    assert slow.kind == kind
+    assert slow.calls == 1
+    assert slow.over_budget == 1
+    assert fast.listener.endswith("FastListener")
+    assert fast.calls == 2
+    assert [stats.listener for stats in profiler.over_budget()] == [slow.listener]
+    assert flagged == [slow.listener]
+    assert "SlowListener" in profiler.report()
+
+
+def test_filtered_out_calls_are_not_recorded(profiler):
+    profiler.enable()
+    source = DeviceEventSource()
+    kind = DeviceEventKind.DIMMER_LEVEL_CHANGED
+    for address in ("a", "b", "c"):
+        source.register_listener(FastListener(), {"address": address}, kind)
+    source.post(kind, {"address": "b"})
+    (stats,) = profiler.stats
+    assert stats.calls == 1
+
+
+def test_topic_subscribers_are_timed(profiler):
+    profiler.enable()
+    notifier = MonitoringTopicNotifier()
+    notifier.subscribe(Subscriber(), MonitoringTopic.KEYPAD_BUTTON_PRESS)
+    notifier.notify_subscribers(MonitoringTopic.KEYPAD_BUTTON_PRESS, {})
+    (stats,) = profiler.stats
+    assert stats.listener.endswith("Subscriber")
+    assert stats.kind == MonitoringTopic.KEYPAD_BUTTON_PRESS
+    assert stats.over_budget == 0
+
+
+def test_mean():
+    profiler = DispatchProfiler()
+    profiler.record(FastListener(), "kind", 100)
+    profiler.record(FastListener(), "kind", 300)
+    assert profiler.stats[0].mean_ns == 200
+    assert profiler.stats[0].max_ns == 300
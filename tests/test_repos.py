@@ -0,0 +1,297 @@
+import copy
+
+import pytest
+import yaml
+
+from hwiclient.device import DeviceAddress
+from hwiclient.events import DeviceEventKey, DeviceEventKind, EventListener
+from hwiclient.homeworks import HomeworksHub
+from hwiclient.keypad import KeypadLedState
+from hwiclient.monitoring import MonitoringKind
+
+
+@pytest.fixture
+def homeworks_config():
+    return {
+        "devices": {
+            "Kitchen": {
+                "dimmers": [
+                    {"number": 1, "address": "[01:01:00:01:01]", "name": "Island"},
+                    {"number": 2, "address": "[01:01:00:01:02]", "name": "Cans"},
+                ],
+                "keypads": [
+                    {
+                        "name": "Kitchen Entry",
+                        "address": "[01:06:03]",
+                        "buttons": [
+                            {
+                                "name": "Cook",
+                                "number": 1,
+                                "zones": [
+                                    {"number": "1", "address": "[01:01:00:01:01]"},
+                                    {"number": "3", "address": "[01:01:00:02:01]"},
+                                ],
+                            },
+                            {
+                                "name": "All",
+                                "number": 2,
+                                "zones": [
+                                    {"number": "1", "address": "[01:01:00:01:01]"},
+                                    {"number": "2", "address": "[01:01:00:01:02]"},
+                                ],
+                            },
+                        ],
+                    }
+                ],
+            },
+            "Porch": {
+                "fans": [{"number": 3, "address": "[01:01:00:02:01]", "name": "Fan"}]
+            },
+        }
+    }
+
+
+@pytest.fixture
+def homeworks_hub(homeworks_config):
+    return HomeworksHub(homeworks_config)
+
+
+def test_keypads_are_loaded_from_config(homeworks_hub):
+    keypad = homeworks_hub.devices.get_keypad_named("Kitchen Entry")
+    assert keypad is not None
+    assert keypad.room == "Kitchen"
+    assert keypad.address == DeviceAddress("1:6:3")
+    assert [button.name for button in keypad.buttons] == ["Cook", "All"]
+
+
+def test_button_zones_share_repository_devices(homeworks_hub):
+    devices = homeworks_hub.devices
+    keypad = devices.get_keypad_named("Kitchen Entry")
+    cook, all_lights = keypad.buttons
+    island = devices.find_dimmer_device_named("Island")
+    fan = devices.find_dimmer_device_named("Fan")
+    assert cook.device_group.devices == [island, fan]
+    assert cook.device_group.devices[0] is all_lights.device_group.devices[0]
+    assert len(devices.all_dimmer_devices()) == 3
+
+
+def test_keypad_led_states_are_routed_to_keypad(homeworks_hub):
+    keypad = homeworks_hub.devices.get_keypad_named("Kitchen Entry")
+    homeworks_hub._response_data_handler.handle(
+        "KLS, [01:06:03], 010000000000000000000000"
+    )
+    assert keypad.led_states[1] == KeypadLedState.ON
+    assert keypad.buttons[1].is_led_on
+    assert not keypad.buttons[0].is_led_on
+
+
+def test_keypad_button_events_are_routed_to_keypad(homeworks_hub, mocker):
+    keypad = homeworks_hub.devices.get_keypad_named("Kitchen Entry")
+    listener = mocker.Mock(spec=EventListener)
+    keypad.event_source.register_listener(
+        listener, None, DeviceEventKind.KEYPAD_BUTTON_PRESSED
+    )
+    homeworks_hub._response_data_handler.handle("KBP, [01:06:03], 2")
+    listener.on_event.assert_called_once()
+    assert listener.on_event.call_args.args[0] == DeviceEventKind.KEYPAD_BUTTON_PRESSED
+
+
+@pytest.fixture
+def lazy_hub(homeworks_config):
+    return HomeworksHub(homeworks_config, lazy_devices=True)
+
+
+def test_lazy_repository_builds_devices_on_access(lazy_hub):
+    devices = lazy_hub.devices
+    assert devices._dimmers == {}
+    assert devices._keypads == {}
+    assert len(devices.dimmer_addresses()) == 3
+
+    island = devices.find_dimmer_device_named("Island")
+    assert island is not None
+    assert list(devices._dimmers.values()) == [island]
+    assert devices.dimmer_device_at_address(DeviceAddress("1:1:0:1:1")) is island
+
+
+def test_lazy_repository_keeps_state_of_pending_devices(lazy_hub):
+    lazy_hub._response_data_handler.handle("DL, [01:01:00:01:02], 30")
+    lazy_hub._response_data_handler.handle("KLS, [01:06:03], 100000000000000000000000")
+    assert lazy_hub.devices._dimmers == {}
+
+    keypad = lazy_hub.devices.get_keypad_named("Kitchen Entry")
+    assert keypad.buttons[0].is_led_on
+    cans = lazy_hub.devices.find_dimmer_device_named("Cans")
+    assert cans.level == 30
+    assert len(lazy_hub.changes_since(0).changes) == 2
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_add_from_yaml_enables_monitoring(homeworks_config, lazy, tmp_path):
+    path = tmp_path / "homeworks.yaml"
+    path.write_text(yaml.safe_dump(homeworks_config))
+    hub = HomeworksHub({"devices": {}}, lazy_devices=lazy)
+    assert hub._coordinator.monitoring == frozenset()
+
+    hub.devices.add_from_yaml(path)
+    assert {MonitoringKind.DIMMER_LEVEL, MonitoringKind.KEYPAD_LED} <= set(
+        hub._coordinator.monitoring
+    )
+    hub._response_data_handler.handle("DL, [01:01:00:01:02], 30")
+    assert hub.devices.find_dimmer_device_named("Cans").level == 30
+
+
+def test_lazy_repository_lists_every_device(lazy_hub):
+    assert len(lazy_hub.devices.all_dimmer_devices()) == 3
+    assert len(lazy_hub.devices.all_keypads()) == 1
+
+
+def test_keypad_posts_led_changes_per_button(homeworks_hub, mocker):
+    keypad = homeworks_hub.devices.get_keypad_named("Kitchen Entry")
+    listener = mocker.Mock(spec=EventListener)
+    keypad.event_source.register_listener(
+        listener,
+        None,
+        DeviceEventKind.KEYPAD_LED_STATES_CHANGED,
+        DeviceEventKind.KEYPAD_BUTTON_LED_CHANGED,
+    )
+    homeworks_hub._response_data_handler.handle(
+        "KLS, [01:06:03], 020000000000000000000000"
+    )
+    homeworks_hub._response_data_handler.handle(
+        "KLS, [01:06:03], 020000000000000000000000"
+    )
+
+    kinds = [call.args[0] for call in listener.on_event.call_args_list]
+    assert kinds == [
+        DeviceEventKind.KEYPAD_LED_STATES_CHANGED,
+        DeviceEventKind.KEYPAD_BUTTON_LED_CHANGED,
+    ]
+    button_event = listener.on_event.call_args_list[1].args[1]
+    assert button_event[DeviceEventKey.BUTTON_NUMBER] == 2
+    assert button_event[DeviceEventKey.KEYPAD_LED_STATE] == KeypadLedState.FLASH_1
+    assert len(homeworks_hub.changes_since(0).changes) == 1
+
+
+@pytest.fixture
+def predicting_hub(homeworks_config):
+    return HomeworksHub(homeworks_config, predict_leds=True)
+
+
+def test_led_is_predicted_from_button_preset_levels(predicting_hub, mocker):
+    keypad = predicting_hub.devices.get_keypad_named("Kitchen Entry")
+    listener = mocker.Mock(spec=EventListener)
+    keypad.event_source.register_listener(
+        listener, None, DeviceEventKind.KEYPAD_BUTTON_LED_CHANGED
+    )
+    handler = predicting_hub._response_data_handler
+    handler.handle("DL, [01:01:00:01:01], 100")
+    assert not keypad.buttons[0].is_led_on
+    handler.handle("DL, [01:01:00:02:01], 100")
+    assert keypad.buttons[0].is_led_on
+    assert not keypad.buttons[1].is_led_on
+
+    button_event = listener.on_event.call_args.args[1]
+    assert button_event[DeviceEventKey.BUTTON_NUMBER] == 1
+    assert button_event[DeviceEventKey.PREDICTED]
+
+    handler.handle("DL, [01:01:00:02:01], 50")
+    assert not keypad.buttons[0].is_led_on
+    assert listener.on_event.call_count == 2
+
+
+def test_led_predictions_are_reconciled_with_reports(predicting_hub):
+    handler = predicting_hub._response_data_handler
+    stats = predicting_hub.devices.led_predictor.stats
+    handler.handle("DL, [01:01:00:01:01], 100")
+    handler.handle("DL, [01:01:00:02:01], 100")
+    handler.handle("KLS, [01:06:03], 100000000000000000000000")
+    assert (stats.matched, stats.mismatched) == (1, 0)
+
+    # Both buttons use the island, so both are predicted off.
+    handler.handle("DL, [01:01:00:01:01], 0")
+    handler.handle("KLS, [01:06:03], 100000000000000000000000")
+    assert (stats.matched, stats.mismatched) == (2, 1)
+    assert stats.accuracy == 2 / 3
+    keypad = predicting_hub.devices.get_keypad_named("Kitchen Entry")
+    assert keypad.buttons[0].is_led_on
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_confirmed_led_prediction_is_journaled(homeworks_config, lazy):
+    hub = HomeworksHub(homeworks_config, lazy_devices=lazy, predict_leds=True)
+    handler = hub._response_data_handler
+    handler.handle("DL, [01:01:00:01:01], 100")
+    handler.handle("DL, [01:01:00:02:01], 100")
+    handler.handle("KLS, [01:06:03], 100000000000000000000000")
+
+    leds = [
+        change.value
+        for change in hub.changes_since(0).changes
+        if change.kind == DeviceEventKind.KEYPAD_LED_STATES_CHANGED
+    ]
+    assert leds == ["100000000000000000000000"]
+
+
+def test_led_prediction_updates_pending_keypads(homeworks_config):
+    hub = HomeworksHub(homeworks_config, lazy_devices=True, predict_leds=True)
+    hub._response_data_handler.handle("DL, [01:01:00:01:01], 100")
+    hub._response_data_handler.handle("DL, [01:01:00:02:01], 100")
+    assert hub.devices._keypads == {}
+
+    keypad = hub.devices.get_keypad_named("Kitchen Entry")
+    assert keypad.buttons[0].is_led_on
+    assert keypad.buttons[0].preset_levels == [100.0, 100.0]
+
+
+def _reloaded_config(homeworks_config):
+    config = copy.deepcopy(homeworks_config)
+    kitchen = config["devices"]["Kitchen"]
+    kitchen["dimmers"][0]["name"] = "Island Pendants"
+    kitchen["dimmers"].pop(1)
+    kitchen["dimmers"].append(
+        {"number": 4, "address": "[01:01:00:01:03]", "name": "Sink"}
+    )
+    kitchen["keypads"][0]["buttons"][1]["zones"][1]["address"] = "[01:01:00:01:03]"
+    return config
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_reload_config_applies_only_the_diff(homeworks_config, lazy):
+    hub = HomeworksHub(homeworks_config, lazy_devices=lazy)
+    island = hub.devices.find_dimmer_device_named("Island")
+    fan = hub.devices.find_dimmer_device_named("Fan")
+    hub._response_data_handler.handle("DL, [01:01:00:01:01], 40")
+
+    report = hub.reload_config(_reloaded_config(homeworks_config))
+    assert report.added == [DeviceAddress("1:1:0:1:3")]
+    assert report.removed == [DeviceAddress("1:1:0:1:2")]
+    assert report.updated == [DeviceAddress("1:1:0:1:1"), DeviceAddress("1:6:3")]
+
+    devices = hub.devices
+    assert devices.find_dimmer_device_named("Island Pendants") is island
+    assert island.level == 40
+    assert devices.find_dimmer_device_named("Cans") is None
+    assert devices.find_dimmer_device_named("Fan") is fan
+    keypad = devices.get_keypad_named("Kitchen Entry")
+    sink = devices.find_dimmer_device_named("Sink")
+    assert keypad.buttons[1].device_group.devices == [island, sink]
+
+    hub._response_data_handler.handle("DL, [01:01:00:01:01], 60")
+    assert island.level == 60
+    assert hub.reload_config(_reloaded_config(homeworks_config)).is_empty
+
+
+def test_reload_config_drops_removed_keypads(homeworks_hub, homeworks_config, mocker):
+    keypad = homeworks_hub.devices.get_keypad_named("Kitchen Entry")
+    listener = mocker.Mock(spec=EventListener)
+    keypad.event_source.register_listener(
+        listener, None, DeviceEventKind.KEYPAD_BUTTON_PRESSED
+    )
+    config = copy.deepcopy(homeworks_config)
+    del config["devices"]["Kitchen"]["keypads"]
+
+    report = homeworks_hub.reload_config(config)
+    assert report.removed == [DeviceAddress("1:6:3")]
+    assert homeworks_hub.devices.all_keypads() == []
+    homeworks_hub._response_data_handler.handle("KBP, [01:06:03], 1")
+    listener.on_event.assert_not_called()
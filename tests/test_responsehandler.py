@@ -0,0 +1,94 @@
+import pytest
+
+from hwiclient.events import TimeclockEventKey, TimeclockEventKind
+from hwiclient.monitoring import (
+    MonitoringTopic,
+    MonitoringTopicKey,
+    MonitoringTopicNotifier,
+)
+from hwiclient.responsehandler import ServerResponseDataHandler
+from hwiclient.timeclock import Timeclock
+
+
+class RecordingSubscriber:
+    def __init__(self):
+        self.updates = []
+
+    def on_topic_update(self, topic: MonitoringTopic, data: dict):
+        self.updates.append((topic, data))
+
+
+@pytest.fixture
+def notifier():
+    return MonitoringTopicNotifier()
+
+
+@pytest.fixture
+def subscriber(notifier):
+    subscriber = RecordingSubscriber()
+    notifier.subscribe(subscriber, *MonitoringTopic)
+    return subscriber
+
+
+@pytest.fixture
+def handler(notifier):
+    return ServerResponseDataHandler(notifier)
+
+
+@pytest.mark.parametrize(
+    "line,topic,data",
+    [
+        (
+            "DL, [01:01:00:01:01], 60",
+            MonitoringTopic.DIMMER_LEVEL_CHANGED,
+            {
+                MonitoringTopicKey.ADDRESS: "[01:01:00:01:01]",
+                MonitoringTopicKey.LEVEL: 60.0,
+            },
+        ),
+        (
+            "KBR, [01:04:01], 3",
+            MonitoringTopic.KEYPAD_BUTTON_RELEASE,
+            {MonitoringTopicKey.ADDRESS: "[01:04:01]", MonitoringTopicKey.BUTTON: 3},
+        ),
+        (
+            "GSS, [01:06:02], 4",
+            MonitoringTopic.GRAFIK_EYE_SCENE_SELECTED,
+            {MonitoringTopicKey.ADDRESS: "[01:06:02]", MonitoringTopicKey.SCENE: 4},
+        ),
+        ("TE, 12", MonitoringTopic.TIMECLOCK_EVENT, {MonitoringTopicKey.EVENT: 12}),
+        (
+            "Sunrise: 06:47",
+            MonitoringTopic.TIMECLOCK_SUNRISE,
+            {MonitoringTopicKey.TIME: "06:47"},
+        ),
+    ],
+)
+def test_lines_become_topics(handler, subscriber, line, topic, data):
+    handler.handle(line)
+    assert subscriber.updates == [(topic, data)]
+
+
+def test_unknown_and_malformed_lines_are_counted(handler, subscriber):
+    handler.handle("Processor 01 O/S Rev = 1.74")
+    handler.handle("DL, [01:01:00:01:01], bright")
+    handler.handle("KBP, [01:04:01]")
+    assert subscriber.updates == []
+    assert handler.unknown_lines == 1
+    assert handler.malformed_lines == 2
+
+
+def test_lines_without_subscribers_are_not_parsed(notifier, handler):
+    handler.handle("DL, [01:01:00:01:01], bright")
+    assert handler.malformed_lines == 0
+
+
+def test_timeclock_posts_replies(notifier, handler, mocker):
+    timeclock = Timeclock(notifier)
+    listener = mocker.Mock()
+    timeclock.register_listener(listener, None, TimeclockEventKind.TIMECLOCK_SUNSET)
+    handler.handle("Sunset: 18:22")
+    assert timeclock.sunset == "18:22"
+    listener.on_event.assert_called_once_with(
+        TimeclockEventKind.TIMECLOCK_SUNSET, {TimeclockEventKey.RAW_DATA: "18:22"}
+    )
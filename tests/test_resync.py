@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+import pytest
+
+from hwiclient.connection.message import RequestPriority
+from hwiclient.device import DeviceAddress
+from hwiclient.homeworks import HomeworksHub
+from hwiclient.resync import ResyncEngine
+
+
+@pytest.fixture
+def homeworks_config():
+    return {
+        "devices": {
+            "room1": {
+                "dimmers": [
+                    {"number": 1, "address": "1:1:0:1:1", "name": "light1"},
+                    {"number": 2, "address": "1:1:0:1:2", "name": "light2"},
+                ]
+            }
+        }
+    }
+
+
+@pytest.fixture
+def homeworks_hub(homeworks_config):
+    return HomeworksHub(homeworks_config)
+
+
+def _reply_with_levels(hub: HomeworksHub, levels: dict[str, float], sent: list):
+    async def send_raw_command(name: str, *args: str, priority: int = 0):
+        sent.append((name, args, priority))
+        address = DeviceAddress(args[0]).unencoded
+        if name == "RDL" and address in levels:
+            hub._response_data_handler.handle(f"DL, {args[0]}, {levels[address]}")
+
+    hub.send_raw_command = send_raw_command
+
+
+async def test_resync_requests_every_zone_at_bulk_priority(homeworks_hub):
+    sent = []
+    _reply_with_levels(homeworks_hub, {"1:1:0:1:1": 40, "1:1:0:1:2": 75}, sent)
+
+    report = await homeworks_hub.resync()
+
+    assert report.zones_requested == 2
+    assert report.zones_received == 2
+    assert report.coverage == 1.0
+    assert report.missing == []
+    assert all(priority == RequestPriority.BULK for _, _, priority in sent)
+    light2 = homeworks_hub.devices.find_dimmer_device_named("light2")
+    assert light2.level == 75
+
+
+async def test_resync_retries_and_reports_missing(homeworks_hub):
+    sent = []
+    _reply_with_levels(homeworks_hub, {"1:1:0:1:1": 40}, sent)
+
+    report = await homeworks_hub.resync(
+        reply_timeout=timedelta(milliseconds=10), max_attempts=2
+    )
+
+    assert report.zones_received == 1
+    assert report.coverage == 0.5
+    assert report.retries == 1
+    assert report.missing == [DeviceAddress("1:1:0:1:2")]
+    assert len(sent) == 3
+
+
+async def test_resync_bounds_requests_in_flight(homeworks_hub):
+    engine = ResyncEngine(
+        homeworks_hub,
+        max_in_flight=1,
+        reply_timeout=timedelta(milliseconds=5),
+        max_attempts=1,
+    )
+    outstanding = []
+
+    async def send_raw_command(name: str, *args: str, priority: int = 0):
+        outstanding.append(len(engine._waiting))
+
+    homeworks_hub.send_raw_command = send_raw_command
+    report = await engine.run()
+
+    assert outstanding == [1, 1]
+    assert report.coverage == 0.0
@@ -0,0 +1,141 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from hwiclient.commands.hub import HubCommand
+from hwiclient.homeworks import HomeworksHub
+from hwiclient.scheduler import CommandScheduler
+
+
+class _Command(HubCommand):
+    def __init__(self):
+        super().__init__()
+        self.senders = []
+
+    async def _perform_command(self, sender):
+        self.senders.append(sender)
+
+
+class _Queue:
+    def __init__(self):
+        self.commands = []
+
+    async def enqueue_command(self, command: HubCommand) -> None:
+        self.commands.append(command)
+
+
+@pytest.fixture
+def queue():
+    return _Queue()
+
+
+@pytest.fixture
+def scheduler(queue):
+    scheduler = CommandScheduler(queue)
+    yield scheduler
+    scheduler.close()
+
+
+@pytest.mark.asyncio
+async def test_call_later_runs_commands_in_due_order(scheduler, queue):
+    first, second = _Command(), _Command()
+    scheduler.call_later(timedelta(milliseconds=20), second)
+    scheduler.call_later(timedelta(milliseconds=5), first)
+    assert len(scheduler) == 2
+
+    await asyncio.sleep(0.05)
+    assert queue.commands == [first, second]
+    assert len(scheduler) == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_command_does_not_run(scheduler, queue):
+    command = _Command()
+    entry = scheduler.call_later(timedelta(milliseconds=5), command)
+    scheduler.cancel(entry)
+    scheduler.cancel(entry)
+    assert entry.cancelled
+    assert len(scheduler) == 0
+
+    await asyncio.sleep(0.02)
+    assert queue.commands == []
+
+
+@pytest.mark.asyncio
+async def test_cancel_after_fire_is_a_no_op(scheduler, queue):
+    fired = scheduler.call_later(timedelta(milliseconds=1), _Command())
+    pending = scheduler.call_later(timedelta(seconds=10), _Command())
+    await asyncio.sleep(0.01)
+    assert fired.done
+
+    scheduler.cancel(fired)
+    assert not fired.cancelled
+    assert len(scheduler) == 1
+    scheduler.cancel(pending)
+    assert len(scheduler) == 0
+
+
+@pytest.mark.asyncio
+async def test_failing_condition_does_not_stall_later_entries(scheduler, queue):
+    def fail() -> bool:
+        raise RuntimeError("condition failed")
+
+    later = _Command()
+    periodic = scheduler.call_every(
+        timedelta(milliseconds=5), _Command(), condition=fail
+    )
+    scheduler.call_later(timedelta(milliseconds=1), _Command(), condition=fail)
+    scheduler.call_later(timedelta(milliseconds=10), later)
+
+    await asyncio.sleep(0.03)
+    assert queue.commands == [later]
+    assert not periodic.cancelled
+    assert len(scheduler) == 1
+
+
+@pytest.mark.asyncio
+async def test_call_every_repeats_until_cancelled(scheduler, queue):
+    command = _Command()
+    entry = scheduler.call_every(timedelta(milliseconds=10), command)
+    assert entry.is_periodic
+
+    await asyncio.sleep(0.055)
+    scheduler.cancel(entry)
+    runs = len(queue.commands)
+    assert 3 <= runs <= 5
+
+    await asyncio.sleep(0.03)
+    assert len(queue.commands) == runs
+
+
+@pytest.mark.asyncio
+async def test_condition_skips_command(scheduler, queue):
+    scheduler.call_later(timedelta(), _Command(), condition=lambda: False)
+    await asyncio.sleep(0.01)
+    assert queue.commands == []
+
+
+@pytest.mark.asyncio
+async def test_cancelled_entries_are_compacted(scheduler):
+    entries = [
+        scheduler.call_later(timedelta(hours=1), _Command()) for _ in range(1000)
+    ]
+    for entry in entries[:900]:
+        scheduler.cancel(entry)
+    assert len(scheduler) == 100
+    assert len(scheduler._heap) < 1000
+
+
+def test_call_every_rejects_non_positive_interval(scheduler):
+    with pytest.raises(ValueError):
+        scheduler.call_every(timedelta(), _Command())
+
+
+@pytest.mark.asyncio
+async def test_hub_scheduler_runs_commands():
+    hub = HomeworksHub({"devices": {}})
+    command = _Command()
+    hub.scheduler.call_later(timedelta(), command)
+    await asyncio.sleep(0.01)
+    assert command.senders == [hub]
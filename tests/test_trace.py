@@ -0,0 +1,68 @@
+import pytest
+
+from hwiclient.monitoring import MonitoringTopic, MonitoringTopicNotifier
+from hwiclient.trace import TRACER, TracePoint, Tracer
+
+
+@pytest.fixture
+def tracer():
+    return Tracer()
+
+
+def test_disabled_until_hook_added(tracer):
+    assert not tracer.enabled
+    hook = lambda *args: None  # noqa: E731
+    tracer.add_hook(hook, [TracePoint.LINE_RECEIVED])
+    assert tracer.enabled
+    tracer.remove_hook(hook)
+    assert not tracer.enabled
+
+
+def test_hook_receives_objects_for_its_points(tracer):
+    calls = []
+    tracer.add_hook(lambda *args: calls.append(args), [TracePoint.LINE_DROPPED])
+    tracer.emit(TracePoint.LINE_DROPPED, b"DL, [02:01:00:01:01], 60")
+    tracer.emit(TracePoint.LINE_RECEIVED, b"ignored")
+    assert calls == [(TracePoint.LINE_DROPPED, b"DL, [02:01:00:01:01], 60")]
+
+
+def test_sampling_calls_every_nth(tracer):
+    calls = []
+    tracer.add_hook(
+        lambda point, line: calls.append(line),
+        [TracePoint.LINE_RECEIVED],
+        sample_every=3,
+    )
+    for index in range(7):
+        tracer.emit(TracePoint.LINE_RECEIVED, index)
+    assert calls == [0, 3, 6]
+
+
+def test_failing_hook_does_not_break_others(tracer):
+    calls = []
+
+    def failing(*args):
+        raise RuntimeError()
+
+    tracer.add_hook(failing)
+    tracer.add_hook(lambda *args: calls.append(args))
+    tracer.emit(TracePoint.EVENT_POSTED, "kind", {})
+    assert calls == [(TracePoint.EVENT_POSTED, "kind", {})]
+
+
+def test_notifier_emits_topics():
+    calls = []
+
+    def hook(*args):
+        calls.append(args)
+
+    TRACER.add_hook(hook, [TracePoint.TOPIC_NOTIFIED])
+    try:
+        MonitoringTopicNotifier().notify_subscribers(
+            MonitoringTopic.KEYPAD_BUTTON_PRESS, {}
+        )
+    finally:
+        TRACER.remove_hook(hook)
+    assert calls == [
+        (TracePoint.TOPIC_NOTIFIED, MonitoringTopic.KEYPAD_BUTTON_PRESS, {})
+    ]